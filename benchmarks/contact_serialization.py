@@ -0,0 +1,100 @@
+"""
+Бенчмарк серіалізації списку контактів (без бази даних і HTTP).
+
+Порівнює час перетворення списку ORM-контактів у JSON-тіло відповіді:
+
+* ``jsonable_encoder`` — рекурсивний обхід ORM-об'єктів FastAPI і ``json.dumps``
+  (шлях ендпоінта без ``response_model``);
+* ``per-item + json`` — ``ContactResponse.model_validate`` та ``model_dump``
+  для кожного контакту і ``json.dumps``;
+* ``previous route`` — те саме плюс повторна валідація словників за
+  ``response_model`` з ``EmailStr`` (попередній шлях ``/contacts/birthdays``);
+* ``per-item + orjson`` — те саме з ``ORJSONResponse``;
+* ``TypeAdapter`` — одна валідація й серіалізація всього списку в
+  pydantic-core (:func:`src.schemas.contacts.dump_contacts`).
+
+Запуск::
+
+    python -m benchmarks.contact_serialization -n 10000
+"""
+
+import argparse
+import json
+from datetime import date, timedelta
+from time import perf_counter
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import EmailStr, TypeAdapter
+
+from src.db.models import Contact
+from src.schemas.contacts import ContactResponse, dump_contacts
+
+
+class EmailContactResponse(ContactResponse):
+    email: EmailStr
+
+
+EmailContactList = TypeAdapter(list[EmailContactResponse])
+
+
+def make_contacts(count: int) -> list[Contact]:
+    start = date(1980, 1, 1)
+    return [
+        Contact(
+            id=i,
+            first_name=f"First{i}",
+            last_name=f"Last{i}",
+            email=f"contact{i}@example.com",
+            phone_number=f"+380{i:09d}",
+            birthday=start + timedelta(days=i % 10000),
+            additional_info="note" if i % 2 else None,
+            user_id=1,
+        )
+        for i in range(count)
+    ]
+
+
+def encoder_json(contacts) -> bytes:
+    fields = list(ContactResponse.model_fields)
+    return json.dumps(jsonable_encoder(contacts, include=fields)).encode()
+
+
+def per_item(contacts) -> list[dict]:
+    return [
+        ContactResponse.model_validate(contact).model_dump(mode="json")
+        for contact in contacts
+    ]
+
+
+def previous_route(contacts) -> bytes:
+    validated = EmailContactList.validate_python(per_item(contacts))
+    return json.dumps(EmailContactList.dump_python(validated, mode="json")).encode()
+
+
+def measure(label: str, repeat: int, func, contacts):
+    best = float("inf")
+    for _ in range(repeat):
+        started = perf_counter()
+        body = func(contacts)
+        best = min(best, perf_counter() - started)
+    rate = len(contacts) / best
+    print(f"{label:<18} {best * 1000:>9.1f} ms  {rate:>12,.0f} contacts/s  {len(body):>10,} B")
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--count", type=int, default=10000)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    contacts = make_contacts(args.count)
+    measure("jsonable_encoder", args.repeat, encoder_json, contacts)
+    measure("per-item + json", args.repeat, lambda c: json.dumps(per_item(c)).encode(), contacts)
+    measure("previous route", args.repeat, previous_route, contacts)
+    measure("per-item + orjson", args.repeat, lambda c: orjson.dumps(per_item(c)), contacts)
+    measure("TypeAdapter", args.repeat, dump_contacts, contacts)
+
+
+if __name__ == "__main__":
+    main()
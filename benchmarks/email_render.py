@@ -0,0 +1,64 @@
+"""
+Бенчмарк формування листів воркером пошти (без мережі).
+
+Порівнює кількість листів за секунду:
+
+* ``jinja+EmailMessage`` — рендер шаблону Jinja2 і складання
+  ``EmailMessage`` для кожного листа (як до попередньої компіляції);
+* ``prebuilt`` — підстановка змінних у підготовлені фрагменти
+  (:class:`src.services.email.CompiledEmail`);
+* ``build_message`` — повний шлях воркера разом зі створенням токена.
+
+Запуск::
+
+    python -m benchmarks.email_render -n 20000
+"""
+
+import argparse
+from email.message import EmailMessage
+from email.utils import formataddr
+from time import perf_counter
+
+from src.services.email import TEMPLATES, build_message, compile_templates, get_environment
+from src.settings.config import settings
+
+CONTEXT = {"host": "http://localhost:8000/", "username": "Bob", "token": "x" * 180}
+
+
+def legacy_message(kind: str, recipient: str) -> bytes:
+    subject, template_name = TEMPLATES[kind]
+    html = get_environment().get_template(template_name).render(CONTEXT)
+    message = EmailMessage()
+    message["Subject"] = subject
+    message["From"] = formataddr((settings.MAIL_FROM_NAME or "", settings.MAIL_FROM or ""))
+    message["To"] = recipient
+    message.set_content(html, subtype="html")
+    return message.as_bytes()
+
+
+def measure(label: str, count: int, func):
+    started = perf_counter()
+    for i in range(count):
+        func(f"user{i}@example.com")
+    elapsed = perf_counter() - started
+    print(f"{label:<20} {count / elapsed:>12,.0f} msg/s  ({elapsed * 1e6 / count:.1f} us/msg)")
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--count", type=int, default=20000)
+    parser.add_argument("--kind", choices=list(TEMPLATES), default="verify")
+    args = parser.parse_args(argv)
+
+    compiled = compile_templates()[args.kind]
+    measure("jinja+EmailMessage", args.count, lambda to: legacy_message(args.kind, to))
+    measure("prebuilt", args.count, lambda to: compiled.build(to, CONTEXT))
+    measure(
+        "build_message",
+        args.count,
+        lambda to: build_message(args.kind, to, {"host": CONTEXT["host"], "username": "Bob"}),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,19 +5,51 @@
 middleware, маршрути, обробники винятків та налаштування бази даних.
 """
 
-from fastapi import FastAPI, Depends, HTTPException, Request
-from fastapi.responses import JSONResponse
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
+from fastapi import FastAPI, Depends, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import text
-from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
 
 from src.db.connect import get_db, engine
-from src.db.models import Base
+from src.db.migrate import verify_schema
+from src.db.pool import pool_metrics
 from src.routers import contacts, auth, users
-from src.services.limiter import limiter
+from src.services.auth import auth_service
+from src.services.avatars import MULTIPART_OVERHEAD, UploadSizeLimit
+from src.services.container import services
+from src.services.metrics import MetricsMiddleware, render_metrics
+from src.services.user_cache import user_cache
+from src.settings.config import settings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Життєвий цикл застосунку.
+
+    Під час старту перевіряє, що схема бази даних мігрована до останньої
+    ревізії (міграції запускаються окремо: ``python -m src.db.migrate``), та
+    запускає слухача інвалідації кешу користувачів. Клієнти зовнішніх сервісів
+    створюються ліниво (:mod:`src.services.container`); під час зупинки
+    застосунок зупиняє слухача, звільняє клієнти сервісів (пул потоків bcrypt,
+    Redis) і закриває пул з'єднань бази даних.
+    """
+    if settings.DB_VERIFY_SCHEMA:
+        await verify_schema(engine)
+    invalidation_listener = asyncio.create_task(user_cache.listen())
+    yield
+    invalidation_listener.cancel()
+    with suppress(asyncio.CancelledError):
+        await invalidation_listener
+    await services.aclose()
+    await engine.dispose()
+
 
-app = FastAPI()
+# JSON-відповіді серіалізуються orjson
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Middleware для CORS (дозволяє крос-домени запити)
 app.add_middleware(
@@ -28,12 +60,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Middleware для обмеження кількості запитів (rate limiting)
-app.state.limiter = limiter
-app.add_middleware(SlowAPIMiddleware)
+# Middleware для метрик продуктивності (Prometheus, див. /metrics)
+app.add_middleware(MetricsMiddleware)
 
-# Створення всіх таблиць, описаних у моделях SQLAlchemy
-Base.metadata.create_all(bind=engine)
+# Обмеження розміру тіла запиту завантаження аватара (до читання multipart)
+app.add_middleware(
+    UploadSizeLimit,
+    path="/user/avatar",
+    max_bytes=settings.AVATAR_MAX_BYTES + MULTIPART_OVERHEAD,
+)
 
 @app.get("/", name="API root")
 def get_index():
@@ -46,12 +81,12 @@ def get_index():
     return {"message": "Welcome to contacts API"}
 
 @app.get("/health", name="Перевірка стану сервісу")
-def get_health_status(db=Depends(get_db)):
+async def get_health_status(db=Depends(get_db)):
     """
     Перевірка доступності API та бази даних.
 
     Аргументи:
-        db: Сесія бази даних (SQLAlchemy).
+        db: Асинхронна сесія бази даних (SQLAlchemy).
 
     Повертає:
         dict: Повідомлення про готовність сервісу.
@@ -60,31 +95,63 @@ def get_health_status(db=Depends(get_db)):
         HTTPException: Якщо база даних недоступна.
     """
     try:
-        result = db.execute(text("SELECT 1+1")).fetchone()
+        result = (await db.execute(text("SELECT 1+1"))).fetchone()
         if result is None:
             raise Exception
         return {"message": "API is ready to work"}
     except Exception:
         raise HTTPException(status_code=503, detail="База даних недоступна")
 
-@app.exception_handler(RateLimitExceeded)
-def rate_limit_handler(request: Request, exc: RateLimitExceeded):
+@app.get("/health/pool", name="Статистика пулу з'єднань")
+def get_pool_stats():
     """
-    Обробник помилки перевищення ліміту запитів.
+    Статистика пулу з'єднань з базою даних поточного воркера.
 
-    Аргументи:
-        request (Request): Об’єкт HTTP-запиту.
-        exc (RateLimitExceeded): Виняток перевищення ліміту.
+    Повертає:
+        dict: Розмір пулу, кількість виданих та вільних з'єднань, overflow,
+        кількість тайм-аутів і гістограму часу очікування з'єднання (мс).
+    """
+    return pool_metrics.snapshot(engine.pool)
+
+@app.get("/metrics", name="Метрики Prometheus", include_in_schema=False)
+def get_metrics():
+    """
+    Метрики продуктивності у текстовому форматі Prometheus.
 
     Повертає:
-        JSONResponse: Відповідь з кодом 429 та повідомленням про помилку.
+        Response: Затримки запитів за маршрутами, кількість запитів в обробці,
+        кількість і час SQL-запитів на запит, влучання кешу користувачів та
+        час bcrypt.
     """
-    return JSONResponse(
-        status_code=429,
-        content={"detail": "Перевищено ліміт запитів. Спробуйте пізніше."},
-    )
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+@app.get("/health/cache", name="Статистика кешів аутентифікації")
+def get_cache_stats():
+    """
+    Статистика in-process кешів аутентифікації поточного воркера.
+
+    Повертає:
+        dict: Кількість записів, влучань і промахів для кешу перевірених
+        JWT токенів та локального рівня кешу користувачів.
+    """
+    caches = {"token": auth_service.token_cache, "user_local": user_cache.local}
+    return {
+        name: {"size": len(cache), "hits": cache.hits, "misses": cache.misses}
+        for name, cache in caches.items()
+    }
 
 # Підключення роутерів до основного застосунку
 app.include_router(contacts.router)
 app.include_router(auth.router)
 app.include_router(users.router)
+
+# Роздача аватарів із локального сховища (AVATAR_STORAGE=local)
+if settings.AVATAR_STORAGE == "local":
+    from src.services.avatars import AvatarStaticFiles
+
+    app.mount(
+        settings.AVATAR_BASE_URL,
+        AvatarStaticFiles(directory=settings.AVATAR_LOCAL_DIR, check_dir=False),
+        name="avatars",
+    )
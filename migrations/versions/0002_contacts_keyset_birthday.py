@@ -0,0 +1,45 @@
+"""keyset pagination index and birthday month-day key
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-06-20 10:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("contacts", sa.Column("birthday_md", sa.Integer(), nullable=True))
+
+    contacts = sa.table(
+        "contacts",
+        sa.column("birthday", sa.Date),
+        sa.column("birthday_md", sa.Integer),
+    )
+    month = sa.cast(sa.extract("month", contacts.c.birthday), sa.Integer)
+    day = sa.cast(sa.extract("day", contacts.c.birthday), sa.Integer)
+    op.execute(contacts.update().values(birthday_md=month * 100 + day))
+
+    op.create_index("ix_contacts_user_id_id", "contacts", ["user_id", "id"])
+    op.create_index(
+        "ix_contacts_user_birthday_md", "contacts", ["user_id", "birthday_md"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_contacts_user_birthday_md", table_name="contacts")
+    op.drop_index("ix_contacts_user_id_id", table_name="contacts")
+    with op.batch_alter_table("contacts") as batch_op:
+        batch_op.drop_column("birthday_md")
@@ -1,15 +1,85 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from src.settings.base import DATABASE_URL
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
+from src.db.pool import InstrumentedQueuePool
+from src.services.metrics import instrument_engine
+from src.settings.base import (
+    DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+)
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
 
-Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
+def to_async_url(url: str) -> str:
+    """
+    Перетворює URL бази даних на URL з асинхронним драйвером.
+
+    ``postgresql://`` стає ``postgresql+asyncpg://``, ``sqlite://`` —
+    ``sqlite+aiosqlite://``. URL з явно вказаним драйвером не змінюється.
+
+    :param url: URL бази даних з налаштувань.
+    :type url: str
+    :return: URL для create_async_engine.
+    :rtype: str
+    """
+    parsed = make_url(url)
+    if parsed.drivername in ASYNC_DRIVERS:
+        parsed = parsed.set(drivername=ASYNC_DRIVERS[parsed.drivername])
+    return parsed.render_as_string(hide_password=False)
+
+
+def dialect_name(db) -> str | None:
+    """
+    Повертає назву діалекту бази даних, до якої прив'язана сесія.
+
+    :param db: Сесія бази даних.
+    :type db: AsyncSession
+    :return: Назва діалекту (``postgresql``, ``sqlite``) або None, якщо її
+        неможливо визначити.
+    :rtype: str | None
+    """
     try:
+        name = db.get_bind().dialect.name
+    except Exception:
+        return None
+    return name if isinstance(name, str) else None
+
+
+engine = create_async_engine(
+    to_async_url(DATABASE_URL),
+    poolclass=InstrumentedQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+)
+instrument_engine(engine)
+SessionLocal = async_sessionmaker(
+    bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+Base = declarative_base()
+
+
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+
+def get_session_factory():
+    """
+    Повертає фабрику сесій для коду, що працює довше за запит.
+
+    Сесія з :func:`get_db` закривається до завершення StreamingResponse,
+    тому генератори відповідей відкривають власну сесію з цієї фабрики.
+    """
+    return SessionLocal
@@ -0,0 +1,154 @@
+"""
+Міграції схеми бази даних.
+
+Схема створюється і змінюється лише міграціями Alembic, які запускаються
+один раз перед стартом воркерів::
+
+    python -m src.db.migrate              # upgrade head
+    python -m src.db.migrate current      # поточна ревізія бази
+    python -m src.db.migrate stamp 0001   # позначити ревізію без DDL
+
+Бази, створені до міграцій через ``Base.metadata.create_all``, мають
+таблиці, але не мають ``alembic_version``; перед ``upgrade`` вони
+автоматично позначаються ревізією ``0001`` (:func:`stamp_legacy_schema`).
+
+Під час старту застосунок лише перевіряє, що база на останній ревізії
+(:func:`verify_schema`), — без DDL і рефлексії метаданих.
+"""
+
+import argparse
+import asyncio
+import logging
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+LEGACY_REVISION = "0001"
+"""Ревізія, що відповідає схемі, яку створював ``create_all`` до міграцій."""
+
+
+class SchemaVersionError(RuntimeError):
+    """
+    Ревізія схеми бази даних не відповідає міграціям застосунку.
+    """
+
+
+def alembic_config(url: str | None = None) -> Config:
+    """
+    Конфігурація Alembic проєкту.
+
+    Args:
+        url (str | None): URL бази даних; за замовчуванням — з налаштувань
+            застосунку (див. ``migrations/env.py``).
+
+    Returns:
+        Config: Конфігурація Alembic.
+    """
+    config = Config(str(ALEMBIC_INI))
+    if url:
+        config.set_main_option("sqlalchemy.url", url.replace("%", "%%"))
+    return config
+
+
+def expected_heads(config: Config | None = None) -> set[str]:
+    """
+    Ревізії-голови з каталогу міграцій.
+    """
+    return set(ScriptDirectory.from_config(config or alembic_config()).get_heads())
+
+
+async def verify_schema(engine: AsyncEngine, config: Config | None = None):
+    """
+    Перевіряє, що база даних мігрована до останньої ревізії.
+
+    Виконує один запит до таблиці ``alembic_version``.
+
+    Args:
+        engine (AsyncEngine): Рушій бази даних застосунку.
+        config (Config | None): Конфігурація Alembic.
+
+    Raises:
+        SchemaVersionError: Якщо ревізія бази відрізняється від останньої міграції.
+    """
+    expected = expected_heads(config)
+    async with engine.connect() as conn:
+        current = await conn.run_sync(
+            lambda sync_conn: set(MigrationContext.configure(sync_conn).get_current_heads())
+        )
+    if current != expected:
+        raise SchemaVersionError(
+            f"Database schema revision {sorted(current) or 'none'} does not match "
+            f"{sorted(expected)}; run 'python -m src.db.migrate' first"
+        )
+
+
+async def _table_names(url: str) -> set[str]:
+    engine = create_async_engine(url, poolclass=NullPool)
+    try:
+        async with engine.connect() as conn:
+            return await conn.run_sync(
+                lambda sync_conn: set(inspect(sync_conn).get_table_names())
+            )
+    finally:
+        await engine.dispose()
+
+
+def stamp_legacy_schema(config: Config) -> bool:
+    """
+    Позначає ревізією ``0001`` базу, створену ``create_all`` до міграцій.
+
+    Такі бази мають таблицю ``users``, але не мають ``alembic_version``,
+    тож ``upgrade`` спробував би створити таблиці ``0001`` повторно.
+
+    Args:
+        config (Config): Конфігурація Alembic.
+
+    Returns:
+        bool: True, якщо базу було позначено.
+    """
+    url = config.get_main_option("sqlalchemy.url")
+    if not url:
+        from src.db.connect import to_async_url
+        from src.settings.base import DATABASE_URL
+
+        url = to_async_url(DATABASE_URL)
+    tables = asyncio.run(_table_names(url))
+    if "users" not in tables or "alembic_version" in tables:
+        return False
+    logger.warning("Stamping pre-migration database at revision %s", LEGACY_REVISION)
+    command.stamp(config, LEGACY_REVISION)
+    return True
+
+
+def main(argv: list[str] | None = None):
+    """
+    Точка входу CLI міграцій.
+    """
+    parser = argparse.ArgumentParser(description="Database schema migrations")
+    parser.add_argument(
+        "action", nargs="?", default="upgrade", choices=["upgrade", "stamp", "current"]
+    )
+    parser.add_argument("revision", nargs="?", default="head")
+    args = parser.parse_args(argv)
+
+    config = alembic_config()
+    if args.action == "upgrade":
+        stamp_legacy_schema(config)
+        command.upgrade(config, args.revision)
+    elif args.action == "stamp":
+        command.stamp(config, args.revision)
+    else:
+        command.current(config, verbose=True)
+
+
+if __name__ == "__main__":
+    main()
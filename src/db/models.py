@@ -1,10 +1,23 @@
-from sqlalchemy import Column, Integer, String, Date, Boolean, Enum, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Date, DateTime, Boolean, Enum, ForeignKey, Index, JSON, Text, UniqueConstraint
 
-from sqlalchemy.orm import relationship
-from .connect import Base, engine
+from sqlalchemy.orm import relationship, validates
+from .connect import Base
+from .search import register_search_ddl
 from enum import Enum as PyEnum
 
 
+def birthday_key(value):
+    """
+    Перетворює дату на ключ ``місяць * 100 + день`` (наприклад, 17 травня -> 517).
+
+    Ключ не залежить від року, тому дні народження у вікні дат можна
+    шукати діапазонним запитом по індексу.
+    """
+    if value is None:
+        return None
+    return value.month * 100 + value.day
+
+
 class Role(PyEnum):
     admin = "admin"
     moderator = "moderator"
@@ -22,6 +35,8 @@ class User(Base):
     last_name = Column(String(50), nullable=True)
     confirmed = Column(Boolean, default=False)
     avatar = Column(String(255), nullable=True)
+    avatar_status = Column(String(16), nullable=True)
+    avatar_digest = Column(String(64), nullable=True)
 
     contacts = relationship(
         "Contact", back_populates="user", cascade="all, delete-orphan"
@@ -37,6 +52,7 @@ class Contact(Base):
     email = Column(String(100), unique=True, nullable=False)
     phone_number = Column(String(20), unique=True, nullable=False)
     birthday = Column(Date, nullable=False)
+    birthday_md = Column(Integer, nullable=True)
     additional_info = Column(String(255), nullable=True)
 
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -44,7 +60,39 @@ class Contact(Base):
     __table_args__ = (
         UniqueConstraint("user_id", "email", name="unique_user_email"),
         UniqueConstraint("user_id", "phone_number", name="unique_user_phone"),
+        Index("ix_contacts_user_id_id", "user_id", "id"),
+        Index("ix_contacts_user_birthday_md", "user_id", "birthday_md"),
     )
 
-def init_db():
-    Base.metadata.create_all(bind=engine)
+    @validates("birthday")
+    def _sync_birthday_md(self, key, value):
+        self.birthday_md = birthday_key(value)
+        return value
+
+register_search_ddl(Contact.__table__)
+
+
+class EmailOutbox(Base):
+    """
+    Лист, що очікує надсилання воркером пошти (див. :mod:`src.services.mail_outbox`).
+
+    Запис створюється в тій самій транзакції, що й зміна, яка потребує
+    листа, тому лист не губиться, навіть якщо SMTP-сервер недоступний.
+    """
+
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(32), nullable=False)
+    recipient = Column(String(100), nullable=False)
+    context = Column(JSON, nullable=False, default=dict)
+    status = Column(String(16), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
@@ -0,0 +1,122 @@
+"""
+Інструментований пул з'єднань SQLAlchemy.
+
+Збирає статистику видачі з'єднань (кількість, тайм-аути, гістограму часу
+очікування), щоб розмір пулу на воркер можна було підбирати за даними.
+"""
+
+from bisect import bisect_left
+from time import perf_counter
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PoolMetrics:
+    """
+    Лічильники та гістограма часу очікування з'єднання з пулу.
+
+    Значення накопичуються від старту процесу і не скидаються при
+    ``engine.dispose()``, бо пул при цьому створюється заново.
+    """
+
+    def __init__(self, buckets_ms=WAIT_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self.reset()
+
+    def reset(self):
+        """
+        Обнуляє всі лічильники.
+        """
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_sum_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.bucket_counts = [0] * (len(self.buckets_ms) + 1)
+
+    def observe_wait(self, wait_ms: float):
+        """
+        Реєструє час, витрачений на отримання з'єднання.
+
+        :param wait_ms: Час очікування у мілісекундах.
+        :type wait_ms: float
+        """
+        self.checkouts += 1
+        self.wait_sum_ms += wait_ms
+        self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+        self.bucket_counts[bisect_left(self.buckets_ms, wait_ms)] += 1
+
+    def observe_timeout(self):
+        """
+        Реєструє тайм-аут очікування вільного з'єднання.
+        """
+        self.timeouts += 1
+
+    def histogram(self) -> dict:
+        """
+        Повертає кумулятивну гістограму часу очікування.
+
+        :return: Кількість спостережень для кожної межі ``le_<ms>`` та ``le_inf``.
+        :rtype: dict
+        """
+        histogram = {}
+        total = 0
+        for bound, count in zip(self.buckets_ms, self.bucket_counts):
+            total += count
+            histogram[f"le_{bound}"] = total
+        histogram["le_inf"] = total + self.bucket_counts[-1]
+        return histogram
+
+    def snapshot(self, pool=None) -> dict:
+        """
+        Формує знімок стану пулу та накопиченої статистики.
+
+        :param pool: Пул SQLAlchemy, поточний стан якого треба додати.
+        :return: Словник зі статистикою пулу.
+        :rtype: dict
+        """
+        stats = {}
+        if pool is not None:
+            stats.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=pool.overflow(),
+            )
+        stats.update(
+            checkouts=self.checkouts,
+            timeouts=self.timeouts,
+            wait_time_ms={
+                "sum": round(self.wait_sum_ms, 3),
+                "max": round(self.wait_max_ms, 3),
+                "count": self.checkouts,
+                "buckets": self.histogram(),
+            },
+        )
+        return stats
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool, що вимірює час видачі кожного з'єднання.
+
+    У час очікування входить і очікування вільного слота, і встановлення
+    нового з'єднання та pre-ping, тобто повна затримка checkout.
+    """
+
+    metrics = pool_metrics
+
+    def connect(self):
+        start = perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.observe_timeout()
+            raise
+        self.metrics.observe_wait((perf_counter() - start) * 1000)
+        return connection
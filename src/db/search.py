@@ -0,0 +1,58 @@
+"""
+Індекси повнотекстового пошуку контактів.
+
+PostgreSQL використовує GIN-індекси ``pg_trgm`` по ``first_name``,
+``last_name`` та ``email`` (вони обслуговують і ``ILIKE '%...%'``, і оператор
+схожості ``%``). SQLite (тести) використовує зовнішню FTS5-таблицю
+``contacts_fts`` з токенізатором ``trigram``, яку синхронізують тригери.
+
+Для існуючих баз ті самі об'єкти створює міграція Alembic
+``0003_contacts_search``; тут вони реєструються для ``create_all``.
+"""
+
+from sqlalchemy import DDL, event
+
+SEARCH_COLUMNS = ("first_name", "last_name", "email")
+FTS_TABLE = "contacts_fts"
+
+POSTGRESQL_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    *(
+        f"CREATE INDEX IF NOT EXISTS ix_contacts_{name}_trgm "
+        f"ON contacts USING gin ({name} gin_trgm_ops)"
+        for name in SEARCH_COLUMNS
+    ),
+]
+
+SQLITE_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "first_name, last_name, email, "
+    "content='contacts', content_rowid='id', tokenize='trigram')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON contacts BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, first_name, last_name, email) "
+    "VALUES (new.id, new.first_name, new.last_name, new.email); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON contacts BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, first_name, last_name, email) "
+    "VALUES ('delete', old.id, old.first_name, old.last_name, old.email); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON contacts BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, first_name, last_name, email) "
+    "VALUES ('delete', old.id, old.first_name, old.last_name, old.email); "
+    f"INSERT INTO {FTS_TABLE}(rowid, first_name, last_name, email) "
+    "VALUES (new.id, new.first_name, new.last_name, new.email); END",
+]
+
+SQLITE_DROP_DDL = [f"DROP TABLE IF EXISTS {FTS_TABLE}"]
+
+
+def register_search_ddl(table):
+    """
+    Підключає створення пошукових індексів до ``create_all``/``drop_all`` таблиці.
+
+    :param table: Таблиця ``contacts``.
+    """
+    for statement in POSTGRESQL_DDL:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+    for statement in SQLITE_DDL:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    for statement in SQLITE_DROP_DDL:
+        event.listen(table, "before_drop", DDL(statement).execute_if(dialect="sqlite"))
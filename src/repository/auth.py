@@ -1,6 +1,5 @@
 from fastapi import Depends, HTTPException, status
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from datetime import UTC, datetime, timezone, timedelta
 
 from src.settings.base import ALGORITHM, SECRET_KEY
@@ -11,7 +10,21 @@ class Hash:
     Клас для хешування та перевірки паролів.
     """
 
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    _pwd_context = None
+
+    @property
+    def pwd_context(self):
+        """
+        Контекст passlib, що створюється при першому зверненні.
+
+        passlib і bcrypt імпортуються лише тоді, коли воркер справді хешує
+        пароль, а не під час старту застосунку.
+        """
+        if Hash._pwd_context is None:
+            from passlib.context import CryptContext
+
+            Hash._pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        return Hash._pwd_context
 
     def verify_password(self, plain_password, hashed_password):
         """
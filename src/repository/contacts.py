@@ -1,8 +1,43 @@
-from datetime import datetime, timedelta
+import calendar
+import logging
+from datetime import date, timedelta
 from fastapi import Depends, HTTPException
-
-from src.db.models import Contact, User
+from pydantic import ValidationError
+from sqlalchemy import case, delete, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import DBAPIError, IntegrityError
+
+from src.db.connect import dialect_name
+from src.db.models import Contact, User, birthday_key
+from src.repository.pagination import DEFAULT_PAGE_SIZE, paginate
+from src.repository.search import ranked_search
+from src.schemas.contacts import ContactModel
 from src.services.auth import auth_service
+from src.services.contact_versions import contact_versions
+
+logger = logging.getLogger(__name__)
+
+IMPORT_CHUNK_SIZE = 500
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = (
+    Contact.id,
+    Contact.first_name,
+    Contact.last_name,
+    Contact.email,
+    Contact.phone_number,
+    Contact.birthday,
+    Contact.additional_info,
+)
+
+
+async def _get_user_contact(contact_id: int, db, user: User):
+    """
+    Повертає контакт користувача за ідентифікатором або None.
+    """
+    result = await db.execute(
+        select(Contact).filter(Contact.id == contact_id, Contact.user_id == user.id)
+    )
+    return result.scalars().first()
 
 
 async def create_contact(body, db, user: User = Depends(auth_service.get_current_user)):
@@ -12,7 +47,7 @@ async def create_contact(body, db, user: User = Depends(auth_service.get_current
     :param body: Дані нового контакту.
     :type body: ContactModel (або Pydantic модель)
     :param db: Сесія бази даних.
-    :type db: Session
+    :type db: AsyncSession
     :param user: Поточний користувач (отримується через Depends).
     :type user: User
     :return: Створений контакт.
@@ -21,23 +56,37 @@ async def create_contact(body, db, user: User = Depends(auth_service.get_current
     contact = Contact(**body.model_dump())
     contact.user_id = user.id
     db.add(contact)
-    db.commit()
-    db.refresh(contact)
+    # INSERT ... RETURNING id заповнює первинний ключ, решта полів уже є в
+    # об'єкті, а expire_on_commit=False зберігає їх після commit: refresh не потрібен.
+    await db.commit()
+    await contact_versions.bump(user.id)
     return contact
 
 
-async def get_contacts(db, user: User = Depends(auth_service.get_current_user)):
+async def get_contacts(
+    db,
+    user: User = Depends(auth_service.get_current_user),
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+):
     """
-    Повертає всі контакти для поточного користувача.
+    Повертає сторінку контактів поточного користувача.
+
+    Використовується keyset-пагінація за ``(user_id, id)``.
 
     :param db: Сесія бази даних.
-    :type db: Session
+    :type db: AsyncSession
     :param user: Поточний користувач.
     :type user: User
-    :return: Список контактів.
-    :rtype: list[Contact]
+    :param limit: Максимальна кількість контактів на сторінці.
+    :type limit: int
+    :param cursor: Курсор попередньої сторінки або None для першої.
+    :type cursor: str | None
+    :return: Словник зі списком контактів ``items`` та курсором ``next_cursor``.
+    :rtype: dict
     """
-    return db.query(Contact).filter(Contact.user_id == user.id).all()
+    query = select(Contact).filter(Contact.user_id == user.id)
+    return await paginate(db, query, Contact.id, limit, cursor)
 
 
 async def get_contact_by_id(contact_id, db, user: User = Depends(auth_service.get_current_user)):
@@ -47,14 +96,14 @@ async def get_contact_by_id(contact_id, db, user: User = Depends(auth_service.ge
     :param contact_id: Ідентифікатор контакту.
     :type contact_id: int
     :param db: Сесія бази даних.
-    :type db: Session
+    :type db: AsyncSession
     :param user: Поточний користувач.
     :type user: User
     :raises HTTPException: Якщо контакт не знайдено.
     :return: Контакт.
     :rtype: Contact
     """
-    contact = db.query(Contact).filter(Contact.id == contact_id, Contact.user_id == user.id).first()
+    contact = await _get_user_contact(contact_id, db, user)
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
     return contact
@@ -62,65 +111,184 @@ async def get_contact_by_id(contact_id, db, user: User = Depends(auth_service.ge
 
 async def delete_contact(contact_id, db, user: User = Depends(auth_service.get_current_user)):
     """
-    Видаляє контакт за ідентифікатором.
+    Видаляє контакт за ідентифікатором одним ``DELETE ... RETURNING``.
 
     :param contact_id: Ідентифікатор контакту.
     :type contact_id: int
     :param db: Сесія бази даних.
-    :type db: Session
+    :type db: AsyncSession
     :param user: Поточний користувач.
     :type user: User
     :raises HTTPException: Якщо контакт не знайдено.
     :return: Видалений контакт.
     :rtype: Contact
     """
-    contact = db.query(Contact).filter(Contact.id == contact_id, Contact.user_id == user.id).first()
+    stmt = (
+        delete(Contact)
+        .where(Contact.id == contact_id, Contact.user_id == user.id)
+        .returning(Contact)
+    )
+    contact = (await db.execute(stmt)).scalars().first()
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
 
-    db.delete(contact)
-    db.commit()
+    await db.commit()
+    await contact_versions.bump(user.id)
     return contact
 
 
 async def update_contact(contact_id: int, body, db, user: User = Depends(auth_service.get_current_user)):
     """
-    Оновлює дані контакту за ідентифікатором.
+    Оновлює дані контакту за ідентифікатором одним ``UPDATE ... RETURNING``.
 
     :param contact_id: Ідентифікатор контакту.
     :type contact_id: int
     :param body: Нові дані для оновлення.
     :type body: ContactUpdateModel (або Pydantic модель)
     :param db: Сесія бази даних.
-    :type db: Session
+    :type db: AsyncSession
     :param user: Поточний користувач.
     :type user: User
     :raises HTTPException: Якщо контакт не знайдено.
     :return: Оновлений контакт.
     :rtype: Contact
     """
-    contact = db.query(Contact).filter(Contact.id == contact_id, Contact.user_id == user.id).first()
+    values = body.model_dump(exclude_unset=True)
+    if not values:
+        return await get_contact_by_id(contact_id, db, user)
+    if "birthday" in values:
+        values["birthday_md"] = birthday_key(values["birthday"])
+
+    stmt = (
+        update(Contact)
+        .where(Contact.id == contact_id, Contact.user_id == user.id)
+        .values(**values)
+        .returning(Contact)
+        .execution_options(populate_existing=True)
+    )
+    contact = (await db.execute(stmt)).scalars().first()
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
 
-    for key, value in body.model_dump(exclude_unset=True).items():
-        setattr(contact, key, value)
-
-    db.commit()
-    db.refresh(contact)
+    await db.commit()
+    await contact_versions.bump(user.id)
     return contact
 
 
+def _batch_report(ids, done: set, success: str) -> dict:
+    """
+    Формує звіт пакетної операції зі статусом для кожного ідентифікатора.
+    """
+    results = [
+        {"id": contact_id, "status": success if contact_id in done else "not_found"}
+        for contact_id in ids
+    ]
+    return {"succeeded": len(done), "failed": len(ids) - len(done), "results": results}
+
+
+async def batch_update_contacts(
+    patches, db, user: User = Depends(auth_service.get_current_user)
+):
+    """
+    Оновлює багато контактів в одній транзакції.
+
+    Патчі з однаковим набором змін об'єднуються в один
+    ``UPDATE ... WHERE id IN (...) AND user_id = ... RETURNING id``, тож для
+    типової синхронізації (одна зміна для багатьох контактів) виконується
+    один запит. Якщо ідентифікатор повторюється, зміни зливаються, пізніші
+    мають пріоритет.
+
+    :param patches: Список патчів ``ContactBatchPatch``.
+    :param db: Сесія бази даних.
+    :type db: AsyncSession
+    :param user: Поточний користувач.
+    :type user: User
+    :raises HTTPException: Якщо зміни порушують унікальність email або телефону (409);
+        у цьому випадку жоден контакт не змінюється.
+    :return: Кількість оновлених і не знайдених контактів та статус кожного id.
+    :rtype: dict
+    """
+    changes = {}
+    for patch in patches:
+        values = patch.model_dump(exclude_unset=True, exclude={"id"})
+        changes.setdefault(patch.id, {}).update(values)
+
+    groups = {}
+    for contact_id, values in changes.items():
+        groups.setdefault(tuple(sorted(values.items())), []).append(contact_id)
+
+    updated = set()
+    try:
+        for items, ids in groups.items():
+            values = dict(items)
+            if "birthday" in values:
+                values["birthday_md"] = birthday_key(values["birthday"])
+            stmt = (
+                update(Contact)
+                .where(Contact.id.in_(ids), Contact.user_id == user.id)
+                .values(**values)
+                .returning(Contact.id)
+                .execution_options(synchronize_session=False)
+            )
+            updated.update((await db.execute(stmt)).scalars().all())
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail="Contact with this email or phone number already exists",
+        )
+    if updated:
+        await contact_versions.bump(user.id)
+    return _batch_report(list(changes), updated, "updated")
+
+
+async def batch_delete_contacts(
+    ids, db, user: User = Depends(auth_service.get_current_user)
+):
+    """
+    Видаляє багато контактів одним ``DELETE ... RETURNING id``.
+
+    :param ids: Ідентифікатори контактів.
+    :type ids: list[int]
+    :param db: Сесія бази даних.
+    :type db: AsyncSession
+    :param user: Поточний користувач.
+    :type user: User
+    :return: Кількість видалених і не знайдених контактів та статус кожного id.
+    :rtype: dict
+    """
+    ids = list(dict.fromkeys(ids))
+    stmt = (
+        delete(Contact)
+        .where(Contact.id.in_(ids), Contact.user_id == user.id)
+        .returning(Contact.id)
+        .execution_options(synchronize_session=False)
+    )
+    deleted = set((await db.execute(stmt)).scalars().all())
+    await db.commit()
+    if deleted:
+        await contact_versions.bump(user.id)
+    return _batch_report(ids, deleted, "deleted")
+
+
 async def search_contacts(
     first_name: str | None,
     last_name: str | None,
     email: str | None,
     db,
     user: User = Depends(auth_service.get_current_user),
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    q: str | None = None,
 ):
     """
     Пошук контактів за іменем, прізвищем або email.
 
+    Якщо передано ``q``, виконується ранжований повнотекстовий пошук
+    (див. :func:`src.repository.search.ranked_search`): повертається одна
+    сторінка з ``limit`` найрелевантніших контактів без ``next_cursor``.
+
     :param first_name: Ім'я для пошуку.
     :type first_name: str | None
     :param last_name: Прізвище для пошуку.
@@ -128,14 +296,26 @@ async def search_contacts(
     :param email: Email для пошуку.
     :type email: str | None
     :param db: Сесія бази даних.
-    :type db: Session
+    :type db: AsyncSession
     :param user: Поточний користувач.
     :type user: User
+    :param limit: Максимальна кількість контактів на сторінці.
+    :type limit: int
+    :param cursor: Курсор попередньої сторінки або None для першої.
+    :type cursor: str | None
+    :param q: Рядок вільного пошуку по імені, прізвищу та email.
+    :type q: str | None
     :raises HTTPException: Якщо не знайдено жодного контакту.
-    :return: Список знайдених контактів.
-    :rtype: list[Contact]
+    :return: Словник зі списком знайдених контактів ``items`` та курсором ``next_cursor``.
+    :rtype: dict
     """
-    query = db.query(Contact).filter(Contact.user_id == user.id)
+    if q:
+        items = await ranked_search(db, user.id, q, limit)
+        if not items:
+            raise HTTPException(status_code=404, detail="Contact not found")
+        return {"items": items, "next_cursor": None}
+
+    query = select(Contact).filter(Contact.user_id == user.id)
 
     if first_name:
         query = query.filter(Contact.first_name.ilike(f"%{first_name}%"))
@@ -144,42 +324,224 @@ async def search_contacts(
     if email:
         query = query.filter(Contact.email.ilike(f"%{email}%"))
 
-    results = query.all()
+    page = await paginate(db, query, Contact.id, limit, cursor)
 
-    if not results:
+    if not page["items"] and cursor is None:
         raise HTTPException(status_code=404, detail="Contact not found")
-    return results
+    return page
+
+
+def birthday_window(today: date, days: int):
+    """
+    Обчислює діапазон ключів ``місяць * 100 + день`` для вікна днів народження.
+
+    Контакти, народжені 29 лютого, у невисокосні роки святкують 28 лютого,
+    тому якщо вікно закінчується 28 лютого невисокосного року, воно
+    розширюється на ключ 229.
+
+    :param today: Перший день вікна.
+    :type today: date
+    :param days: Кількість днів після ``today``, що входять у вікно.
+    :type days: int
+    :return: Кортеж ``(start_key, end_key, wraps)``, де ``wraps`` означає,
+        що вікно переходить через кінець року.
+    :rtype: tuple[int, int, bool]
+    """
+    end = today + timedelta(days=days)
+    start_key = birthday_key(today)
+    end_key = birthday_key(end)
+    if end_key == 228 and not calendar.isleap(end.year):
+        end_key = 229
+    return start_key, end_key, end.year > today.year
 
 
-async def upcoming_birthdays(db, user: User = Depends(auth_service.get_current_user)):
+async def upcoming_birthdays(
+    db, user: User = Depends(auth_service.get_current_user), days: int = 7
+):
     """
-    Повертає контакти з днями народження протягом наступних 7 днів.
+    Повертає контакти з днями народження протягом наступних ``days`` днів.
+
+    Вікно обчислюється у базі даних за індексованою колонкою ``birthday_md``,
+    тому вибираються лише контакти, що потрапляють у вікно. Перехід через
+    кінець року та 29 лютого обробляються у :func:`birthday_window`.
 
     :param db: Сесія бази даних.
-    :type db: Session
+    :type db: AsyncSession
     :param user: Поточний користувач.
     :type user: User
+    :param days: Довжина вікна у днях (за замовчуванням 7).
+    :type days: int
     :raises HTTPException: Якщо не знайдено жодного контакту з наближеним днем народження.
-    :return: Список контактів з майбутніми днями народження.
+    :return: Список контактів з майбутніми днями народження, впорядкований за датою.
     :rtype: list[Contact]
     """
-    today = datetime.today().date()
-    next_week = today + timedelta(days=7)
+    start_key, end_key, wraps = birthday_window(date.today(), days)
 
-    contacts_all = db.query(Contact).filter(Contact.user_id == user.id).all()
-    upcoming = []
+    if wraps:
+        in_window = or_(Contact.birthday_md >= start_key, Contact.birthday_md <= end_key)
+    else:
+        in_window = Contact.birthday_md.between(start_key, end_key)
 
-    for contact in contacts_all:
-        if contact.birthday:
-            birthday_this_year = contact.birthday.replace(year=today.year)
-
-            if birthday_this_year < today:
-                birthday_this_year = birthday_this_year.replace(year=today.year + 1)
-
-            if today <= birthday_this_year <= next_week:
-                upcoming.append(contact)
+    query = (
+        select(Contact)
+        .filter(Contact.user_id == user.id, in_window)
+        .order_by(case((Contact.birthday_md >= start_key, 0), else_=1), Contact.birthday_md)
+    )
+    upcoming = (await db.execute(query)).scalars().all()
 
     if not upcoming:
         raise HTTPException(status_code=404, detail="No upcoming birthdays found")
 
     return upcoming
+
+
+def _validation_message(err: ValidationError) -> str:
+    """
+    Стисло описує помилки валідації рядка імпорту.
+    """
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in err.errors()
+    )
+
+
+async def _insert_chunk(rows, db, user: User, errors: list) -> int:
+    """
+    Вставляє пачку провалідованих рядків одним ``INSERT ... ON CONFLICT DO NOTHING``.
+
+    Рядки, що конфліктують з існуючими контактами (``unique_user_email``,
+    ``unique_user_phone``) або дублюють email/телефон у межах пачки,
+    потрапляють у ``errors``. Якщо база відхилила INSERT (наприклад,
+    ``DataError``), пачка відкочується, а всі її рядки потрапляють у
+    ``errors``; попередні пачки лишаються збереженими.
+
+    :param rows: Список пар ``(номер_рядка, ContactModel)``.
+    :param db: Сесія бази даних.
+    :type db: AsyncSession
+    :param user: Поточний користувач.
+    :type user: User
+    :param errors: Список, до якого додаються помилки рядків.
+    :type errors: list
+    :return: Кількість вставлених контактів.
+    :rtype: int
+    """
+    seen_emails, seen_phones, unique_rows = set(), set(), []
+    for row_number, model in rows:
+        if model.email in seen_emails or model.phone_number in seen_phones:
+            errors.append(
+                {"row": row_number, "error": "Duplicate email or phone number in import"}
+            )
+            continue
+        seen_emails.add(model.email)
+        seen_phones.add(model.phone_number)
+        unique_rows.append((row_number, model))
+    if not unique_rows:
+        return 0
+
+    values = [
+        {**model.model_dump(), "user_id": user.id, "birthday_md": birthday_key(model.birthday)}
+        for _, model in unique_rows
+    ]
+    insert = sqlite.insert if dialect_name(db) == "sqlite" else postgresql.insert
+    stmt = insert(Contact).values(values).on_conflict_do_nothing().returning(Contact.email)
+    try:
+        inserted = set((await db.execute(stmt)).scalars().all())
+        await db.commit()
+    except DBAPIError as err:
+        await db.rollback()
+        logger.warning("Contact import chunk rejected: %s", err.orig)
+        errors.extend(
+            {"row": row_number, "error": "Rejected by the database"}
+            for row_number, _ in unique_rows
+        )
+        return 0
+
+    for row_number, model in unique_rows:
+        if model.email not in inserted:
+            errors.append(
+                {
+                    "row": row_number,
+                    "error": "Contact with this email or phone number already exists",
+                }
+            )
+    return len(inserted)
+
+
+async def import_contacts(
+    records,
+    db,
+    user: User = Depends(auth_service.get_current_user),
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+):
+    """
+    Масово імпортує контакти з потоку записів.
+
+    Записи валідуються моделлю ``ContactModel`` і вставляються пачками по
+    ``chunk_size`` рядків; кожна пачка — один INSERT і один commit, тому
+    в пам'яті тримається не більше однієї пачки.
+
+    :param records: Асинхронний ітератор пар ``(номер_рядка, dict | Exception)``
+        (див. :func:`src.services.contact_import.iter_records`).
+    :param db: Сесія бази даних.
+    :type db: AsyncSession
+    :param user: Поточний користувач.
+    :type user: User
+    :param chunk_size: Кількість рядків в одному INSERT.
+    :type chunk_size: int
+    :return: Звіт: кількість вставлених і відхилених рядків та помилки по рядках.
+    :rtype: dict
+    """
+    inserted, errors, chunk = 0, [], []
+
+    async for row_number, record in records:
+        if isinstance(record, Exception):
+            errors.append({"row": row_number, "error": str(record)})
+            continue
+        try:
+            chunk.append((row_number, ContactModel.model_validate(record)))
+        except ValidationError as err:
+            errors.append({"row": row_number, "error": _validation_message(err)})
+            continue
+        if len(chunk) >= chunk_size:
+            inserted += await _insert_chunk(chunk, db, user, errors)
+            chunk = []
+
+    if chunk:
+        inserted += await _insert_chunk(chunk, db, user, errors)
+
+    if inserted:
+        await contact_versions.bump(user.id)
+    errors.sort(key=lambda error: error["row"])
+    return {"inserted": inserted, "failed": len(errors), "errors": errors}
+
+
+async def stream_contacts(
+    session_factory,
+    user: User = Depends(auth_service.get_current_user),
+    batch_size: int = EXPORT_BATCH_SIZE,
+):
+    """
+    Потоково вибирає всі контакти користувача пачками рядків.
+
+    Запит виконується з ``yield_per``: на PostgreSQL це серверний курсор,
+    тому в пам'яті одночасно знаходиться не більше ``batch_size`` рядків.
+    Вибираються лише колонки, без створення ORM-об'єктів. Генератор
+    відкриває власну сесію, бо виконується після завершення обробника.
+
+    :param session_factory: Фабрика асинхронних сесій.
+    :param user: Поточний користувач.
+    :type user: User
+    :param batch_size: Кількість рядків у пачці.
+    :type batch_size: int
+    :return: Асинхронний генератор списків рядків (``RowMapping``).
+    """
+    query = (
+        select(*EXPORT_COLUMNS)
+        .filter(Contact.user_id == user.id)
+        .order_by(Contact.id)
+        .execution_options(yield_per=batch_size)
+    )
+    async with session_factory() as db:
+        result = await db.stream(query)
+        async for partition in result.mappings().partitions():
+            yield partition
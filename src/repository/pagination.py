@@ -0,0 +1,71 @@
+import base64
+import json
+
+from fastapi import HTTPException, status
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Кодує ідентифікатор останнього запису сторінки у непрозорий курсор.
+
+    :param last_id: Ідентифікатор останнього контакту на сторінці.
+    :type last_id: int
+    :return: Курсор у форматі urlsafe base64.
+    :rtype: str
+    """
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Розкодовує курсор, отриманий від клієнта.
+
+    :param cursor: Курсор з попередньої відповіді (``next_cursor``).
+    :type cursor: str
+    :raises HTTPException: Якщо курсор пошкоджений (400 Bad Request).
+    :return: Ідентифікатор, після якого починається наступна сторінка.
+    :rtype: int
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded))["id"]
+        if not isinstance(last_id, int):
+            raise ValueError
+        return last_id
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+async def paginate(db, query, id_column, limit: int, cursor: str | None = None) -> dict:
+    """
+    Виконує keyset-пагінацію запиту за зростанням ідентифікатора.
+
+    Замість OFFSET використовується умова ``id > last_id``, тому вартість
+    запиту не залежить від номера сторінки. Вибирається ``limit + 1`` рядок,
+    щоб без окремого COUNT визначити, чи є наступна сторінка.
+
+    :param db: Сесія бази даних.
+    :type db: AsyncSession
+    :param query: Запит select() з уже застосованими фільтрами.
+    :param id_column: Колонка ідентифікатора, за якою впорядковуються записи.
+    :param limit: Максимальна кількість записів на сторінці.
+    :type limit: int
+    :param cursor: Курсор попередньої сторінки або None для першої.
+    :type cursor: str | None
+    :return: Словник ``{"items": [...], "next_cursor": str | None}``.
+    :rtype: dict
+    """
+    if cursor is not None:
+        query = query.filter(id_column > decode_cursor(cursor))
+    query = query.order_by(id_column).limit(limit + 1)
+
+    rows = (await db.execute(query)).scalars().all()
+    items = rows[:limit]
+    next_cursor = encode_cursor(items[-1].id) if len(rows) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
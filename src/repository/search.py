@@ -0,0 +1,86 @@
+from sqlalchemy import column, func, literal_column, or_, select, table
+
+from src.db.connect import dialect_name
+from src.db.models import Contact
+from src.db.search import FTS_TABLE
+
+TRIGRAM_MIN_LENGTH = 3
+
+fts = table(FTS_TABLE, column("rowid"))
+
+
+def _substring_filter(q: str):
+    """
+    Умова ILIKE '%q%' по імені, прізвищу та email.
+    """
+    return or_(
+        Contact.first_name.icontains(q, autoescape=True),
+        Contact.last_name.icontains(q, autoescape=True),
+        Contact.email.icontains(q, autoescape=True),
+    )
+
+
+def _postgresql_query(user_id: int, q: str):
+    """
+    Пошук за GIN-індексами pg_trgm з ранжуванням за схожістю.
+    """
+    columns = (Contact.first_name, Contact.last_name, Contact.email)
+    rank = func.greatest(*(func.similarity(col, q) for col in columns))
+    return (
+        select(Contact)
+        .filter(
+            Contact.user_id == user_id,
+            or_(_substring_filter(q), *(col.op("%")(q) for col in columns)),
+        )
+        .order_by(rank.desc(), Contact.id)
+    )
+
+
+def _sqlite_query(user_id: int, q: str):
+    """
+    Пошук у FTS5-таблиці з токенізатором trigram, ранжування bm25.
+    """
+    phrase = '"' + q.replace('"', '""') + '"'
+    fts_ref = literal_column(FTS_TABLE)
+    return (
+        select(Contact)
+        .join(fts, fts.c.rowid == Contact.id)
+        .filter(Contact.user_id == user_id, fts_ref.op("MATCH")(phrase))
+        .order_by(func.bm25(fts_ref), Contact.id)
+    )
+
+
+async def ranked_search(db, user_id: int, q: str, limit: int) -> list[Contact]:
+    """
+    Повнотекстовий пошук контактів користувача за одним рядком ``q``.
+
+    Рядок шукається одночасно в імені, прізвищі та email. На PostgreSQL
+    використовуються індекси pg_trgm, на SQLite — FTS5 (trigram); для інших
+    діалектів та запитів, коротших за триграму, — звичайний пошук підрядка.
+    Результати впорядковані за релевантністю.
+
+    :param db: Сесія бази даних.
+    :type db: AsyncSession
+    :param user_id: Ідентифікатор власника контактів.
+    :type user_id: int
+    :param q: Рядок пошуку.
+    :type q: str
+    :param limit: Максимальна кількість результатів.
+    :type limit: int
+    :return: Список знайдених контактів, найрелевантніші першими.
+    :rtype: list[Contact]
+    """
+    dialect = dialect_name(db)
+    if dialect == "postgresql":
+        query = _postgresql_query(user_id, q)
+    elif dialect == "sqlite" and len(q) >= TRIGRAM_MIN_LENGTH:
+        query = _sqlite_query(user_id, q)
+    else:
+        query = (
+            select(Contact)
+            .filter(Contact.user_id == user_id, _substring_filter(q))
+            .order_by(Contact.id)
+        )
+
+    result = await db.execute(query.limit(limit))
+    return result.scalars().all()
@@ -1,93 +1,128 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.db.models import User
 from src.schemas.auth import UserModel
+from src.services.user_cache import user_cache
 
 
-async def get_user_by_email(email: str, db: Session):
+async def get_user_by_email(email: str, db: AsyncSession):
     """
     Повертає користувача за email.
 
     :param email: Email користувача.
     :type email: str
     :param db: Сесія бази даних.
-    :type db: Session
+    :type db: AsyncSession
     :return: Об'єкт користувача або None, якщо не знайдено.
     :rtype: User | None
     """
-    user = db.query(User).filter_by(email=email).first()
+    result = await db.execute(select(User).filter_by(email=email))
+    user = result.scalars().first()
     return user
 
 
-async def create_user(body: UserModel, db: Session):
+async def create_user(body: UserModel, db: AsyncSession):
     """
     Створює нового користувача у базі даних.
 
     :param body: Дані користувача.
     :type body: UserModel
     :param db: Сесія бази даних.
-    :type db: Session
+    :type db: AsyncSession
     :return: Створений користувач.
     :rtype: User
     """
     user = User(**body.model_dump())
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
     return user
 
 
-async def change_confirmed_email(email: str, db: Session) -> None:
+async def _update_user(email: str, db: AsyncSession, **values) -> User | None:
     """
-    Позначає email як підтверджений.
+    Оновлює поля користувача одним ``UPDATE ... RETURNING``, комітить зміни
+    і скидає кешований знімок користувача.
+
+    Вже завантажений у сесію об'єкт користувача оновлюється на місці.
+    """
+    stmt = (
+        update(User)
+        .where(User.email == email)
+        .values(**values)
+        .returning(User)
+        .execution_options(populate_existing=True)
+    )
+    user = (await db.execute(stmt)).scalars().first()
+    if user is None:
+        return None
+    await db.commit()
+    await user_cache.invalidate(email)
+    return user
+
+
+async def change_confirmed_email(email: str, db: AsyncSession) -> None:
+    """
+    Позначає email як підтверджений і скидає кешований знімок користувача.
 
     :param email: Email користувача.
     :type email: str
     :param db: Сесія бази даних.
-    :type db: Session
+    :type db: AsyncSession
     :return: None
     """
-    user = await get_user_by_email(email, db)
-    user.confirmed = True
-    db.commit()
+    await _update_user(email, db, confirmed=True)
 
 
-async def update_avatar_url(email: str, url: str, db: Session) -> User:
+async def update_avatar_url(
+    email: str, url: str, db: AsyncSession, digest: str | None = None
+) -> User:
     """
-    Оновлює URL аватара користувача.
+    Оновлює URL аватара користувача, позначає аватар готовим і скидає
+    кешований знімок користувача.
 
     :param email: Email користувача.
     :type email: str
     :param url: Новий URL аватара.
     :type url: str
     :param db: Сесія бази даних.
-    :type db: Session
+    :type db: AsyncSession
+    :param digest: Хеш SHA-256 зображення аватара.
+    :type digest: str | None
     :return: Оновлений користувач.
     :rtype: User
     """
-    user = await get_user_by_email(email, db)
-    user.avatar = url
-    db.commit()
-    db.refresh(user)
-    return user
+    return await _update_user(
+        email, db, avatar=url, avatar_status="ready", avatar_digest=digest
+    )
+
+
+async def update_avatar_status(email: str, avatar_status: str, db: AsyncSession) -> User:
+    """
+    Оновлює стан обробки аватара (``pending``, ``ready``, ``failed``).
+
+    :param email: Email користувача.
+    :type email: str
+    :param avatar_status: Новий стан аватара.
+    :type avatar_status: str
+    :param db: Сесія бази даних.
+    :type db: AsyncSession
+    :return: Оновлений користувач.
+    :rtype: User
+    """
+    return await _update_user(email, db, avatar_status=avatar_status)
 
 
-async def update_user_password(email: str, hashed_password: str, db: Session):
+async def update_user_password(email: str, hashed_password: str, db: AsyncSession):
     """
-    Оновлює пароль користувача на новий хеш.
+    Оновлює пароль користувача на новий хеш і скидає кешований знімок користувача.
 
     :param email: Email користувача.
     :type email: str
     :param hashed_password: Хешований пароль.
     :type hashed_password: str
     :param db: Сесія бази даних.
-    :type db: Session
+    :type db: AsyncSession
     :return: Оновлений користувач або None, якщо не знайдено.
     :rtype: User | None
     """
-    user = await get_user_by_email(email, db)
-    if not user:
-        return None
-    user.password = hashed_password
-    db.commit()
-    db.refresh(user)
-    return user
+    return await _update_user(email, db, password=hashed_password)
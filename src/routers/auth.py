@@ -1,17 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, status, BackgroundTasks
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.db.connect import get_db
 from src.schemas.auth import User, UserModelRegister, UserModel
-from src.repository.auth import (
-    Hash,
-    create_access_token,
-    get_email_from_token,
-    create_email_token
-)
+from src.repository.auth import create_access_token, get_email_from_token
 from src.repository.user import create_user, get_user_by_email, change_confirmed_email, update_user_password
-from src.services.email import send_email, send_reset_password_email
 from src.services.auth import auth_service
-from src.services.limiter import limiter
+from src.services.hashing import hash_pool
+from src.services.limiter import login_limit, me_limit, signup_limit
+from src.services.mail_outbox import enqueue_email
 
 from src.schemas.auth import RequestResetPassword, ResetPassword, ResetPasswordWithToken
 from jose import JWTError
@@ -19,28 +15,30 @@ from jose import JWTError
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-hash_handler = Hash()
-
-
-@router.post("/signup", status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/signup",
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(signup_limit)],
+)
 async def signup(
     body: UserModelRegister,
-    background_tasks: BackgroundTasks,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Реєструє нового користувача.
 
+    Лист підтвердження записується в outbox у тій самій транзакції, що й
+    користувач, і надсилається воркером пошти.
+
     :param body: Дані для реєстрації користувача.
     :type body: UserModelRegister
-    :param background_tasks: Фонові задачі для відправки email.
-    :type background_tasks: BackgroundTasks
     :param request: HTTP-запит.
     :type request: Request
     :param db: Сесія бази даних.
-    :type db: Session
+    :type db: AsyncSession
     :raises HTTPException: Якщо акаунт з таким email вже існує (409 Conflict).
+    :raises HTTPException: Якщо пул хешування паролів перевантажений (429 Too Many Requests).
     :return: Створений користувач.
     :rtype: User
     """
@@ -49,25 +47,33 @@ async def signup(
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT, detail="Account already exists"
         )
-    body.password = hash_handler.get_password_hash(body.password)
-    new_user = await create_user(body, db)
-    background_tasks.add_task(
-        send_email, new_user.email, new_user.first_name, str(request.base_url)
+    body.password = await hash_pool.get_password_hash(body.password)
+    enqueue_email(
+        db,
+        "verify",
+        body.email,
+        {"username": body.first_name, "host": str(request.base_url)},
     )
+    new_user = await create_user(body, db)
     return new_user
 
 
-@router.post("/login", status_code=status.HTTP_201_CREATED)
-async def login(body: UserModel, db: Session = Depends(get_db)):
+@router.post(
+    "/login",
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(login_limit)],
+)
+async def login(body: UserModel, db: AsyncSession = Depends(get_db)):
     """
     Авторизує користувача та видає JWT токен.
 
     :param body: Дані для авторизації (email та пароль).
     :type body: UserModel
     :param db: Сесія бази даних.
-    :type db: Session
+    :type db: AsyncSession
     :raises HTTPException: Якщо email або пароль невірні (401 Unauthorized).
     :raises HTTPException: Якщо email не підтверджений.
+    :raises HTTPException: Якщо пул хешування паролів перевантажений (429 Too Many Requests).
     :return: JWT токен доступу та тип токена.
     :rtype: dict
     """
@@ -77,7 +83,7 @@ async def login(body: UserModel, db: Session = Depends(get_db)):
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email"
         )
 
-    if not hash_handler.verify_password(body.password, user.password):
+    if not await hash_pool.verify_password(body.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid password"
         )
@@ -92,14 +98,14 @@ async def login(body: UserModel, db: Session = Depends(get_db)):
 
 
 @router.get("/confirmed_email/{token}")
-async def confirmed_email(token: str, db: Session = Depends(get_db)):
+async def confirmed_email(token: str, db: AsyncSession = Depends(get_db)):
     """
     Підтверджує email користувача за токеном.
 
     :param token: Токен підтвердження email.
     :type token: str
     :param db: Сесія бази даних.
-    :type db: Session
+    :type db: AsyncSession
     :raises HTTPException: Якщо користувач не знайдений або токен невалідний (400 Bad Request).
     :return: Повідомлення про статус підтвердження.
     :rtype: dict
@@ -117,8 +123,7 @@ async def confirmed_email(token: str, db: Session = Depends(get_db)):
     return {"message": "Email confirmed"}
 
 
-@router.get("/me")
-@limiter.limit("5/minute")
+@router.get("/me", dependencies=[Depends(me_limit)])
 async def get_current_user_info(
     request: Request, user: User = Depends(auth_service.get_current_user)
 ):
@@ -138,31 +143,26 @@ async def get_current_user_info(
 @router.post("/request-reset-password", status_code=status.HTTP_200_OK)
 async def request_reset_password(
     body: RequestResetPassword,
-    background_tasks: BackgroundTasks,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
-    Запит на відновлення пароля. Якщо email існує, відправляє лист із посиланням на зміну пароля.
+    Запит на відновлення пароля. Якщо email існує, записує в outbox лист із
+    посиланням на зміну пароля; лист надсилає воркер пошти.
 
     :param body: Дані для запиту скидання пароля (email).
     :type body: RequestResetPassword
-    :param background_tasks: Фонові задачі для відправки email.
-    :type background_tasks: BackgroundTasks
     :param request: HTTP-запит.
     :type request: Request
     :param db: Сесія бази даних.
-    :type db: Session
+    :type db: AsyncSession
     :return: Повідомлення про те, що посилання на скидання пароля надіслано (якщо email існує).
     :rtype: dict
     """
     user = await get_user_by_email(body.email, db)
     if user:
-        token = create_email_token({"sub": user.email})
-        reset_link = f"{request.base_url}auth/reset-password?token={token}"
-        background_tasks.add_task(
-            send_reset_password_email, user.email, reset_link
-        )
+        enqueue_email(db, "reset", user.email, {"host": str(request.base_url)})
+        await db.commit()
 
     return {"message": "If the email exists, a reset link was sent"}
 
@@ -171,7 +171,7 @@ async def request_reset_password(
 async def reset_password(
     token: str,
     body: ResetPassword,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Скидає пароль користувача за допомогою токена.
@@ -181,8 +181,9 @@ async def reset_password(
     :param body: Новий пароль.
     :type body: ResetPassword
     :param db: Сесія бази даних.
-    :type db: Session
+    :type db: AsyncSession
     :raises HTTPException: Якщо токен невалідний або користувач не знайдений (400 Bad Request).
+    :raises HTTPException: Якщо пул хешування паролів перевантажений (429 Too Many Requests).
     :return: Повідомлення про успішне скидання пароля.
     :rtype: dict
     """
@@ -195,7 +196,7 @@ async def reset_password(
     if not user:
         raise HTTPException(status_code=400, detail="User not found")
 
-    hashed_password = hash_handler.get_password_hash(body.password)
+    hashed_password = await hash_pool.get_password_hash(body.password)
     await update_user_password(email, hashed_password, db)
 
     return {"message": "Password has been reset successfully"}
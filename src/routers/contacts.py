@@ -1,11 +1,33 @@
-from fastapi import APIRouter, Depends, Query, status
+from datetime import date
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from src.db.models import User
-from src.db.connect import get_db
+from src.db.connect import get_db, get_session_factory
 from src.repository import contacts
+from src.repository.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from src.schemas import contacts as schemas_contact
 from src.services.auth import auth_service
+from src.services.contact_cache import contact_cache
+from src.services.contact_export import MEDIA_TYPES, export_chunks
+from src.services.contact_import import ImportFormatError, detect_format, iter_records
+from src.services.contact_versions import contacts_etag
+from src.services.limiter import contacts_limit
 
-router = APIRouter(prefix="/contacts", tags=["contacts"])
+router = APIRouter(
+    prefix="/contacts", tags=["contacts"], dependencies=[Depends(contacts_limit)]
+)
+
+
+def _json_response(body: bytes, response: Response) -> Response:
+    """
+    Відповідь з уже серіалізованим JSON-тілом.
+
+    FastAPI не валідує і не серіалізує повернений ``Response`` повторно;
+    заголовки, встановлені залежностями (ETag), переносяться з ``response``.
+    """
+    return Response(content=body, media_type="application/json", headers=response.headers)
 
 
 @router.post(
@@ -33,57 +55,229 @@ async def create_contact(
     return contact
 
 
-@router.get("/search", name="Search contacts")
+@router.post(
+    "/import",
+    response_model=schemas_contact.ContactImportReport,
+    name="Bulk import contacts",
+)
+async def import_contacts(
+    request: Request,
+    format: Literal["csv", "ndjson"] | None = Query(default=None),
+    db=Depends(get_db),
+    user: User = Depends(auth_service.get_current_user),
+):
+    """
+    Масовий імпорт контактів з CSV або NDJSON у тілі запиту.
+
+    Тіло читається потоково; CSV повинен мати заголовок з назвами полів
+    ``ContactModel``. Формат задається параметром ``format`` або заголовком
+    Content-Type (``text/csv``, ``application/x-ndjson``). Рядки з помилками
+    пропускаються і потрапляють у звіт.
+
+    :param request: HTTP-запит з файлом імпорту в тілі.
+    :param format: Формат файлу (необов’язково).
+    :param db: Сесія бази даних.
+    :param user: Поточний авторизований користувач.
+    :raises HTTPException: Якщо формат не підтримується або заголовок CSV некоректний (415/400).
+    :return: Кількість імпортованих і відхилених рядків та помилки по рядках.
+    :rtype: ContactImportReport
+    """
+    try:
+        fmt = detect_format(format, request.headers.get("content-type"))
+    except ImportFormatError as err:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(err)
+        )
+
+    try:
+        return await contacts.import_contacts(
+            iter_records(request.stream(), fmt), db, user
+        )
+    except ImportFormatError as err:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(err))
+
+
+@router.get("/export", name="Export contacts")
+async def export_contacts(
+    format: Literal["ndjson", "csv"] = Query(default="ndjson"),
+    session_factory=Depends(get_session_factory),
+    user: User = Depends(auth_service.get_current_user),
+):
+    """
+    Потоковий експорт усіх контактів користувача у NDJSON або CSV.
+
+    Рядки читаються з бази пачками через серверний курсор і одразу
+    надсилаються клієнтові, тож використання пам'яті не залежить від
+    кількості контактів.
+
+    :param format: Формат експорту: ``ndjson`` (за замовчуванням) або ``csv``.
+    :param session_factory: Фабрика сесій бази даних.
+    :param user: Поточний авторизований користувач.
+    :return: Потокова відповідь з файлом ``contacts.<format>``.
+    :rtype: StreamingResponse
+    """
+    batches = contacts.stream_contacts(session_factory, user)
+    return StreamingResponse(
+        export_chunks(batches, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="contacts.{format}"'},
+    )
+
+
+@router.get(
+    "/search",
+    name="Search contacts",
+    response_model=schemas_contact.ContactPage,
+)
 async def search_contacts(
+    response: Response,
     first_name: str | None = Query(default=None),
     last_name: str | None = Query(default=None),
     email: str | None = Query(default=None),
+    q: str | None = Query(default=None, min_length=1, max_length=100),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None),
     db=Depends(get_db),
     user: User = Depends(auth_service.get_current_user),
 ):
     """
     Пошук контактів по імені, прізвищу та/або email.
 
+    Параметр ``q`` вмикає ранжований повнотекстовий пошук одразу по імені,
+    прізвищу та email; у цьому режимі повертається одна сторінка результатів.
+
+    :param response: Відповідь із заголовками залежностей.
     :param first_name: Ім'я для пошуку (необов’язково).
     :param last_name: Прізвище для пошуку (необов’язково).
     :param email: Email для пошуку (необов’язково).
+    :param q: Рядок вільного пошуку (необов’язково).
+    :param limit: Максимальна кількість контактів на сторінці.
+    :param cursor: Курсор ``next_cursor`` з попередньої сторінки (необов’язково).
     :param db: Сесія бази даних.
     :param user: Поточний авторизований користувач.
-    :return: Список контактів, які відповідають критеріям пошуку.
+    :return: Сторінка контактів, які відповідають критеріям пошуку, та курсор наступної сторінки.
     """
-    return await contacts.search_contacts(first_name, last_name, email, db, user)
+    page = await contacts.search_contacts(
+        first_name, last_name, email, db, user, limit, cursor, q=q
+    )
+    return _json_response(schemas_contact.dump_contact_page(page), response)
 
 
-@router.get("/birthdays", name="Upcoming birthdays (7 days)")
+@router.get(
+    "/birthdays",
+    name="Upcoming birthdays",
+    response_model=list[schemas_contact.ContactResponse],
+    dependencies=[Depends(contacts_etag)],
+)
 async def get_upcoming_birthdays(
+    response: Response,
+    days: int = Query(default=7, ge=0, le=365),
     db=Depends(get_db),
     user: User = Depends(auth_service.get_current_user),
 ):
     """
-    Отримати контакти з днями народження, які наступають протягом 7 днів.
+    Отримати контакти з днями народження, які наступають протягом ``days`` днів.
+
+    Відповідь кешується в Redis до наступної зміни контактів користувача.
 
+    :param response: Відповідь із заголовками залежностей (ETag).
+    :param days: Довжина вікна у днях (за замовчуванням 7).
     :param db: Сесія бази даних.
     :param user: Поточний авторизований користувач.
+    :raises HTTPException: 304 Not Modified, якщо ``If-None-Match`` збігається з ETag.
     :return: Список контактів з майбутніми днями народження.
     """
-    return await contacts.upcoming_birthdays(db, user)
+    async def load():
+        upcoming = await contacts.upcoming_birthdays(db, user, days)
+        return schemas_contact.dump_contacts(upcoming)
+
+    params = {"days": days, "today": date.today().isoformat()}
+    body = await contact_cache.read_through(user.id, "birthdays", params, load)
+    return _json_response(body, response)
 
 
 @router.get(
     "/",
     name="List of contacts",
+    response_model=schemas_contact.ContactPage,
     status_code=200,
+    dependencies=[Depends(contacts_etag)],
+)
+async def get_contacts(
+    response: Response,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None),
+    db=Depends(get_db),
+    user=Depends(auth_service.get_current_user),
+):
+    """
+    Отримати сторінку контактів користувача.
+
+    Відповідь кешується в Redis до наступної зміни контактів користувача.
+
+    :param response: Відповідь із заголовками залежностей (ETag).
+    :param limit: Максимальна кількість контактів на сторінці.
+    :param cursor: Курсор ``next_cursor`` з попередньої сторінки (необов’язково).
+    :param db: Сесія бази даних.
+    :param user: Поточний авторизований користувач.
+    :raises HTTPException: 304 Not Modified, якщо ``If-None-Match`` збігається з ETag.
+    :return: Сторінка контактів користувача та курсор наступної сторінки.
+    """
+    async def load():
+        page = await contacts.get_contacts(db, user, limit, cursor)
+        return schemas_contact.dump_contact_page(page)
+
+    params = {"limit": limit, "cursor": cursor}
+    body = await contact_cache.read_through(user.id, "list", params, load)
+    return _json_response(body, response)
+
+
+@router.patch(
+    "/batch",
+    response_model=schemas_contact.ContactBatchReport,
+    name="Batch update contacts",
+)
+async def batch_update_contacts(
+    body: schemas_contact.ContactBatchUpdate,
+    db=Depends(get_db),
+    user: User = Depends(auth_service.get_current_user),
+):
+    """
+    Оновити багато контактів одним запитом.
+
+    Усі зміни застосовуються в одній транзакції; контакти, яких немає або
+    які належать іншому користувачу, позначаються як ``not_found``.
+
+    :param body: Список патчів з ``id`` контакту та полями для оновлення.
+    :param db: Сесія бази даних.
+    :param user: Поточний авторизований користувач.
+    :raises HTTPException: Якщо зміни порушують унікальність email або телефону (409).
+    :return: Статус кожного контакту.
+    :rtype: ContactBatchReport
+    """
+    return await contacts.batch_update_contacts(body.items, db, user)
+
+
+@router.delete(
+    "/batch",
+    response_model=schemas_contact.ContactBatchReport,
+    name="Batch delete contacts",
 )
-async def get_contacts(db=Depends(get_db), user=Depends(auth_service.get_current_user)):
+async def batch_delete_contacts(
+    body: schemas_contact.ContactBatchDelete,
+    db=Depends(get_db),
+    user: User = Depends(auth_service.get_current_user),
+):
     """
-    Отримати список усіх контактів користувача.
+    Видалити багато контактів одним запитом.
 
+    :param body: Список ідентифікаторів контактів.
     :param db: Сесія бази даних.
     :param user: Поточний авторизований користувач.
-    :return: Список контактів користувача.
+    :return: Статус кожного контакту.
+    :rtype: ContactBatchReport
     """
-    all_contacts = await contacts.get_contacts(db, user)
-    return all_contacts
+    return await contacts.batch_delete_contacts(body.ids, db, user)
 
 
 @router.get(
@@ -91,6 +285,7 @@ async def get_contacts(db=Depends(get_db), user=Depends(auth_service.get_current
     name="Get contact by id",
     response_model=schemas_contact.ContactResponse,
     status_code=200,
+    dependencies=[Depends(contacts_etag)],
 )
 async def get_contact_by_id(
     contact_id: int,
@@ -103,6 +298,7 @@ async def get_contact_by_id(
     :param contact_id: ID контакту.
     :param db: Сесія бази даних.
     :param user: Поточний авторизований користувач.
+    :raises HTTPException: 304 Not Modified, якщо ``If-None-Match`` збігається з ETag.
     :return: Контакт з заданим ID.
     """
     return await contacts.get_contact_by_id(contact_id, db, user)
@@ -111,6 +307,7 @@ async def get_contact_by_id(
 @router.delete(
     "/{contact_id}",
     name="Delete contact by id",
+    response_model=schemas_contact.ContactResponse,
     status_code=200,
 )
 async def delete_contact(
@@ -132,6 +329,7 @@ async def delete_contact(
 @router.patch(
     "/{contact_id}",
     name="Update contact",
+    response_model=schemas_contact.ContactResponse,
     status_code=200,
 )
 async def update_contact(
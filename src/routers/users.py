@@ -1,14 +1,14 @@
-from fastapi import APIRouter, Depends, File, UploadFile
-from sqlalchemy.orm import Session
-from src.repository.user import update_avatar_url
-from src.services.upload_file import UploadFileService
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Response, UploadFile, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.repository.user import get_user_by_email, update_avatar_status
 from src.schemas.auth import User
-from src.db.models import User as UserORM
-from src.db.connect import get_db
+from src.services.avatars import PENDING, READY, avatar_digest, prepare_avatar, push_avatar
+from src.services.principal import Principal
+from src.db.connect import get_db, get_session_factory
 from src.db.models import Role
 from src.services.roles import RoleAccess
 from src.services.auth import auth_service
-from src.settings.config import settings
+from src.services.container import services
 
 
 router = APIRouter(prefix="/user", tags=["users"])
@@ -17,32 +17,49 @@ router = APIRouter(prefix="/user", tags=["users"])
 @router.patch(
     "/avatar",
     response_model=User,
+    status_code=status.HTTP_202_ACCEPTED,
     dependencies=[Depends(RoleAccess([Role.admin]))]
 )
 async def update_avatar_user(
+    background_tasks: BackgroundTasks,
+    response: Response,
     file: UploadFile = File(),
-    user: UserORM = Depends(auth_service.get_current_user),
-    db: Session = Depends(get_db),
+    user: Principal = Depends(auth_service.get_current_user),
+    db: AsyncSession = Depends(get_db),
+    session_factory=Depends(get_session_factory),
 ):
     """
     Оновлює аватар користувача.
 
     Цей ендпоінт дозволяє користувачам з роллю admin завантажити новий аватар.
-    Файл завантажується через UploadFile, після чого відбувається завантаження у хмарне сховище
-    (Cloudinary) та оновлення URL аватара у базі даних.
+    Зображення обрізається до 250x250 у пулі потоків, а завантаження у сховище
+    (Cloudinary або локальний каталог) виконується у фоні: відповідь повертається
+    одразу з ``avatar_status="pending"``, а після завантаження URL аватара
+    оновлюється і статус стає ``ready`` (або ``failed``). Якщо зображення
+    збігається з поточним аватаром (за хешем SHA-256), воно не завантажується
+    повторно і повертається 200 з поточним аватаром.
 
+    :param background_tasks: Фонові задачі FastAPI.
+    :param response: Відповідь (для коду 200 при незмінному аватарі).
     :param file: Файл аватара, що завантажується.
     :param user: Поточний авторизований користувач (повинен мати роль admin).
     :param db: Сесія бази даних.
-    :return: Оновлена інформація про користувача, включно з новим URL аватара.
+    :param session_factory: Фабрика сесій для фонової задачі.
+    :return: Інформація про користувача зі станом аватара ``pending`` (або ``ready``,
+        якщо аватар не змінився).
     :rtype: User
+    :raises HTTPException: 413 для завеликого файлу, 400 для файлу, що не є зображенням.
     """
-    avatar_url = UploadFileService(
-        settings.CLOUDINARY_NAME,
-        settings.CLOUDINARY_API_KEY,
-        settings.CLOUDINARY_API_SECRET,
-    ).upload_file(file, user.email)
+    data = await prepare_avatar(file)
+    digest = avatar_digest(data)
+    current = await get_user_by_email(user.email, db)
+    if current.avatar_digest == digest and current.avatar_status == READY:
+        response.status_code = status.HTTP_200_OK
+        return current
 
-    await update_avatar_url(user.email, avatar_url, db)
-    user.avatar = avatar_url
-    return user
+    storage = services.avatar_storage
+    updated = await update_avatar_status(user.email, PENDING, db)
+    background_tasks.add_task(
+        push_avatar, storage, session_factory, user.email, digest, data
+    )
+    return updated
@@ -25,6 +25,7 @@ class User(BaseModel):
     first_name: Optional[str] = None
     last_name: Optional[str] = None
     avatar: Optional[str] = None
+    avatar_status: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
 class RequestResetPassword(BaseModel):
@@ -1,29 +1,104 @@
-from pydantic import BaseModel, EmailStr, ConfigDict
+from pydantic import BaseModel, EmailStr, ConfigDict, Field, TypeAdapter, model_validator
 from datetime import date
-from typing import Optional
+from typing import Literal, Optional
+
+BATCH_MAX_SIZE = 1000
 
 
 class ContactModel(BaseModel):
-    first_name: str
-    last_name: str
-    email: EmailStr
-    phone_number: str
+    # Довжини відповідають колонкам таблиці contacts.
+    first_name: str = Field(max_length=50)
+    last_name: str = Field(max_length=50)
+    email: EmailStr = Field(max_length=100)
+    phone_number: str = Field(max_length=20)
     birthday: date
-    additional_info: Optional[str] = None
+    additional_info: Optional[str] = Field(default=None, max_length=255)
 
 
 class ContactResponse(BaseModel):
     id: int
-    email: EmailStr
+    first_name: str
+    last_name: str
+    # Адреса вже перевірена при записі; EmailStr у відповіді лише
+    # запускав би email-validator для кожного контакту.
+    email: str
+    phone_number: str
+    birthday: date
+    additional_info: Optional[str] = None
     user_id: int
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class ContactPage(BaseModel):
+    items: list[ContactResponse]
+    next_cursor: Optional[str] = None
+
+
+ContactList = TypeAdapter(list[ContactResponse])
+ContactPageAdapter = TypeAdapter(ContactPage)
+
+
+def dump_contacts(contacts) -> bytes:
+    """
+    Серіалізує список ORM-контактів у JSON одним викликом pydantic-core.
+    """
+    return ContactList.dump_json(ContactList.validate_python(contacts, from_attributes=True))
+
+
+def dump_contact_page(page: dict) -> bytes:
+    """
+    Серіалізує сторінку контактів (``items``, ``next_cursor``) у JSON.
+    """
+    return ContactPageAdapter.dump_json(
+        ContactPageAdapter.validate_python(page, from_attributes=True)
+    )
+
+
+class ContactImportError(BaseModel):
+    row: int
+    error: str
+
+
+class ContactImportReport(BaseModel):
+    inserted: int
+    failed: int
+    errors: list[ContactImportError]
+
+
 class ContactUpdate(BaseModel):
-    first_name: str = None
-    last_name: str = None
-    email: EmailStr = None
-    phone_number: str = None
+    first_name: str = Field(default=None, max_length=50)
+    last_name: str = Field(default=None, max_length=50)
+    email: EmailStr = Field(default=None, max_length=100)
+    phone_number: str = Field(default=None, max_length=20)
     birthday: date = None
-    additional_info: Optional[str] = None
\ No newline at end of file
+    additional_info: Optional[str] = Field(default=None, max_length=255)
+
+
+class ContactBatchPatch(ContactUpdate):
+    id: int
+
+    @model_validator(mode="after")
+    def check_changes(self):
+        if not self.model_fields_set - {"id"}:
+            raise ValueError("Patch must change at least one field")
+        return self
+
+
+class ContactBatchUpdate(BaseModel):
+    items: list[ContactBatchPatch] = Field(min_length=1, max_length=BATCH_MAX_SIZE)
+
+
+class ContactBatchDelete(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=BATCH_MAX_SIZE)
+
+
+class ContactBatchItem(BaseModel):
+    id: int
+    status: Literal["updated", "deleted", "not_found"]
+
+
+class ContactBatchReport(BaseModel):
+    succeeded: int
+    failed: int
+    results: list[ContactBatchItem]
@@ -1,41 +1,78 @@
-import pickle
-import redis
+import time
+from dataclasses import replace
+from hashlib import sha256
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.repository.user import get_user_by_email
 from src.db.connect import get_db
 from src.db.models import Role
+from src.services.cache import TTLCache
+from src.services.metrics import USER_CACHE_REQUESTS
+from src.services.principal import Principal
+from src.services.user_cache import user_cache
 
 from src.settings.base import ALGORITHM, SECRET_KEY
-
+from src.settings.config import settings
 
 class Auth:
     """
     Сервіс аутентифікації користувачів.
 
-    Підтримує валідацію JWT токенів та кешування користувачів у Redis.
+    Підтримує валідацію JWT токенів та кешування користувачів у вигляді
+    компактного знімка :class:`Principal` у дворівневому кеші
+    (:mod:`src.services.user_cache`): локальний LRU воркера та Redis.
+    Якщо Redis недоступний, користувач завантажується з бази даних.
+
+    Розкодовані claims перевірених токенів кешуються за SHA-256 токена до
+    моменту ``exp``, тож повторні запити з тим самим токеном не перевіряють
+    підпис і не розбирають JSON заново.
     """
 
-    r = redis.Redis(host="redis", port=6379, db=0)
+    cache = user_cache
+    token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_SIZE, ttl=0)
+
+    def decode_token(self, token: str) -> dict:
+        """
+        Перевіряє підпис JWT токена та повертає його claims, використовуючи кеш.
+
+        Токен потрапляє в кеш лише після успішної перевірки і лише якщо має
+        ``exp``; запис живе до закінчення строку дії токена.
+
+        :param token: JWT токен.
+        :type token: str
+        :return: Claims токена.
+        :rtype: dict
+        :raises JWTError: Якщо токен невалідний або прострочений.
+        """
+        key = sha256(token.encode()).digest()
+        claims = self.token_cache.get(key)
+        if claims is None:
+            claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            expires_in = claims.get("exp", 0) - time.time()
+            if expires_in > 0:
+                self.token_cache.set(key, claims, ttl=expires_in)
+        return claims
 
     async def get_current_user(
         self,
         token: HTTPAuthorizationCredentials = Depends(HTTPBearer()),
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_db),
     ):
         """
         Отримує поточного користувача на основі JWT токена.
 
         Перевіряє валідність токена, декодує його, отримує email та роль користувача.
-        Якщо користувач є в кеші Redis — використовує його, інакше отримує з БД і кешує.
+        Якщо користувач є в локальному кеші або в Redis — використовує його,
+        інакше отримує з БД і кешує.
 
         :param token: HTTP авторизаційні дані (Bearer токен).
         :param db: Сесія бази даних.
-        :return: Об'єкт користувача.
+        :return: Знімок користувача з роллю з токена.
+        :rtype: Principal
         :raises HTTPException: Якщо токен невалідний або користувач не знайдений.
         """
         credentials_exception = HTTPException(
@@ -45,8 +82,7 @@ class Auth:
         )
 
         try:
-            payload = jwt.decode(token.credentials, SECRET_KEY, algorithms=[ALGORITHM])
-            print("Payload from token:", payload)
+            payload = self.decode_token(token.credentials)
             email = payload.get("sub")
             role_str = payload.get("roles")
             if email is None or role_str is None:
@@ -56,23 +92,20 @@ class Auth:
             print("JWT error:", e)
             raise credentials_exception
 
-        cached_user = self.r.get(f"user:{email}")
+        user = await self.cache.get(email)
+        USER_CACHE_REQUESTS.labels("miss" if user is None else "hit").inc()
 
-        if cached_user is None:
-            user = await get_user_by_email(email, db)
-            if user is None:
+        if user is None:
+            db_user = await get_user_by_email(email, db)
+            if db_user is None:
                 raise credentials_exception
-            self.r.set(f"user:{email}", pickle.dumps(user))
-            self.r.expire(f"user:{email}", 900)
-        else:
-            user = pickle.loads(cached_user)
+            user = Principal.from_user(db_user)
+            await self.cache.set(user)
 
         try:
-            user.roles = Role(role_str)
+            return replace(user, roles=Role(role_str))
         except ValueError:
             raise credentials_exception
 
-        return user
-
 
 auth_service = Auth()
@@ -0,0 +1,278 @@
+"""
+Конвеєр завантаження аватарів.
+
+Обробник запиту не блокує event loop:
+
+1. Запити, тіло яких більше за ``AVATAR_MAX_BYTES`` (з запасом на обгортку
+   multipart), відхиляються з кодом 413 ще до читання тіла — за
+   ``Content-Length`` або під час прийому (:class:`UploadSizeLimit`).
+   Starlette записує файл у ``SpooledTemporaryFile`` (у пам'яті до 1 МБ,
+   далі на диску), а розмір самого файлу ще раз перевіряється перед
+   декодуванням (:func:`check_upload_size`).
+2. Зображення декодується, обрізається до ``AVATAR_SIZE`` x ``AVATAR_SIZE``
+   і перекодовується в JPEG у пулі потоків (:func:`prepare_avatar`).
+3. Користувач отримує ``avatar_status="pending"``, а готовий файл
+   завантажується у сховище фоновою задачею (:func:`push_avatar`), яка
+   потім записує URL і статус ``ready`` (або ``failed``).
+
+Файли адресуються вмістом: ім'я у сховищі — SHA-256 готового зображення
+(:func:`avatar_digest`). Повторне завантаження того самого зображення не
+передається у сховище, а URL аватара змінюється лише разом із вмістом,
+тому локальні аватари роздаються з ``Cache-Control: immutable``
+(:class:`AvatarStaticFiles`).
+
+Сховище підключається через інтерфейс :class:`AvatarStorage`:
+Cloudinary (:class:`src.services.upload_file.UploadFileService`) або
+локальна файлова система (:class:`LocalAvatarStorage`).
+"""
+
+import asyncio
+import hashlib
+import io
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Protocol
+
+from fastapi import HTTPException, UploadFile, status
+from fastapi.responses import JSONResponse
+from fastapi.staticfiles import StaticFiles
+
+from src.repository.user import update_avatar_status, update_avatar_url
+from src.settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+
+AVATAR_EXTENSION = ".jpg"
+AVATAR_CONTENT_TYPE = "image/jpeg"
+JPEG_QUALITY = 85
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class AvatarStorage(Protocol):
+    """
+    Сховище готових зображень аватарів.
+
+    Метод ``save`` синхронний і викликається в окремому потоці. Імена
+    файлів — хеші вмісту, тож зберігати файл, що вже існує, не потрібно.
+    """
+
+    def save(self, name: str, data: bytes) -> str:
+        """
+        Зберігає зображення і повертає його публічний URL.
+        """
+        ...
+
+
+class LocalAvatarStorage:
+    """
+    Сховище аватарів у локальному каталозі.
+
+    Файли записуються атомарно (тимчасовий файл + ``os.replace``), тож
+    клієнт ніколи не отримає частково записане зображення; наявний файл
+    з тим самим ім'ям (тим самим вмістом) не перезаписується.
+
+    Args:
+        root (Path | str): Каталог для файлів.
+        base_url (str): URL-префікс, за яким каталог роздається клієнтам.
+    """
+
+    def __init__(self, root: Path | str, base_url: str):
+        self.root = Path(root)
+        self.base_url = base_url.rstrip("/")
+
+    def save(self, name: str, data: bytes) -> str:
+        self.root.mkdir(parents=True, exist_ok=True)
+        filename = f"{name}{AVATAR_EXTENSION}"
+        url = f"{self.base_url}/{filename}"
+        if (self.root / filename).exists():
+            return url
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(data)
+            os.replace(tmp_path, self.root / filename)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        return url
+
+
+class AvatarStaticFiles(StaticFiles):
+    """
+    Роздача локальних аватарів з довготривалим кешуванням.
+
+    Ім'я файлу — хеш вмісту, тому відповідь за URL ніколи не змінюється і
+    браузери та CDN можуть кешувати її назавжди.
+    """
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+
+def avatar_digest(data: bytes) -> str:
+    """
+    Хеш SHA-256 зображення аватара (hex), що використовується як його ім'я.
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+class UploadSizeLimit:
+    """
+    ASGI middleware, що обмежує розмір тіла запиту до одного шляху.
+
+    FastAPI читає multipart-тіло до виклику залежностей і обробника, тому
+    обмеження діє до нього: запит із завеликим ``Content-Length``
+    відхиляється без читання тіла, а тіло без ``Content-Length`` (chunked)
+    обривається, щойно прийнято більше ``max_bytes``.
+
+    Args:
+        app: ASGI-застосунок.
+        path (str): Шлях, до якого застосовується обмеження.
+        max_bytes (int): Максимальний розмір тіла запиту в байтах.
+    """
+
+    def __init__(self, app, path: str, max_bytes: int):
+        self.app = app
+        self.path = path
+        self.max_bytes = max_bytes
+
+    def _too_large(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Request body must not exceed {self.max_bytes} bytes",
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] != self.path:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        length = headers.get(b"content-length")
+        if length is not None and length.isdigit() and int(length) > self.max_bytes:
+            error = self._too_large()
+            response = JSONResponse({"detail": error.detail}, status_code=error.status_code)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # FastAPI пропускає HTTPException з читання тіла без змін.
+                    raise self._too_large()
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+def check_upload_size(file: UploadFile, max_bytes: int):
+    """
+    Перевіряє розмір завантаженого файлу (запасна перевірка після
+    :class:`UploadSizeLimit`, що обмежує все тіло запиту).
+
+    Raises:
+        HTTPException: 413, якщо файл більший за ``max_bytes``.
+    """
+    size = file.size
+    if size is None:
+        file.file.seek(0, os.SEEK_END)
+        size = file.file.tell()
+    if size > max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Avatar must not exceed {max_bytes} bytes",
+        )
+    file.file.seek(0)
+
+
+def resize_avatar(source, size: int) -> bytes:
+    """
+    Декодує зображення, обрізає його по центру до квадрата ``size`` x ``size``
+    і кодує в JPEG.
+
+    Виконується синхронно (у пулі потоків). Для JPEG декодування одразу
+    виконується у зменшеному масштабі (``Image.draft``).
+
+    Args:
+        source: Файлоподібний об'єкт із зображенням.
+        size (int): Сторона квадрата в пікселях.
+
+    Returns:
+        bytes: Зображення у форматі JPEG.
+
+    Raises:
+        ValueError: Якщо файл не є підтримуваним зображенням.
+    """
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    try:
+        with Image.open(source) as image:
+            image.draft("RGB", (size, size))
+            image = ImageOps.exif_transpose(image)
+            if image.mode != "RGB":
+                image = image.convert("RGB")
+            image = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as error:
+        raise ValueError("Unsupported image") from error
+
+    output = io.BytesIO()
+    image.save(output, "JPEG", quality=JPEG_QUALITY, optimize=True)
+    return output.getvalue()
+
+
+async def prepare_avatar(file: UploadFile) -> bytes:
+    """
+    Перевіряє розмір файлу і готує зображення аватара поза event loop.
+
+    :param file: Завантажений файл.
+    :type file: UploadFile
+    :return: Зображення JPEG розміром ``AVATAR_SIZE`` x ``AVATAR_SIZE``.
+    :rtype: bytes
+    :raises HTTPException: 413 для завеликого файлу, 400 для файлу, що не є зображенням.
+    """
+    check_upload_size(file, settings.AVATAR_MAX_BYTES)
+    try:
+        return await asyncio.to_thread(resize_avatar, file.file, settings.AVATAR_SIZE)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File is not a supported image",
+        )
+
+
+async def push_avatar(
+    storage: AvatarStorage, session_factory, email: str, digest: str, data: bytes
+):
+    """
+    Фонова задача: завантажує аватар у сховище і записує результат.
+
+    :param storage: Сховище аватарів.
+    :param session_factory: Фабрика асинхронних сесій.
+    :param email: Email користувача.
+    :param digest: Хеш зображення (:func:`avatar_digest`), ім'я файлу у сховищі.
+    :param data: Підготовлене зображення.
+    """
+    try:
+        url = await asyncio.to_thread(storage.save, digest, data)
+    except Exception:
+        logger.exception("Avatar upload for %s failed", email)
+        async with session_factory() as db:
+            await update_avatar_status(email, FAILED, db)
+        return
+    async with session_factory() as db:
+        await update_avatar_url(email, url, db, digest=digest)
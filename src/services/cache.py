@@ -0,0 +1,82 @@
+"""
+In-process кеш з обмеженим розміром та часом життя записів.
+"""
+
+from collections import OrderedDict
+from time import monotonic
+
+
+class TTLCache:
+    """
+    LRU-кеш у пам'яті процесу з часом життя для кожного запису.
+
+    При переповненні витісняється запис, до якого найдовше не зверталися.
+    Прострочені записи видаляються при зверненні до них. Кеш не потокобезпечний
+    і розрахований на використання з одного event loop.
+
+    Args:
+        maxsize (int): Максимальна кількість записів.
+        ttl (float): Час життя запису за замовчуванням, у секундах.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        """
+        Повертає значення за ключем, якщо запис існує і не прострочений.
+
+        Args:
+            key: Ключ запису.
+            default: Значення, що повертається при промаху.
+
+        Returns:
+            Збережене значення або ``default``.
+        """
+        entry = self._data.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at > monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._data[key]
+        self.misses += 1
+        return default
+
+    def set(self, key, value, ttl: float | None = None):
+        """
+        Зберігає значення.
+
+        Args:
+            key: Ключ запису.
+            value: Значення.
+            ttl (float | None): Час життя у секундах; за замовчуванням ``self.ttl``.
+        """
+        if self.maxsize <= 0:
+            return
+        expires_at = monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """
+        Видаляє запис і повертає його значення.
+        """
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self):
+        """
+        Видаляє всі записи.
+        """
+        self._data.clear()
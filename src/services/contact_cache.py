@@ -0,0 +1,161 @@
+"""
+Read-through кеш відповідей списків контактів у Redis.
+
+Ключ містить id користувача, версію його контактів
+(:mod:`src.services.contact_versions`) та хеш параметрів запиту, тому
+будь-яка зміна контактів робить старі записи недосяжними без явного
+видалення, а вони самі зникають за TTL. Щоб після інвалідації всі воркери
+одночасно не перераховували одну й ту саму відповідь, обчислення захищене
+блокуванням ``SET NX PX``: решта запитів чекає, доки значення з'явиться в
+кеші. TTL має випадковий розкид, щоб записи не протухали одночасно.
+
+У кеші зберігається вже серіалізоване JSON-тіло відповіді, тож при
+влучанні воно віддається клієнту без розбору й повторної валідації.
+"""
+
+import asyncio
+import hashlib
+import logging
+import random
+import secrets
+from typing import Awaitable, Callable
+
+import orjson
+from redis.exceptions import RedisError
+
+from src.services.contact_versions import contact_versions
+from src.services.redis_client import get_redis
+from src.settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 0.025
+
+# Знімає блокування лише його власник: після тайм-ауту блокування могло
+# вже перейти до іншого запиту.
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class ContactCache:
+    """
+    Кеш обчислених відповідей для контактів користувача.
+
+    Args:
+        ttl (int): Базовий час життя запису, у секундах.
+        jitter (float): Частка випадкового розкиду TTL (0.1 — до +10%).
+        lock_ttl (float): Час життя блокування обчислення, у секундах;
+            стільки ж інші запити чекають на результат.
+    """
+
+    def __init__(self, ttl: int, jitter: float, lock_ttl: float):
+        self.ttl = ttl
+        self.jitter = jitter
+        self.lock_ttl = lock_ttl
+
+    @property
+    def r(self):
+        """
+        Асинхронний клієнт Redis.
+        """
+        return get_redis()
+
+    @staticmethod
+    def key(user_id: int, version: str, namespace: str, params: dict) -> str:
+        """
+        Ключ Redis для відповіді з заданими параметрами.
+        """
+        digest = hashlib.sha256(orjson.dumps(params, option=orjson.OPT_SORT_KEYS))
+        return f"contacts:cache:{user_id}:{version}:{namespace}:{digest.hexdigest()[:32]}"
+
+    def expires_in(self) -> int:
+        """
+        TTL нового запису з випадковим розкидом, у мілісекундах.
+        """
+        return int(self.ttl * 1000 * (1 + random.uniform(0, self.jitter)))
+
+    async def _wait_for(self, key: str, lock_key: str) -> bytes | None:
+        """
+        Чекає, доки власник блокування запише значення, але не довше ``lock_ttl``.
+
+        Власник записує значення до зняття блокування, тож якщо блокування
+        зникло, а значення немає, обчислення завершилося помилкою і чекати
+        далі немає сенсу.
+        """
+        deadline = asyncio.get_running_loop().time() + self.lock_ttl
+        while asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(POLL_INTERVAL)
+            payload, lock = await self.r.mget(key, lock_key)
+            if payload is not None:
+                return payload
+            if lock is None:
+                return None
+        return None
+
+    async def read_through(
+        self,
+        user_id: int,
+        namespace: str,
+        params: dict,
+        compute: Callable[[], Awaitable[bytes]],
+    ) -> bytes:
+        """
+        Повертає відповідь з кешу або обчислює і зберігає її.
+
+        Якщо Redis недоступний, відповідь обчислюється без кешу. Винятки
+        ``compute`` (наприклад, 404) не кешуються.
+
+        Args:
+            user_id (int): Ідентифікатор користувача.
+            namespace (str): Назва ендпоінта (``list``, ``birthdays``).
+            params (dict): Параметри запиту, від яких залежить відповідь.
+            compute: Асинхронна функція, що повертає JSON-тіло відповіді.
+
+        Returns:
+            bytes: JSON-тіло відповіді.
+        """
+        version = await contact_versions.get(user_id)
+        if version is None:
+            return await compute()
+        key = self.key(user_id, version, namespace, params)
+        lock_key = f"{key}:lock"
+        token = secrets.token_hex(8)
+        locked = False
+        try:
+            payload = await self.r.get(key)
+            if payload is None:
+                locked = await self.r.set(
+                    lock_key, token, nx=True, px=int(self.lock_ttl * 1000)
+                )
+                if not locked:
+                    payload = await self._wait_for(key, lock_key)
+        except RedisError as err:
+            logger.warning("Contact cache read failed: %s", err)
+            return await compute()
+        if payload is not None:
+            return payload
+
+        try:
+            value = await compute()
+            try:
+                await self.r.set(key, value, px=self.expires_in())
+            except RedisError as err:
+                logger.warning("Contact cache write failed: %s", err)
+            return value
+        finally:
+            if locked:
+                try:
+                    await self.r.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                except RedisError as err:
+                    logger.warning("Contact cache unlock failed: %s", err)
+
+
+contact_cache = ContactCache(
+    ttl=settings.CONTACTS_CACHE_TTL,
+    jitter=settings.CONTACTS_CACHE_JITTER,
+    lock_ttl=settings.CONTACTS_CACHE_LOCK_TTL,
+)
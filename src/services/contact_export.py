@@ -0,0 +1,54 @@
+"""
+Серіалізація експорту контактів у NDJSON та CSV.
+
+Кожна пачка рядків з бази перетворюється на один шматок байтів для
+StreamingResponse, тож відповідь починає надсилатися одразу, а пам'ять
+не залежить від розміру адресної книги.
+"""
+
+import csv
+import io
+from typing import AsyncIterator
+
+import orjson
+
+from src.repository.contacts import EXPORT_COLUMNS
+
+FIELDS = [column.key for column in EXPORT_COLUMNS]
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+def _ndjson_chunk(rows) -> bytes:
+    return b"".join(orjson.dumps(dict(row)) + b"\n" for row in rows)
+
+
+def _csv_chunk(rows, header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(FIELDS)
+    writer.writerows(
+        ["" if row[name] is None else row[name] for name in FIELDS] for row in rows
+    )
+    return buffer.getvalue().encode()
+
+
+async def export_chunks(batches: AsyncIterator[list], fmt: str) -> AsyncIterator[bytes]:
+    """
+    Перетворює пачки рядків контактів на байти у вибраному форматі.
+
+    Args:
+        batches: Асинхронний ітератор пачок рядків (див.
+            :func:`src.repository.contacts.stream_contacts`).
+        fmt (str): ``ndjson`` або ``csv``.
+
+    Yields:
+        bytes: Серіалізована пачка; для CSV перший шматок містить заголовок.
+    """
+    if fmt == "csv":
+        yield _csv_chunk([], header=True)
+        async for rows in batches:
+            yield _csv_chunk(rows)
+    else:
+        async for rows in batches:
+            yield _ndjson_chunk(rows)
@@ -0,0 +1,140 @@
+"""
+Потоковий розбір файлів імпорту контактів (CSV та NDJSON).
+
+Тіло запиту читається частинами і розбирається построково, тож файл
+ніколи не тримається в пам'яті цілком. Кожен запис повертається разом з
+номером рядка даних (з 1, без заголовка CSV) для звіту про помилки.
+"""
+
+import codecs
+import csv
+import json
+from typing import AsyncIterator
+
+FORMATS = ("csv", "ndjson")
+CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+class ImportFormatError(ValueError):
+    """
+    Формат файлу імпорту не підтримується або заголовок CSV некоректний.
+    """
+
+
+def detect_format(explicit: str | None, content_type: str | None) -> str:
+    """
+    Визначає формат імпорту за параметром запиту або заголовком Content-Type.
+
+    Args:
+        explicit (str | None): Формат з параметра ``format``.
+        content_type (str | None): Значення заголовка Content-Type.
+
+    Returns:
+        str: ``csv`` або ``ndjson``.
+
+    Raises:
+        ImportFormatError: Якщо формат не вдалося визначити.
+    """
+    if explicit:
+        return explicit
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in CONTENT_TYPES:
+        return CONTENT_TYPES[media_type]
+    raise ImportFormatError(
+        "Unsupported import format, use format=csv|ndjson or a matching Content-Type"
+    )
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Розбиває потік байтів UTF-8 на рядки без символів кінця рядка.
+
+    Args:
+        chunks: Асинхронний ітератор частин тіла запиту.
+
+    Yields:
+        str: Черговий рядок.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def _csv_records(lines: AsyncIterator[str]):
+    header = None
+    pending = ""
+    row_number = 0
+    async for line in lines:
+        # Поле в лапках може містити перенесення рядка: збираємо рядки,
+        # доки кількість лапок не стане парною.
+        pending = f"{pending}\n{line}" if pending else line
+        if pending.count('"') % 2:
+            continue
+        text, pending = pending, ""
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            if len(set(header)) != len(header) or not all(header):
+                raise ImportFormatError("Invalid CSV header")
+            continue
+        row_number += 1
+        if len(values) != len(header):
+            yield row_number, ValueError(
+                f"Expected {len(header)} columns, got {len(values)}"
+            )
+            continue
+        yield row_number, {
+            name: (value if value != "" else None) for name, value in zip(header, values)
+        }
+    if pending:
+        yield row_number + 1, ValueError("Unterminated quoted field")
+
+
+async def _ndjson_records(lines: AsyncIterator[str]):
+    row_number = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as err:
+            yield row_number, ValueError(f"Invalid JSON: {err.msg}")
+            continue
+        if not isinstance(record, dict):
+            yield row_number, ValueError("Expected a JSON object")
+            continue
+        yield row_number, record
+
+
+def iter_records(chunks: AsyncIterator[bytes], fmt: str) -> AsyncIterator[tuple]:
+    """
+    Повертає асинхронний ітератор записів файлу імпорту.
+
+    Args:
+        chunks: Асинхронний ітератор частин тіла запиту.
+        fmt (str): ``csv`` або ``ndjson``.
+
+    Returns:
+        Асинхронний ітератор пар ``(номер_рядка, dict | Exception)``; виняток
+        означає, що рядок не вдалося розібрати.
+    """
+    lines = iter_lines(chunks)
+    if fmt == "csv":
+        return _csv_records(lines)
+    return _ndjson_records(lines)
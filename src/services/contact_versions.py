@@ -0,0 +1,180 @@
+"""
+Версії адресних книг користувачів та умовні GET-запити (ETag).
+
+Для кожного користувача в Redis зберігається версія — унікальне значення
+(час у наносекундах і випадковий суфікс), що замінюється після кожної зміни
+його контактів. ETag відповіді обчислюється з id користувача, версії та
+шляху із query-параметрами, тому для перевірки ``If-None-Match`` достатньо
+одного ``GET`` у Redis — запит до бази даних не виконується. Якщо Redis
+недоступний, ETag не видається і запити обробляються як звичайні.
+"""
+
+import hashlib
+import logging
+import secrets
+import time
+from datetime import date
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from redis.exceptions import RedisError
+
+from src.db.models import User
+from src.services.auth import auth_service
+from src.services.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+CACHE_CONTROL = "private, no-cache"
+
+
+class ContactVersions:
+    """
+    Версії контактів користувачів у Redis.
+
+    Версія не є лічильником: після перезапуску Redis або витіснення ключа
+    вона створюється заново з новим значенням, тож ETag і записи кешу,
+    видані до цього, вже не збігаються.
+
+    Якщо після зміни контактів версію не вдалося замінити, користувач
+    позначається в процесі як застарілий: доки заміна не вдасться,
+    :meth:`get` повертає None, і ETag та кеш відповідей для нього не
+    використовуються.
+    """
+
+    def __init__(self):
+        self._stale: set[int] = set()
+
+    @property
+    def r(self):
+        """
+        Асинхронний клієнт Redis.
+        """
+        return get_redis()
+
+    @staticmethod
+    def key(user_id: int) -> str:
+        """
+        Ключ Redis з версією контактів користувача.
+        """
+        return f"contacts:ver:{user_id}"
+
+    @staticmethod
+    def new_version() -> str:
+        """
+        Нове значення версії, що не повторює жодне з попередніх.
+        """
+        return f"{time.time_ns():x}{secrets.token_hex(4)}"
+
+    async def get(self, user_id: int) -> str | None:
+        """
+        Повертає поточну версію контактів користувача.
+
+        Відсутню версію (перше звернення, перезапуск Redis) створює
+        атомарно через ``SET NX``.
+
+        Args:
+            user_id (int): Ідентифікатор користувача.
+
+        Returns:
+            str | None: Версія або None, якщо Redis недоступний чи остання
+            зміна версії не вдалася.
+        """
+        if user_id in self._stale:
+            return await self._replace(user_id)
+        key = self.key(user_id)
+        try:
+            version = await self.r.get(key)
+            if version is None:
+                candidate = self.new_version()
+                if await self.r.set(key, candidate, nx=True):
+                    return candidate
+                version = await self.r.get(key)
+        except RedisError as err:
+            logger.warning("Contact version read failed: %s", err)
+            return None
+        return version.decode() if version is not None else None
+
+    async def bump(self, user_id: int):
+        """
+        Замінює версію контактів користувача; викликається після commit.
+
+        Args:
+            user_id (int): Ідентифікатор користувача.
+        """
+        await self._replace(user_id)
+
+    async def _replace(self, user_id: int) -> str | None:
+        """
+        Записує нову версію; у разі помилки позначає користувача застарілим.
+        """
+        version = self.new_version()
+        try:
+            await self.r.set(self.key(user_id), version)
+        except RedisError as err:
+            logger.warning("Contact version bump failed: %s", err)
+            self._stale.add(user_id)
+            return None
+        self._stale.discard(user_id)
+        return version
+
+
+def make_etag(user_id: int, version: str, resource: str) -> str:
+    """
+    Сильний ETag для ресурсу користувача заданої версії.
+
+    Args:
+        user_id (int): Ідентифікатор користувача.
+        version (str): Версія контактів.
+        resource (str): Шлях із query-параметрами.
+
+    Returns:
+        str: ETag у лапках.
+    """
+    digest = hashlib.sha256(f"{user_id}:{version}:{resource}".encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Перевіряє заголовок ``If-None-Match`` (слабке порівняння, RFC 9110).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+contact_versions = ContactVersions()
+
+
+async def contacts_etag(
+    request: Request,
+    response: Response,
+    user: User = Depends(auth_service.get_current_user),
+) -> str | None:
+    """
+    Залежність для GET-ендпоінтів контактів з підтримкою умовних запитів.
+
+    Обчислює ETag до виконання запиту до бази даних і додає його до
+    відповіді. Якщо клієнт надіслав збіжний ``If-None-Match``, обробник не
+    викликається. До ETag входить поточна дата, бо від неї залежить
+    результат ``/contacts/birthdays``.
+
+    Raises:
+        HTTPException: 304 Not Modified, якщо ETag збігається.
+
+    Returns:
+        str | None: ETag або None, якщо версію не вдалося отримати.
+    """
+    version = await contact_versions.get(user.id)
+    if version is None:
+        return None
+    resource = f"{date.today().isoformat()}:{request.url.path}?{request.url.query}"
+    etag = make_etag(user.id, version, resource)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return etag
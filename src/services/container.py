@@ -0,0 +1,99 @@
+"""
+Контейнер зовнішніх клієнтів застосунку з лінивою ініціалізацією.
+
+Клієнт Cloudinary і сховище аватарів створюються (а бібліотеки
+імпортуються) лише при першому використанні, тому воркер, що обслуговує
+тільки ``/contacts``, стартує без них. Листи надсилає окремий процес
+(:mod:`src.services.mail_outbox`). Закриває клієнти життєвий цикл застосунку
+через :meth:`ServiceContainer.aclose`.
+"""
+
+from src.services.hashing import hash_pool
+from src.services.redis_client import close_redis, get_redis
+from src.settings.config import Settings, settings
+
+
+class ServiceNotConfigured(RuntimeError):
+    """
+    Для сервісу не задані обов'язкові налаштування.
+    """
+
+
+class ServiceContainer:
+    """
+    Ліниво створювані клієнти зовнішніх сервісів.
+
+    Args:
+        config (Settings): Налаштування застосунку.
+    """
+
+    def __init__(self, config: Settings):
+        self.config = config
+        self._uploader = None
+        self._avatar_storage = None
+
+    def _require(self, *names: str):
+        missing = [name for name in names if getattr(self.config, name) is None]
+        if missing:
+            raise ServiceNotConfigured(f"Missing settings: {', '.join(missing)}")
+
+    @property
+    def redis(self):
+        """
+        Спільний асинхронний клієнт Redis.
+        """
+        return get_redis()
+
+    @property
+    def uploader(self):
+        """
+        Сервіс завантаження файлів у Cloudinary, створений при першому використанні.
+
+        Raises:
+            ServiceNotConfigured: Якщо не задані налаштування CLOUDINARY_*.
+        """
+        if self._uploader is None:
+            self._require("CLOUDINARY_NAME", "CLOUDINARY_API_KEY", "CLOUDINARY_API_SECRET")
+            from src.services.upload_file import UploadFileService
+
+            self._uploader = UploadFileService(
+                self.config.CLOUDINARY_NAME,
+                self.config.CLOUDINARY_API_KEY,
+                self.config.CLOUDINARY_API_SECRET,
+            )
+        return self._uploader
+
+    @property
+    def avatar_storage(self):
+        """
+        Сховище аватарів, обране налаштуванням ``AVATAR_STORAGE``:
+        ``cloudinary`` або ``local`` (каталог ``AVATAR_LOCAL_DIR``).
+
+        Raises:
+            ServiceNotConfigured: Якщо сховище невідоме або не налаштоване.
+        """
+        if self._avatar_storage is None:
+            backend = self.config.AVATAR_STORAGE
+            if backend == "local":
+                from src.services.avatars import LocalAvatarStorage
+
+                self._avatar_storage = LocalAvatarStorage(
+                    self.config.AVATAR_LOCAL_DIR, self.config.AVATAR_BASE_URL
+                )
+            elif backend == "cloudinary":
+                self._avatar_storage = self.uploader
+            else:
+                raise ServiceNotConfigured(f"Unknown AVATAR_STORAGE: {backend}")
+        return self._avatar_storage
+
+    async def aclose(self):
+        """
+        Звільняє ресурси клієнтів (під час зупинки застосунку).
+        """
+        hash_pool.shutdown()
+        await close_redis()
+        self._uploader = None
+        self._avatar_storage = None
+
+
+services = ServiceContainer(settings)
@@ -1,78 +1,208 @@
-from pathlib import Path
+"""
+Листи підтвердження email та скидання пароля.
+
+API не надсилає листи саме: обробники записують їх у таблицю
+``email_outbox`` (:func:`src.services.mail_outbox.enqueue_email`), а окремий
+воркер пошти формує повідомлення функцією :func:`build_message` і надсилає
+їх.
 
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
-from fastapi_mail.errors import ConnectionErrors
-from pydantic import EmailStr
+Шаблони компілюються один раз (:func:`compile_templates`) у середовищі
+Jinja2 з кешем байткоду. Для кожного шаблону заздалегідь готуються
+статичні фрагменти HTML між змінними та статичні заголовки MIME, тож для
+окремого листа лише підставляються ``host``, ``username`` і ``token``,
+додаються ``Date`` і ``Message-ID`` та кодується тіло. Jinja2 імпортується
+лише при формуванні першого листа.
+"""
+
+import base64
+import re
+from dataclasses import dataclass
+from email.message import EmailMessage
+from email.policy import SMTP, SMTPUTF8
+from email.utils import formataddr, formatdate, make_msgid
+from pathlib import Path
 
 from src.repository.auth import create_email_token
 from src.settings.config import settings
 
-conf = ConnectionConfig(
-    MAIL_USERNAME=settings.MAIL_USERNAME,
-    MAIL_PASSWORD=settings.MAIL_PASSWORD,
-    MAIL_FROM=settings.MAIL_FROM,
-    MAIL_PORT=settings.MAIL_PORT,
-    MAIL_SERVER=settings.MAIL_SERVER,
-    MAIL_FROM_NAME=settings.MAIL_FROM_NAME,
-    MAIL_STARTTLS=settings.MAIL_STARTTLS,
-    MAIL_SSL_TLS=settings.MAIL_SSL_TLS,
-    USE_CREDENTIALS=settings.USE_CREDENTIALS,
-    VALIDATE_CERTS=settings.VALIDATE_CERTS,
-    TEMPLATE_FOLDER=Path(__file__).parent / "templates",
-)
-"""
-Конфігурація для FastAPI-Mail, яка використовує налаштування з конфігураційного файлу.
-Папка з HTML-шаблонами для листів знаходиться в "templates" поряд з цим файлом.
-"""
+TEMPLATE_FOLDER = Path(__file__).parent / "templates"
+
+TEMPLATES = {
+    "verify": ("Confirm your email", "verify_email.html"),
+    "reset": ("Reset your password", "reset_password.html"),
+}
+"""Тип листа -> (тема, HTML-шаблон з папки ``templates``)."""
+
+TEMPLATE_FIELDS = ("host", "username", "token")
+"""Змінні, які підставляються в шаблони листів."""
+
+_MARKER = re.compile("\x1f(\\w+)\x1f")
 
+_environment = None
+_compiled = None
 
-async def send_email(email: EmailStr, username: str, host: str):
+
+@dataclass(frozen=True, slots=True)
+class OutgoingEmail:
+    """
+    Лист, готовий до надсилання через SMTP.
+
+    Attributes:
+        sender (str): Адреса відправника для конверта SMTP.
+        recipient (str): Адреса отримувача.
+        content (bytes): Повне MIME-повідомлення.
     """
-    Відправляє лист підтвердження електронної пошти користувачу.
 
-    Створює токен підтвердження і відправляє лист з посиланням на підтвердження.
+    sender: str
+    recipient: str
+    content: bytes
+
+
+def get_environment():
+    """
+    Середовище Jinja2 з шаблонами листів, створене при першому зверненні.
 
-    :param email: Email отримувача.
-    :param username: Ім'я користувача для персоналізації листа.
-    :param host: Базова URL-адреса сервера для формування посилання.
+    Скомпільовані шаблони зберігаються в кеші байткоду (каталог
+    ``MAIL_TEMPLATE_CACHE_DIR`` або тимчасовий каталог Jinja2), тож після
+    перезапуску воркера шаблони не розбираються заново.
     """
-    try:
-        token_verification = create_email_token({"sub": email})
-        message = MessageSchema(
-            subject="Confirm your email",
-            recipients=[email],
-            template_body={
-                "host": host,
-                "username": username,
-                "token": token_verification,
-            },
-            subtype=MessageType.html,
+    global _environment
+    if _environment is None:
+        from jinja2 import (
+            Environment,
+            FileSystemBytecodeCache,
+            FileSystemLoader,
+            select_autoescape,
         )
 
-        fm = FastMail(conf)
-        await fm.send_message(message, template_name="verify_email.html")
-    except ConnectionErrors as err:
-        print(err)
+        cache_dir = settings.MAIL_TEMPLATE_CACHE_DIR
+        if cache_dir:
+            Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        _environment = Environment(
+            loader=FileSystemLoader(TEMPLATE_FOLDER),
+            autoescape=select_autoescape(["html"]),
+            bytecode_cache=FileSystemBytecodeCache(cache_dir),
+            auto_reload=False,
+        )
+    return _environment
 
 
-async def send_reset_password_email(email: EmailStr, host: str):
+def _split_template(template) -> tuple[list[str], list[str]] | None:
     """
-    Відправляє лист для скидання пароля.
+    Розбиває шаблон на статичні фрагменти та змінні між ними.
 
-    Генерує токен для скидання пароля та відправляє лист із відповідним посиланням.
+    Шаблон рендериться з маркерами замість змінних; результат придатний,
+    лише якщо вивід лінійно залежить від змінних (рендер з порожніми
+    значеннями дорівнює склеєним фрагментам). Інакше (умови, цикли,
+    фільтри над змінними) повертається ``None``.
+    """
+    rendered = template.render({name: f"\x1f{name}\x1f" for name in TEMPLATE_FIELDS})
+    parts = _MARKER.split(rendered)
+    segments, fields = parts[::2], parts[1::2]
+    if not set(fields) <= set(TEMPLATE_FIELDS):
+        return None
+    if template.render({name: "" for name in TEMPLATE_FIELDS}) != "".join(segments):
+        return None
+    return segments, fields
 
-    :param email: Email отримувача.
-    :param host: Базова URL-адреса сервера для формування посилання.
+
+def _static_headers(subject: str) -> bytes:
+    """
+    Серіалізовані заголовки, спільні для всіх листів типу (тема, відправник,
+    MIME); закінчуються порожнім рядком перед тілом.
     """
-    try:
-        token = create_email_token({"sub": email})
-        message = MessageSchema(
-            subject="Reset your password",
-            recipients=[email],
-            template_body={"host": host, "token": token},
-            subtype=MessageType.html,
+    message = EmailMessage(policy=SMTP)
+    message["Subject"] = subject
+    message["From"] = formataddr((settings.MAIL_FROM_NAME or "", settings.MAIL_FROM or ""))
+    message["MIME-Version"] = "1.0"
+    message["Content-Type"] = 'text/html; charset="utf-8"'
+    message["Content-Transfer-Encoding"] = "base64"
+    return message.as_bytes()
+
+
+class CompiledEmail:
+    """
+    Попередньо підготовлений тип листа.
+
+    Args:
+        subject (str): Тема листа.
+        template: Скомпільований шаблон Jinja2.
+    """
+
+    def __init__(self, subject: str, template):
+        from markupsafe import escape
+
+        self.subject = subject
+        self.template = template
+        self.headers = _static_headers(subject)
+        # Домен для Message-ID; без нього make_msgid щоразу викликає getfqdn().
+        self.msgid_domain = (settings.MAIL_FROM or "").rpartition("@")[2] or None
+        self._escape = escape
+        split = _split_template(template)
+        self.segments, self.fields = split if split else (None, None)
+
+    def render(self, context: dict) -> str:
+        """
+        HTML тіла листа; збігається з ``template.render(context)``.
+        """
+        if self.segments is None:
+            return self.template.render(context)
+        escape = self._escape
+        values = [str(escape(context.get(name, ""))) for name in self.fields]
+        parts = [self.segments[0]]
+        for value, segment in zip(values, self.segments[1:]):
+            parts.append(value)
+            parts.append(segment)
+        return "".join(parts)
+
+    def build(self, recipient: str, context: dict) -> bytes:
+        """
+        Повне MIME-повідомлення для отримувача з унікальним ``Message-ID``.
+        """
+        body = base64.encodebytes(self.render(context).encode()).replace(b"\n", b"\r\n")
+        return b"".join(
+            (
+                SMTPUTF8.fold_binary("To", recipient),
+                SMTP.fold_binary("Date", formatdate()),
+                SMTP.fold_binary("Message-ID", make_msgid(domain=self.msgid_domain)),
+                self.headers,
+                body,
+            )
         )
-        fm = FastMail(conf)
-        await fm.send_message(message, template_name="reset_password.html")
-    except ConnectionErrors as err:
-        print(err)
+
+
+def compile_templates() -> dict[str, CompiledEmail]:
+    """
+    Компілює всі шаблони листів (один раз на процес).
+
+    :return: Тип листа -> підготовлений лист.
+    :rtype: dict[str, CompiledEmail]
+    """
+    global _compiled
+    if _compiled is None:
+        environment = get_environment()
+        _compiled = {
+            kind: CompiledEmail(subject, environment.get_template(template_name))
+            for kind, (subject, template_name) in TEMPLATES.items()
+        }
+    return _compiled
+
+
+def build_message(kind: str, recipient: str, context: dict) -> OutgoingEmail:
+    """
+    Формує лист заданого типу.
+
+    Токен у посиланні створюється в момент формування листа, тому строк
+    його дії відраховується від надсилання, а не від запиту.
+
+    :param kind: Тип листа: ``verify`` або ``reset``.
+    :param recipient: Email отримувача.
+    :param context: Змінні шаблону (``host``, ``username``).
+    :return: Лист, готовий до надсилання.
+    :rtype: OutgoingEmail
+    :raises KeyError: Якщо тип листа невідомий.
+    """
+    compiled = compile_templates()[kind]
+    token = create_email_token({"sub": recipient})
+    content = compiled.build(recipient, {**context, "token": token})
+    return OutgoingEmail(settings.MAIL_FROM or "", recipient, content)
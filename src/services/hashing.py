@@ -0,0 +1,116 @@
+"""
+Виконання bcrypt поза event loop.
+
+Хешування та перевірка пароля bcrypt займають сотні мілісекунд CPU.
+:class:`HashWorkerPool` виконує їх в обмеженому пулі потоків (bcrypt
+звільняє GIL), а при переповненні черги одразу відповідає 429, щоб
+сплеск логінів не збільшував затримку всіх інших запитів воркера.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+
+from src.repository.auth import Hash
+from src.services.metrics import observe_bcrypt
+from src.settings.config import settings
+
+RETRY_AFTER_SECONDS = 1
+
+
+class HashWorkerPool:
+    """
+    Обмежений пул потоків для операцій :class:`Hash`.
+
+    Args:
+        hasher (Hash): Об'єкт, що виконує хешування.
+        max_workers (int): Кількість потоків пулу.
+        max_pending (int): Максимальна кількість операцій у роботі та в черзі;
+            понад це запити відхиляються з кодом 429.
+    """
+
+    def __init__(self, hasher: Hash, max_workers: int, max_pending: int):
+        self.hasher = hasher
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """
+        Пул потоків, що створюється при першому використанні.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="bcrypt"
+            )
+        return self._executor
+
+    async def _run(self, operation: str, func, *args):
+        """
+        Виконує функцію в пулі з контролем глибини черги.
+
+        Час виконання в потоці записується в метрику ``bcrypt_duration_seconds``
+        з міткою ``operation``.
+
+        Raises:
+            HTTPException: 429, якщо в роботі вже ``max_pending`` операцій.
+        """
+        if self.pending >= self.max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many concurrent authentication requests, try again later",
+                headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+            )
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.executor, observe_bcrypt(operation, func), *args
+            )
+        finally:
+            self.pending -= 1
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Перевіряє пароль у пулі потоків.
+
+        Args:
+            plain_password (str): Незахешований пароль.
+            hashed_password (str): Хешований пароль.
+
+        Returns:
+            bool: True, якщо паролі збігаються.
+        """
+        return await self._run(
+            "verify", self.hasher.verify_password, plain_password, hashed_password
+        )
+
+    async def get_password_hash(self, password: str) -> str:
+        """
+        Хешує пароль у пулі потоків.
+
+        Args:
+            password (str): Пароль, який потрібно захешувати.
+
+        Returns:
+            str: Хешований пароль.
+        """
+        return await self._run("hash", self.hasher.get_password_hash, password)
+
+    def shutdown(self):
+        """
+        Зупиняє пул потоків (під час зупинки застосунку).
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hash_pool = HashWorkerPool(
+    Hash(),
+    max_workers=settings.HASH_POOL_WORKERS,
+    max_pending=settings.HASH_POOL_MAX_PENDING,
+)
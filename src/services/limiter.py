@@ -1,4 +1,173 @@
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+"""
+Розподілене обмеження частоти запитів на Redis.
 
-limiter = Limiter(key_func=get_remote_address)
\ No newline at end of file
+Ліміт перевіряється алгоритмом GCRA (generic cell rate algorithm) в одному
+Lua-скрипті, тому кожна перевірка — один запит до Redis, а ліміт спільний
+для всіх воркерів. Для запиту з валідним Bearer токеном лічильник ведеться
+для користувача (``sub`` токена), інакше — для IP-адреси клієнта. Квоти
+маршрутів задаються в налаштуваннях у форматі ``"<кількість>/<період>"``.
+"""
+
+import logging
+import math
+
+from fastapi import HTTPException, Request, status
+from jose import JWTError
+from redis.exceptions import RedisError
+
+from src.services.auth import auth_service
+from src.services.redis_client import get_redis
+from src.settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_DETAIL = "Перевищено ліміт запитів. Спробуйте пізніше."
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# KEYS[1] — ключ ліміту; ARGV[1] — інтервал між запитами, ARGV[2] — період
+# (обидва в мс). У ключі зберігається теоретичний час прибуття (TAT)
+# наступного запиту; запит дозволено, якщо TAT випереджає поточний час не
+# більше ніж на період. Час береться з Redis, щоб годинники воркерів не
+# впливали на результат. Повертає {дозволено, мс до наступної спроби}.
+GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local tat = tonumber(redis.call("GET", KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval
+local allow_at = new_tat - period
+if allow_at > now then
+    return {0, allow_at - now}
+end
+redis.call("SET", KEYS[1], new_tat, "PX", math.ceil(new_tat - now))
+return {1, 0}
+"""
+
+
+def parse_quota(quota: str) -> tuple[int, int]:
+    """
+    Розбирає квоту виду ``"5/minute"``.
+
+    Args:
+        quota (str): Квота: кількість запитів і період (second, minute, hour, day).
+
+    Returns:
+        tuple[int, int]: Кількість запитів і тривалість періоду в мілісекундах.
+
+    Raises:
+        ValueError: Якщо квота має невірний формат.
+    """
+    count, _, period = quota.partition("/")
+    period = period.strip().lower().removesuffix("s")
+    if period not in PERIODS or not count.strip().isdigit() or int(count) <= 0:
+        raise ValueError(f"Invalid rate limit quota: {quota!r}")
+    return int(count), PERIODS[period] * 1000
+
+
+def client_identity(request: Request) -> str:
+    """
+    Ідентифікатор клієнта для ліміту: користувач з токена або IP-адреса.
+
+    Токен лише розкодовується (з кешем перевірених токенів); невалідний
+    токен не є помилкою — тоді використовується IP-адреса.
+
+    Args:
+        request (Request): HTTP-запит.
+
+    Returns:
+        str: ``user:<sub>`` або ``ip:<адреса>``.
+    """
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            subject = auth_service.decode_token(token).get("sub")
+        except JWTError:
+            subject = None
+        if subject:
+            return f"user:{subject}"
+    host = request.client.host if request.client else "unknown"
+    return f"ip:{host}"
+
+
+class RateLimit:
+    """
+    Депенденсі, що обмежує частоту запитів до маршруту.
+
+    Якщо Redis недоступний, запит пропускається (fail open), щоб збій кешу
+    не зупиняв API.
+
+    Args:
+        scope (str): Назва групи маршрутів, частина ключа Redis.
+        quota (str): Квота у форматі ``"<кількість>/<період>"``.
+    """
+
+    def __init__(self, scope: str, quota: str):
+        self.scope = scope
+        self.limit, self.period_ms = parse_quota(quota)
+        self.interval_ms = self.period_ms / self.limit
+        self._script = None
+
+    @property
+    def script(self):
+        """
+        Lua-скрипт, зареєстрований у спільному клієнті Redis (``EVALSHA``).
+        """
+        client = get_redis()
+        if self._script is None or self._script.registered_client is not client:
+            self._script = client.register_script(GCRA_SCRIPT)
+        return self._script
+
+    def key(self, identity: str) -> str:
+        """
+        Ключ Redis з TAT для клієнта в межах групи маршрутів.
+        """
+        return f"ratelimit:{self.scope}:{identity}"
+
+    async def hit(self, identity: str) -> tuple[bool, int]:
+        """
+        Враховує запит клієнта.
+
+        Args:
+            identity (str): Ідентифікатор клієнта.
+
+        Returns:
+            tuple[bool, int]: Чи дозволено запит і скільки мілісекунд чекати до
+            наступної спроби.
+        """
+        allowed, retry_after_ms = await self.script(
+            keys=[self.key(identity)], args=[self.interval_ms, self.period_ms]
+        )
+        return bool(allowed), int(retry_after_ms)
+
+    async def __call__(self, request: Request):
+        """
+        Перевіряє ліміт для поточного запиту.
+
+        Args:
+            request (Request): HTTP-запит.
+
+        Raises:
+            HTTPException: 429 Too Many Requests із заголовком Retry-After,
+            якщо квоту вичерпано.
+        """
+        try:
+            allowed, retry_after_ms = await self.hit(client_identity(request))
+        except RedisError as err:
+            logger.warning("Rate limit check failed: %s", err)
+            return
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=RATE_LIMIT_DETAIL,
+                headers={"Retry-After": str(max(1, math.ceil(retry_after_ms / 1000)))},
+            )
+
+
+login_limit = RateLimit("login", settings.RATE_LIMIT_LOGIN)
+signup_limit = RateLimit("signup", settings.RATE_LIMIT_SIGNUP)
+me_limit = RateLimit("me", settings.RATE_LIMIT_ME)
+contacts_limit = RateLimit("contacts", settings.RATE_LIMIT_CONTACTS)
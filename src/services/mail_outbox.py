@@ -0,0 +1,302 @@
+"""
+Надійна доставка листів через таблицю ``email_outbox``.
+
+Обробники API лише додають запис у outbox у своїй транзакції
+(:func:`enqueue_email`). Окремий процес::
+
+    python -m src.services.mail_outbox
+
+забирає пачки готових до надсилання листів, надсилає їх через пул
+постійних SMTP-з'єднань і повторює невдалі спроби з експоненційною
+затримкою. Забрані листи отримують оренду (``next_attempt_at`` у
+майбутньому), тож кілька воркерів можуть працювати паралельно, а лист
+воркера, що впав, буде надіслано після закінчення оренди.
+"""
+
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import select, update
+
+from src.db.models import EmailOutbox
+from src.services.email import TEMPLATES, OutgoingEmail, build_message, compile_templates
+from src.settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+SENT = "sent"
+FAILED = "failed"
+
+
+def enqueue_email(db, kind: str, recipient: str, context: dict) -> EmailOutbox:
+    """
+    Додає лист в outbox поточної сесії; запис зберігається разом з commit
+    транзакції, що викликала надсилання.
+
+    :param db: Сесія бази даних.
+    :type db: AsyncSession
+    :param kind: Тип листа (див. :data:`src.services.email.TEMPLATES`).
+    :param recipient: Email отримувача.
+    :param context: Змінні шаблону листа.
+    :return: Запис outbox.
+    :rtype: EmailOutbox
+    :raises ValueError: Якщо тип листа невідомий.
+    """
+    if kind not in TEMPLATES:
+        raise ValueError(f"Unknown email kind: {kind}")
+    now = datetime.now(UTC)
+    entry = EmailOutbox(
+        kind=kind,
+        recipient=recipient,
+        context=context,
+        status=PENDING,
+        attempts=0,
+        next_attempt_at=now,
+        created_at=now,
+    )
+    db.add(entry)
+    return entry
+
+
+def retry_delay(attempts: int, base: float, cap: float) -> float:
+    """
+    Затримка перед наступною спробою: ``base * 2^(attempts-1)``, не більше ``cap``.
+    """
+    return min(cap, base * 2 ** max(attempts - 1, 0))
+
+
+def smtp_client():
+    """
+    Створює (не підключений) SMTP-клієнт з налаштувань MAIL_*.
+    """
+    import aiosmtplib
+
+    credentials = {}
+    if settings.USE_CREDENTIALS:
+        credentials = {"username": settings.MAIL_USERNAME, "password": settings.MAIL_PASSWORD}
+    return aiosmtplib.SMTP(
+        hostname=settings.MAIL_SERVER,
+        port=settings.MAIL_PORT,
+        use_tls=settings.MAIL_SSL_TLS,
+        start_tls=settings.MAIL_STARTTLS,
+        validate_certs=settings.VALIDATE_CERTS,
+        timeout=settings.MAIL_TIMEOUT,
+        **credentials,
+    )
+
+
+class SMTPPool:
+    """
+    Пул постійних SMTP-з'єднань.
+
+    З'єднання відкриваються за потреби й повертаються в пул після
+    надсилання; одночасно використовується не більше ``size`` з'єднань.
+
+    Args:
+        size (int): Максимальна кількість з'єднань.
+        factory: Функція, що створює непідключений ``aiosmtplib.SMTP``.
+    """
+
+    def __init__(self, size: int, factory=smtp_client):
+        self.factory = factory
+        self._slots = asyncio.Semaphore(size)
+        self._idle = []
+
+    async def _send_on_new(self, message: OutgoingEmail):
+        client = self.factory()
+        await client.connect()
+        try:
+            await client.sendmail(message.sender, [message.recipient], message.content)
+        except Exception:
+            client.close()
+            raise
+        self._idle.append(client)
+
+    async def send(self, message: OutgoingEmail):
+        """
+        Надсилає повідомлення через вільне з'єднання.
+
+        Якщо сервер закрив неактивне з'єднання, лист надсилається повторно
+        через нове з'єднання.
+
+        :param message: Лист.
+        :type message: OutgoingEmail
+        :raises aiosmtplib.SMTPException: Якщо надіслати не вдалося.
+        """
+        from aiosmtplib import SMTPServerDisconnected
+
+        async with self._slots:
+            client = self._idle.pop() if self._idle else None
+            if client is not None and client.is_connected:
+                try:
+                    await client.sendmail(message.sender, [message.recipient], message.content)
+                except SMTPServerDisconnected:
+                    pass
+                except Exception:
+                    client.close()
+                    raise
+                else:
+                    self._idle.append(client)
+                    return
+            await self._send_on_new(message)
+
+    async def close(self):
+        """
+        Закриває всі з'єднання пулу.
+        """
+        while self._idle:
+            client = self._idle.pop()
+            try:
+                await client.quit()
+            except Exception:
+                client.close()
+
+
+class OutboxWorker:
+    """
+    Воркер, що надсилає листи з outbox.
+
+    Args:
+        session_factory: Фабрика асинхронних сесій.
+        pool (SMTPPool): Пул SMTP-з'єднань.
+        batch_size (int): Кількість листів, що забираються за раз.
+        max_attempts (int): Після стількох невдалих спроб лист позначається ``failed``.
+        retry_base (float): Базова затримка повтору, у секундах.
+        retry_max (float): Максимальна затримка повтору, у секундах.
+        lease (float): Час оренди забраних листів, у секундах.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        pool: SMTPPool,
+        batch_size: int,
+        max_attempts: int,
+        retry_base: float,
+        retry_max: float,
+        lease: float,
+    ):
+        self.session_factory = session_factory
+        self.pool = pool
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.lease = lease
+
+    async def claim(self) -> list[EmailOutbox]:
+        """
+        Забирає пачку листів, готових до надсилання, і продовжує їм оренду.
+
+        На PostgreSQL рядки блокуються ``FOR UPDATE SKIP LOCKED``, тож
+        паралельні воркери забирають різні листи.
+        """
+        now = datetime.now(UTC)
+        async with self.session_factory() as db:
+            query = (
+                select(EmailOutbox)
+                .where(EmailOutbox.status == PENDING, EmailOutbox.next_attempt_at <= now)
+                .order_by(EmailOutbox.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            batch = list((await db.execute(query)).scalars().all())
+            for entry in batch:
+                entry.next_attempt_at = now + timedelta(seconds=self.lease)
+            await db.commit()
+        return batch
+
+    async def _deliver(self, entry: EmailOutbox):
+        await self.pool.send(build_message(entry.kind, entry.recipient, entry.context))
+
+    async def run_once(self) -> int:
+        """
+        Надсилає одну пачку листів і записує результати.
+
+        :return: Кількість оброблених листів.
+        :rtype: int
+        """
+        batch = await self.claim()
+        if not batch:
+            return 0
+        results = await asyncio.gather(
+            *(self._deliver(entry) for entry in batch), return_exceptions=True
+        )
+
+        now = datetime.now(UTC)
+        sent = [entry.id for entry, result in zip(batch, results) if result is None]
+        async with self.session_factory() as db:
+            if sent:
+                await db.execute(
+                    update(EmailOutbox)
+                    .where(EmailOutbox.id.in_(sent))
+                    .values(status=SENT, sent_at=now, last_error=None)
+                )
+            for entry, result in zip(batch, results):
+                if result is None:
+                    continue
+                attempts = entry.attempts + 1
+                logger.warning(
+                    "Email %s to %s failed (attempt %s): %s",
+                    entry.id, entry.recipient, attempts, result,
+                )
+                delay = retry_delay(attempts, self.retry_base, self.retry_max)
+                await db.execute(
+                    update(EmailOutbox)
+                    .where(EmailOutbox.id == entry.id)
+                    .values(
+                        attempts=attempts,
+                        status=FAILED if attempts >= self.max_attempts else PENDING,
+                        next_attempt_at=now + timedelta(seconds=delay),
+                        last_error=repr(result)[:1000],
+                    )
+                )
+            await db.commit()
+        return len(batch)
+
+    async def run(self, poll_interval: float):
+        """
+        Надсилає листи, доки задачу не буде скасовано.
+
+        Поки є повні пачки, наступна забирається одразу; інакше воркер
+        чекає ``poll_interval`` секунд.
+        """
+        while True:
+            try:
+                processed = await self.run_once()
+            except Exception:
+                logger.exception("Email outbox batch failed")
+                processed = 0
+            if processed < self.batch_size:
+                await asyncio.sleep(poll_interval)
+
+
+async def main():
+    """
+    Точка входу воркера пошти.
+    """
+    from src.db.connect import SessionLocal, engine
+
+    logging.basicConfig(level=logging.INFO)
+    compile_templates()
+    pool = SMTPPool(settings.MAIL_POOL_SIZE)
+    worker = OutboxWorker(
+        SessionLocal,
+        pool,
+        batch_size=settings.MAIL_BATCH_SIZE,
+        max_attempts=settings.MAIL_MAX_ATTEMPTS,
+        retry_base=settings.MAIL_RETRY_BASE,
+        retry_max=settings.MAIL_RETRY_MAX,
+        lease=settings.MAIL_LEASE_SECONDS,
+    )
+    try:
+        await worker.run(settings.MAIL_POLL_INTERVAL)
+    finally:
+        await pool.close()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,196 @@
+"""
+Метрики продуктивності застосунку у форматі Prometheus.
+
+Збираються:
+
+* тривалість HTTP-запитів за маршрутом (шаблон шляху), методом і статусом;
+* кількість запитів, що обробляються зараз;
+* кількість SQL-запитів і сумарний час бази даних на один HTTP-запит
+  (події ``before/after_cursor_execute`` рушія, див. :func:`instrument_engine`);
+* влучання та промахи кешу користувачів в ``Auth.get_current_user``;
+* час виконання bcrypt.
+
+Якщо задано змінну оточення ``PROMETHEUS_MULTIPROC_DIR``, ``/metrics``
+агрегує метрики всіх воркерів uvicorn/gunicorn.
+"""
+
+import os
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+UNMATCHED_ROUTE = "unmatched"
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being processed",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "Number of SQL statements executed per HTTP request",
+    ["route"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds",
+    "Total SQL execution time per HTTP request",
+    ["route"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time",
+    buckets=LATENCY_BUCKETS,
+)
+USER_CACHE_REQUESTS = Counter(
+    "user_cache_requests_total",
+    "User snapshot cache lookups in Auth.get_current_user",
+    ["result"],
+)
+BCRYPT_DURATION = Histogram(
+    "bcrypt_duration_seconds",
+    "Time spent in bcrypt hash/verify on the worker thread",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 2, 5),
+)
+
+
+@dataclass(slots=True)
+class RequestStats:
+    """
+    Лічильники SQL-запитів поточного HTTP-запиту.
+    """
+
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = perf_counter() - conn.info["query_started"].pop()
+    DB_QUERY_DURATION.observe(elapsed)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+
+
+def instrument_engine(engine):
+    """
+    Підключає облік SQL-запитів до рушія SQLAlchemy.
+
+    Args:
+        engine: ``AsyncEngine`` або синхронний ``Engine``.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def observe_bcrypt(operation: str, func):
+    """
+    Обгортає функцію bcrypt вимірюванням часу її виконання.
+
+    Args:
+        operation (str): Назва операції (``hash`` або ``verify``).
+        func: Функція, що виконується в пулі потоків.
+
+    Returns:
+        Функція з тими самими аргументами.
+    """
+
+    def timed(*args):
+        started = perf_counter()
+        try:
+            return func(*args)
+        finally:
+            BCRYPT_DURATION.labels(operation).observe(perf_counter() - started)
+
+    return timed
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware, що вимірює тривалість HTTP-запитів і роботу з базою даних.
+
+    Маршрут береться з шаблону шляху FastAPI (``/contacts/{contact_id}``), а
+    не з фактичного URL, щоб кількість рядів метрик не залежала від
+    ідентифікаторів у шляху.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = perf_counter() - started
+            in_progress.dec()
+            _request_stats.reset(token)
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            REQUEST_DURATION.labels(method, route, str(status_code)).observe(elapsed)
+            DB_QUERIES_PER_REQUEST.labels(route).observe(stats.queries)
+            DB_TIME_PER_REQUEST.labels(route).observe(stats.db_seconds)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """
+    Формує відповідь для ``/metrics``.
+
+    Returns:
+        tuple[bytes, str]: Тіло у текстовому форматі Prometheus і Content-Type.
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
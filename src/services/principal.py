@@ -0,0 +1,79 @@
+"""
+Компактне представлення автентифікованого користувача для кешу.
+
+Замість pickle ORM-об'єкта ``User`` у Redis зберігається запис з кількох
+полів, потрібних для авторизації запиту. Перший байт — версія схеми:
+записи іншої версії (зокрема старі pickle, що починаються з ``0x80``)
+вважаються промахом кешу і перезаписуються.
+"""
+
+from dataclasses import dataclass
+
+import orjson
+
+from src.db.models import Role
+
+SCHEMA_VERSION = 1
+
+
+@dataclass(slots=True, frozen=True)
+class Principal:
+    """
+    Незмінний знімок користувача, що виконує запит.
+
+    Має ті самі назви атрибутів, що й модель ``User`` (``id``, ``email``,
+    ``roles``, ``confirmed``, ``avatar``), тому може використовуватися
+    замість неї в роутерах, репозиторіях та ``RoleAccess``.
+    """
+
+    id: int
+    email: str
+    roles: Role
+    confirmed: bool
+    avatar: str | None = None
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        """
+        Створює знімок з ORM-об'єкта користувача.
+
+        :param user: Користувач з бази даних.
+        :type user: User
+        :return: Знімок користувача.
+        :rtype: Principal
+        """
+        return cls(
+            id=user.id,
+            email=user.email,
+            roles=user.roles or Role.user,
+            confirmed=bool(user.confirmed),
+            avatar=user.avatar,
+        )
+
+    def dumps(self) -> bytes:
+        """
+        Серіалізує знімок: байт версії + JSON-масив полів.
+
+        :return: Дані для збереження в кеші.
+        :rtype: bytes
+        """
+        fields = [self.id, self.email, self.roles.value, self.confirmed, self.avatar]
+        return bytes((SCHEMA_VERSION,)) + orjson.dumps(fields)
+
+    @classmethod
+    def loads(cls, payload: bytes | None) -> "Principal | None":
+        """
+        Відновлює знімок з кешу.
+
+        :param payload: Дані з кешу.
+        :type payload: bytes | None
+        :return: Знімок або None, якщо даних немає, версія інша чи дані пошкоджені.
+        :rtype: Principal | None
+        """
+        if not payload or payload[0] != SCHEMA_VERSION:
+            return None
+        try:
+            id_, email, role, confirmed, avatar = orjson.loads(payload[1:])
+            return cls(id_, email, Role(role), confirmed, avatar)
+        except (orjson.JSONDecodeError, ValueError, TypeError):
+            return None
@@ -0,0 +1,45 @@
+"""
+Спільний асинхронний клієнт Redis.
+
+Усі сервіси застосунку використовують один пул з'єднань ``redis.asyncio``,
+налаштований через ``REDIS_URL``. Клієнт створюється при першому зверненні
+і не відкриває з'єднань до першої команди.
+"""
+
+from redis import asyncio as aioredis
+
+from src.settings.config import settings
+
+_client: aioredis.Redis | None = None
+
+
+def get_redis() -> aioredis.Redis:
+    """
+    Повертає спільний клієнт Redis з пулом з'єднань.
+
+    Короткі тайм-аути сокета гарантують, що недоступний Redis не блокує
+    обробку запиту надовго: виклики завершуються ``RedisError``, а сервіси
+    працюють без кешу.
+
+    :return: Асинхронний клієнт Redis.
+    :rtype: redis.asyncio.Redis
+    """
+    global _client
+    if _client is None:
+        _client = aioredis.Redis.from_url(
+            settings.REDIS_URL,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        )
+    return _client
+
+
+async def close_redis():
+    """
+    Закриває спільний клієнт та його пул з'єднань (під час зупинки застосунку).
+    """
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -30,20 +30,23 @@ class UploadFileService:
         )
 
     @staticmethod
-    def upload_file(file, username: str) -> str:
+    def save(name: str, data: bytes) -> str:
         """
-        Завантажує файл на Cloudinary та повертає URL зображення.
+        Завантажує підготовлене зображення аватара на Cloudinary.
+
+        Виконується синхронно, тому викликається з фонової задачі в
+        окремому потоці (див. :mod:`src.services.avatars`).
+
+        Ім'я — хеш вмісту, тому наявний ресурс не перезаписується, а URL
+        з версією Cloudinary кешується CDN.
 
         Args:
-            file: Об'єкт файлу (UploadFile).
-            username (str): Ім'я користувача для формування public_id.
+            name (str): Ім'я файлу аватара (частина public_id).
+            data (bytes): Вміст зображення.
 
         Returns:
-            str: URL завантаженого зображення з параметрами обрізки.
+            str: URL завантаженого зображення.
         """
-        public_id = f"RestApp/{username}"
-        result = cloudinary.uploader.upload(file.file, public_id=public_id, overwrite=True)
-        src_url = cloudinary.CloudinaryImage(public_id).build_url(
-            width=250, height=250, crop="fill", version=result.get("version")
-        )
-        return src_url
+        public_id = f"RestApp/{name}"
+        result = cloudinary.uploader.upload(data, public_id=public_id, overwrite=False)
+        return cloudinary.CloudinaryImage(public_id).build_url(version=result.get("version"))
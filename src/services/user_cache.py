@@ -0,0 +1,146 @@
+"""
+Дворівневий кеш знімків користувачів (:class:`Principal`).
+
+Перший рівень — LRU у пам'яті воркера з коротким TTL, другий — Redis,
+спільний для всіх воркерів. При зміні користувача ключ у Redis видаляється,
+а його email публікується в канал Redis pub/sub; кожен воркер слухає канал
+і видаляє запис зі свого локального LRU.
+"""
+
+import asyncio
+import logging
+
+from redis.exceptions import RedisError
+
+from src.services.cache import TTLCache
+from src.services.principal import Principal
+from src.services.redis_client import get_redis
+from src.settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "user-cache:invalidate"
+RECONNECT_DELAY = 1.0
+
+
+class UserCache:
+    """
+    Кеш знімків користувачів за email: локальний LRU + Redis.
+
+    Args:
+        local_size (int): Максимальна кількість записів у локальному LRU.
+        local_ttl (float): Час життя запису в локальному LRU, у секундах.
+        redis_ttl (int): Час життя запису в Redis, у секундах.
+    """
+
+    def __init__(self, local_size: int, local_ttl: float, redis_ttl: int):
+        self.local = TTLCache(maxsize=local_size, ttl=local_ttl)
+        self.redis_ttl = redis_ttl
+
+    @property
+    def r(self):
+        """
+        Асинхронний клієнт Redis.
+        """
+        return get_redis()
+
+    @staticmethod
+    def key(email: str) -> str:
+        """
+        Ключ Redis для знімка користувача.
+        """
+        return f"user:{email}"
+
+    async def get(self, email: str) -> Principal | None:
+        """
+        Шукає знімок спочатку в локальному LRU, потім у Redis.
+
+        Помилка Redis вважається промахом.
+
+        Args:
+            email (str): Email користувача.
+
+        Returns:
+            Principal | None: Знімок користувача або None при промаху.
+        """
+        user = self.local.get(email)
+        if user is not None:
+            return user
+        try:
+            user = Principal.loads(await self.r.get(self.key(email)))
+        except RedisError as err:
+            logger.warning("User cache read failed: %s", err)
+            return None
+        if user is not None:
+            self.local.set(email, user)
+        return user
+
+    async def set(self, user: Principal):
+        """
+        Зберігає знімок в обох рівнях; у Redis — однією командою ``SET ... EX``.
+
+        Args:
+            user (Principal): Знімок користувача.
+        """
+        self.local.set(user.email, user)
+        try:
+            await self.r.set(self.key(user.email), user.dumps(), ex=self.redis_ttl)
+        except RedisError as err:
+            logger.warning("User cache write failed: %s", err)
+
+    async def invalidate(self, email: str):
+        """
+        Видаляє знімок користувача з усіх рівнів у всіх воркерах.
+
+        Локальний запис видаляється одразу, ``DEL`` та ``PUBLISH`` надсилаються
+        в Redis одним конвеєром.
+
+        Args:
+            email (str): Email зміненого користувача.
+        """
+        self.local.pop(email)
+        try:
+            async with self.r.pipeline(transaction=False) as pipe:
+                pipe.delete(self.key(email))
+                pipe.publish(INVALIDATION_CHANNEL, email)
+                await pipe.execute()
+        except RedisError as err:
+            logger.warning("User cache invalidation failed: %s", err)
+
+    def handle_message(self, message):
+        """
+        Обробляє повідомлення з каналу інвалідації.
+        """
+        if message and message.get("type") == "message":
+            data = message["data"]
+            self.local.pop(data.decode() if isinstance(data, bytes) else data)
+
+    async def listen(self, poll_timeout: float = 1.0):
+        """
+        Слухає канал інвалідації, доки задачу не буде скасовано.
+
+        Після втрати з'єднання з Redis локальний LRU очищується, бо
+        повідомлення за час розриву могли бути пропущені.
+
+        Args:
+            poll_timeout (float): Тайм-аут очікування одного повідомлення, у секундах.
+        """
+        while True:
+            try:
+                async with self.r.pubsub(ignore_subscribe_messages=True) as pubsub:
+                    await pubsub.subscribe(INVALIDATION_CHANNEL)
+                    while True:
+                        self.handle_message(
+                            await pubsub.get_message(timeout=poll_timeout)
+                        )
+            except RedisError as err:
+                logger.warning("User cache invalidation listener failed: %s", err)
+                self.local.clear()
+                await asyncio.sleep(RECONNECT_DELAY)
+
+
+user_cache = UserCache(
+    local_size=settings.USER_CACHE_LOCAL_SIZE,
+    local_ttl=settings.USER_CACHE_LOCAL_TTL,
+    redis_ttl=settings.USER_CACHE_TTL,
+)
@@ -38,25 +38,72 @@ from pydantic import EmailStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
-    MAIL_USERNAME: str
-    MAIL_PASSWORD: str
-    MAIL_FROM: EmailStr
-    MAIL_PORT: int
-    MAIL_SERVER: str
-    MAIL_FROM_NAME: str
-    MAIL_STARTTLS: bool
-    MAIL_SSL_TLS: bool
-    USE_CREDENTIALS: bool
-    VALIDATE_CERTS: bool
-
-    CLOUDINARY_NAME: str
-    CLOUDINARY_API_KEY: str
-    CLOUDINARY_API_SECRET: str
+    # Пошта та Cloudinary потрібні лише воркерам, що надсилають листи чи
+    # завантажують аватари; перевіряються при першому використанні.
+    MAIL_USERNAME: str | None = None
+    MAIL_PASSWORD: str | None = None
+    MAIL_FROM: EmailStr | None = None
+    MAIL_PORT: int = 465
+    MAIL_SERVER: str | None = None
+    MAIL_FROM_NAME: str | None = None
+    MAIL_STARTTLS: bool = False
+    MAIL_SSL_TLS: bool = True
+    USE_CREDENTIALS: bool = True
+    VALIDATE_CERTS: bool = True
+
+    MAIL_TIMEOUT: float = 30.0
+    MAIL_POOL_SIZE: int = 2
+    MAIL_BATCH_SIZE: int = 50
+    MAIL_MAX_ATTEMPTS: int = 8
+    MAIL_RETRY_BASE: float = 30.0
+    MAIL_RETRY_MAX: float = 3600.0
+    MAIL_LEASE_SECONDS: float = 300.0
+    MAIL_POLL_INTERVAL: float = 2.0
+    MAIL_TEMPLATE_CACHE_DIR: str | None = None
+
+    CLOUDINARY_NAME: str | None = None
+    CLOUDINARY_API_KEY: str | None = None
+    CLOUDINARY_API_SECRET: str | None = None
+
+    AVATAR_STORAGE: str = "cloudinary"
+    AVATAR_LOCAL_DIR: str = "media/avatars"
+    AVATAR_BASE_URL: str = "/media/avatars"
+    AVATAR_MAX_BYTES: int = 5 * 1024 * 1024
+    AVATAR_SIZE: int = 250
 
     SECRET_KEY: str
     ALGORITHM: str
     DB_URL: str
 
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_VERIFY_SCHEMA: bool = True
+
+    REDIS_URL: str = "redis://redis:6379/0"
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_SOCKET_TIMEOUT: float = 0.5
+
+    USER_CACHE_TTL: int = 900
+    USER_CACHE_LOCAL_SIZE: int = 10000
+    USER_CACHE_LOCAL_TTL: float = 30.0
+
+    TOKEN_CACHE_SIZE: int = 10000
+
+    CONTACTS_CACHE_TTL: int = 60
+    CONTACTS_CACHE_JITTER: float = 0.1
+    CONTACTS_CACHE_LOCK_TTL: float = 5.0
+
+    HASH_POOL_WORKERS: int = 4
+    HASH_POOL_MAX_PENDING: int = 64
+
+    RATE_LIMIT_LOGIN: str = "10/minute"
+    RATE_LIMIT_SIGNUP: str = "5/minute"
+    RATE_LIMIT_ME: str = "5/minute"
+    RATE_LIMIT_CONTACTS: str = "300/minute"
+
     model_config = SettingsConfigDict(
         extra="ignore",
         env_file=os.getenv("ENV_FILE", ".env"),
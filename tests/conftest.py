@@ -1,8 +1,9 @@
 import sys
 import os
+import asyncio
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
 import pytest_asyncio
 
 
@@ -16,16 +17,20 @@ if BASE_DIR not in sys.path:
 from fastapi.testclient import TestClient
 from main import app
 from src.db.models import User
-from src.db.connect import Base, get_db
+from src.db.connect import Base, get_db, get_session_factory, to_async_url
 from src.repository.auth import create_access_token, Hash
+from src.services.auth import auth_service
+from src.services.metrics import instrument_engine
+from src.services.user_cache import user_cache
 from src.settings.config import settings 
 
 SQLALCHEMY_DATABASE_URL = settings.DB_URL
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+engine = create_async_engine(to_async_url(SQLALCHEMY_DATABASE_URL), poolclass=NullPool)
+instrument_engine(engine)
+TestingSessionLocal = async_sessionmaker(
+    bind=engine, autoflush=False, expire_on_commit=False
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 test_user = {
     "email": "ironman@example.com",
@@ -39,34 +44,35 @@ test_user = {
 
 @pytest.fixture(scope="module", autouse=True)
 def init_models_wrap():
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
-
-    db = TestingSessionLocal()
-    hash_password = Hash().get_password_hash(test_user["password"])
-    current_user = User(
-        email=test_user["email"],
-        password=hash_password,
-        first_name=test_user["first_name"],
-        last_name=test_user["last_name"],
-        confirmed=test_user["confirmed"],
-        avatar=test_user["avatar"],
-    )
-    db.add(current_user)
-    db.commit()
-    db.close()
+    async def init_models():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+
+        async with TestingSessionLocal() as db:
+            hash_password = Hash().get_password_hash(test_user["password"])
+            current_user = User(
+                email=test_user["email"],
+                password=hash_password,
+                first_name=test_user["first_name"],
+                last_name=test_user["last_name"],
+                confirmed=test_user["confirmed"],
+                avatar=test_user["avatar"],
+            )
+            db.add(current_user)
+            await db.commit()
+
+    asyncio.run(init_models())
 
 
 @pytest_asyncio.fixture(scope="module")
 async def client():
-    def override_get_db():
-        db = TestingSessionLocal()
-        try:
+    async def override_get_db():
+        async with TestingSessionLocal() as db:
             yield db
-        finally:
-            db.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://testserver") as ac:
@@ -81,16 +87,24 @@ def get_token():
 
     return run(create_access_token(data={"sub": test_user["email"]}))
 
+
+@pytest.fixture()
+def auth_headers():
+    token = asyncio.run(
+        create_access_token(data={"sub": test_user["email"], "roles": "user"})
+    )
+    return {"Authorization": f"Bearer {token}"}
+
 @pytest.fixture(autouse=True)
 def mock_redis(monkeypatch):
-    fake_redis = fakeredis.FakeRedis(decode_responses=True)
+    # Без decode_responses, як і робочий клієнт: кеші зберігають bytes
+    # (записи Principal, готові JSON-тіла списків), і str-відповіді їх ламали б.
+    fake_redis = fakeredis.FakeAsyncRedis()
 
-    monkeypatch.setattr("src.services.auth.Auth.r", fake_redis)
+    monkeypatch.setattr("src.services.redis_client._client", fake_redis)
 
-@pytest.fixture(autouse=True)
-def disable_email_sending(monkeypatch):
-    async def fake_send_email(*args, **kwargs):
-        return None
 
-    monkeypatch.setattr("src.services.email.send_email", fake_send_email)
-    monkeypatch.setattr("src.services.email.send_reset_password_email", fake_send_email)
+@pytest.fixture(autouse=True)
+def clear_local_caches():
+    user_cache.local.clear()
+    auth_service.token_cache.clear()
@@ -1,12 +1,14 @@
 import pytest
+from unittest.mock import patch
 from fastapi import HTTPException
-from jose import jwt
+from jose import JWTError, jwt
 from src.repository.auth import (
     Hash,
     create_access_token,
     create_email_token,
     get_email_from_token,
 )
+from src.services.auth import auth_service
 from src.settings.base import SECRET_KEY, ALGORITHM
 
 
@@ -51,3 +53,29 @@ async def test_get_email_from_token_invalid():
     exc = exc_info.value
     assert exc.status_code == 422
     assert exc.detail == "Invalid token for email verification"
+
+
+@pytest.mark.asyncio
+async def test_decode_token_caches_verified_claims():
+    token = await create_access_token({"sub": "jwt@example.com", "roles": "user"})
+    hits_before = auth_service.token_cache.hits
+
+    with patch("src.services.auth.jwt.decode", wraps=jwt.decode) as decode:
+        first = auth_service.decode_token(token)
+        second = auth_service.decode_token(token)
+
+    assert decode.call_count == 1
+    assert first == second
+    assert first["sub"] == "jwt@example.com"
+    assert auth_service.token_cache.hits == hits_before + 1
+
+
+@pytest.mark.asyncio
+async def test_decode_token_does_not_cache_invalid_or_expired_tokens():
+    expired = await create_access_token({"sub": "old@example.com"}, expires_delta=-10)
+
+    for token in ("this.is.invalid", expired):
+        with pytest.raises(JWTError):
+            auth_service.decode_token(token)
+
+    assert len(auth_service.token_cache) == 0
@@ -0,0 +1,207 @@
+import io
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI, File, HTTPException, UploadFile, status
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+
+from main import app
+from src.db.models import Role, User
+from src.services.auth import auth_service
+from src.services.avatars import (
+    IMMUTABLE_CACHE_CONTROL,
+    AvatarStaticFiles,
+    MULTIPART_OVERHEAD,
+    LocalAvatarStorage,
+    UploadSizeLimit,
+    avatar_digest,
+    check_upload_size,
+    push_avatar,
+    resize_avatar,
+)
+from src.services.container import services
+from src.services.principal import Principal
+from src.settings.config import settings
+from tests.conftest import TestingSessionLocal, test_user
+
+PIL = pytest.importorskip("PIL")
+from PIL import Image  # noqa: E402
+
+
+def image_bytes(size=(800, 600), mode="RGBA", fmt="PNG"):
+    buffer = io.BytesIO()
+    Image.new(mode, size, (200, 10, 10, 128)[: len(mode)]).save(buffer, fmt)
+    return buffer.getvalue()
+
+
+class CountingStorage(LocalAvatarStorage):
+    saved = 0
+
+    def save(self, name, data):
+        self.saved += 1
+        return super().save(name, data)
+
+
+class BrokenStorage:
+    def save(self, name, data):
+        raise ConnectionError("storage is down")
+
+
+async def load_user():
+    async with TestingSessionLocal() as db:
+        result = await db.execute(select(User).where(User.email == test_user["email"]))
+        return result.scalars().one()
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    local = CountingStorage(tmp_path, "/media/avatars")
+    monkeypatch.setattr(services, "_avatar_storage", local)
+    return local
+
+
+@pytest_asyncio.fixture
+async def admin():
+    user = await load_user()
+    principal = Principal(user.id, user.email, Role.admin, True, user.avatar)
+    app.dependency_overrides[auth_service.get_current_user] = lambda: principal
+    yield principal
+    app.dependency_overrides.pop(auth_service.get_current_user)
+
+
+def test_resize_avatar_crops_to_square_jpeg():
+    data = resize_avatar(io.BytesIO(image_bytes()), 250)
+    with Image.open(io.BytesIO(data)) as image:
+        assert image.format == "JPEG"
+        assert image.size == (250, 250)
+
+
+def test_resize_avatar_rejects_non_images():
+    with pytest.raises(ValueError):
+        resize_avatar(io.BytesIO(b"not an image"), 250)
+
+
+def test_upload_size_is_capped():
+    upload = UploadFile(io.BytesIO(b"x" * 11), size=11)
+    with pytest.raises(HTTPException) as error:
+        check_upload_size(upload, 10)
+    assert error.value.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    check_upload_size(UploadFile(io.BytesIO(b"x" * 10)), 10)
+
+
+@pytest.fixture
+def limited_app():
+    calls = []
+    limited = FastAPI()
+    limited.add_middleware(UploadSizeLimit, path="/upload", max_bytes=1000)
+
+    @limited.post("/upload")
+    async def upload(file: UploadFile = File()):
+        calls.append(file.filename)
+        return {"ok": True}
+
+    return limited, calls
+
+
+@pytest.mark.asyncio
+async def test_upload_limit_rejects_by_content_length(limited_app):
+    limited, calls = limited_app
+    async with AsyncClient(transport=ASGITransport(app=limited), base_url="http://t") as ac:
+        small = await ac.post("/upload", files={"file": ("a.png", b"x" * 10)})
+        large = await ac.post("/upload", files={"file": ("a.png", b"x" * 5000)})
+    assert small.status_code == status.HTTP_200_OK
+    assert large.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    assert calls == ["a.png"]
+
+
+@pytest.mark.asyncio
+async def test_upload_limit_stops_streamed_body(limited_app):
+    limited, calls = limited_app
+
+    async def chunks():
+        yield b'--b\r\nContent-Disposition: form-data; name="file"; filename="a.png"\r\n\r\n'
+        for _ in range(100):
+            yield b"x" * 50
+
+    async with AsyncClient(transport=ASGITransport(app=limited), base_url="http://t") as ac:
+        response = await ac.post(
+            "/upload",
+            content=chunks(),
+            headers={"content-type": "multipart/form-data; boundary=b"},
+        )
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_oversized_avatar_is_rejected_before_parsing(client, storage, admin):
+    body = b"x" * (settings.AVATAR_MAX_BYTES + MULTIPART_OVERHEAD + 1)
+    response = await client.patch("/user/avatar", files={"file": ("me.png", body, "image/png")})
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    assert storage.saved == 0
+
+
+def test_local_storage_writes_file(tmp_path):
+    url = LocalAvatarStorage(tmp_path / "avatars", "/media/avatars/").save("7", b"jpeg")
+    assert url == "/media/avatars/7.jpg"
+    assert (tmp_path / "avatars" / "7.jpg").read_bytes() == b"jpeg"
+    assert [p.name for p in (tmp_path / "avatars").iterdir()] == ["7.jpg"]
+
+
+def test_local_storage_keeps_existing_content(tmp_path):
+    storage = LocalAvatarStorage(tmp_path, "/media/avatars")
+    storage.save("digest", b"first")
+    assert storage.save("digest", b"second") == "/media/avatars/digest.jpg"
+    assert (tmp_path / "digest.jpg").read_bytes() == b"first"
+
+
+@pytest.mark.asyncio
+async def test_local_avatars_are_served_immutable(tmp_path):
+    (tmp_path / "abc.jpg").write_bytes(b"jpeg")
+    static = FastAPI()
+    static.mount("/media/avatars", AvatarStaticFiles(directory=tmp_path))
+    async with AsyncClient(transport=ASGITransport(app=static), base_url="http://t") as ac:
+        response = await ac.get("/media/avatars/abc.jpg")
+        missing = await ac.get("/media/avatars/missing.jpg")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert missing.status_code == status.HTTP_404_NOT_FOUND
+    assert "cache-control" not in missing.headers
+
+
+@pytest.mark.asyncio
+async def test_avatar_upload_returns_pending_and_pushes_in_background(client, storage, admin):
+    upload = {"file": ("me.png", image_bytes(), "image/png")}
+    response = await client.patch("/user/avatar", files=upload)
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert response.json()["avatar_status"] == "pending"
+
+    user = await load_user()
+    stored = storage.root / f"{user.avatar_digest}.jpg"
+    assert user.avatar_status == "ready"
+    assert user.avatar == f"/media/avatars/{user.avatar_digest}.jpg"
+    assert avatar_digest(stored.read_bytes()) == user.avatar_digest
+    with Image.open(stored) as image:
+        assert image.size == (250, 250)
+
+    again = await client.patch("/user/avatar", files=upload)
+    assert again.status_code == status.HTTP_200_OK
+    assert again.json()["avatar"] == user.avatar
+    assert storage.saved == 1
+
+
+@pytest.mark.asyncio
+async def test_avatar_upload_rejects_non_image(client, storage, admin):
+    response = await client.patch(
+        "/user/avatar", files={"file": ("me.png", b"plain text", "image/png")}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_failed_push_marks_avatar_failed(client):
+    await push_avatar(
+        BrokenStorage(), TestingSessionLocal, test_user["email"], "1", b"jpeg"
+    )
+    assert (await load_user()).avatar_status == "failed"
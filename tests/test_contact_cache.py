@@ -0,0 +1,101 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.services.contact_cache import ContactCache
+from src.services.contact_versions import contact_versions
+
+
+@pytest.fixture
+def cache():
+    return ContactCache(ttl=60, jitter=0.1, lock_ttl=1.0)
+
+
+@pytest.mark.asyncio
+async def test_read_through_caches_until_version_bump(cache):
+    compute = AsyncMock(side_effect=[b'{"items":[1]}', b'{"items":[1,2]}'])
+
+    assert await cache.read_through(1, "list", {"limit": 10}, compute) == b'{"items":[1]}'
+    assert await cache.read_through(1, "list", {"limit": 10}, compute) == b'{"items":[1]}'
+    assert compute.await_count == 1
+
+    await contact_versions.bump(1)
+    assert await cache.read_through(1, "list", {"limit": 10}, compute) == b'{"items":[1,2]}'
+    assert compute.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_keys_depend_on_params_and_user(cache):
+    assert cache.key(1, "v0", "list", {"a": 1, "b": 2}) == cache.key(
+        1, "v0", "list", {"b": 2, "a": 1}
+    )
+    assert cache.key(1, "v0", "list", {"a": 1}) != cache.key(1, "v0", "list", {"a": 2})
+    assert cache.key(1, "v0", "list", {"a": 1}) != cache.key(2, "v0", "list", {"a": 1})
+    assert cache.key(1, "v0", "list", {"a": 1}) != cache.key(1, "v1", "list", {"a": 1})
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_compute_once(cache):
+    calls = 0
+
+    async def slow_compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.1)
+        return b'["result"]'
+
+    results = await asyncio.gather(
+        *(cache.read_through(1, "birthdays", {"days": 7}, slow_compute) for _ in range(5))
+    )
+    assert results == [b'["result"]'] * 5
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached(cache):
+    compute = AsyncMock(side_effect=[HTTPException(status_code=404), b'["ok"]'])
+
+    with pytest.raises(HTTPException):
+        await cache.read_through(1, "birthdays", {"days": 7}, compute)
+    assert await cache.read_through(1, "birthdays", {"days": 7}, compute) == b'["ok"]'
+
+
+@pytest.mark.asyncio
+async def test_waiters_stop_waiting_when_owner_fails(cache):
+    calls = 0
+
+    async def failing_compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        raise HTTPException(status_code=404)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    results = await asyncio.gather(
+        *(cache.read_through(1, "birthdays", {"days": 7}, failing_compute) for _ in range(3)),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, HTTPException) for result in results)
+    assert calls == 3
+    assert loop.time() - started < cache.lock_ttl / 2
+
+
+@pytest.mark.asyncio
+async def test_computes_without_cache_when_redis_fails(cache):
+    broken = AsyncMock()
+    broken.get.side_effect = RedisConnectionError("down")
+    compute = AsyncMock(return_value=b'["fresh"]')
+    with patch("src.services.contact_versions.get_redis", return_value=broken):
+        assert await cache.read_through(1, "list", {}, compute) == b'["fresh"]'
+        assert await cache.read_through(1, "list", {}, compute) == b'["fresh"]'
+    assert compute.await_count == 2
+
+
+def test_ttl_jitter_bounds(cache):
+    values = {cache.expires_in() for _ in range(50)}
+    assert all(60_000 <= value <= 66_000 for value in values)
+    assert len(values) > 1
@@ -0,0 +1,47 @@
+import datetime
+
+import orjson
+import pytest
+
+from src.services.contact_export import FIELDS, export_chunks
+
+
+ROW = {
+    "id": 1,
+    "first_name": "Ivan",
+    "last_name": "Petrenko",
+    "email": "ivan@example.com",
+    "phone_number": "+380501234567",
+    "birthday": datetime.date(1990, 5, 17),
+    "additional_info": None,
+}
+
+
+async def batches(*parts):
+    for part in parts:
+        yield part
+
+
+async def collect(fmt, *parts):
+    return b"".join([chunk async for chunk in export_chunks(batches(*parts), fmt)])
+
+
+@pytest.mark.asyncio
+async def test_ndjson_one_object_per_line():
+    body = await collect("ndjson", [ROW], [dict(ROW, id=2)])
+    lines = body.splitlines()
+    assert [orjson.loads(line)["id"] for line in lines] == [1, 2]
+    assert orjson.loads(lines[0])["birthday"] == "1990-05-17"
+
+
+@pytest.mark.asyncio
+async def test_csv_header_and_empty_values():
+    body = (await collect("csv", [ROW])).decode()
+    header, row = body.splitlines()
+    assert header.split(",") == FIELDS
+    assert row == "1,Ivan,Petrenko,ivan@example.com,+380501234567,1990-05-17,"
+
+
+@pytest.mark.asyncio
+async def test_csv_without_rows_has_header_only():
+    assert (await collect("csv")).decode() == ",".join(FIELDS) + "\n"
@@ -0,0 +1,59 @@
+import pytest
+
+from src.services.contact_import import (
+    ImportFormatError,
+    detect_format,
+    iter_records,
+)
+
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def collect(data: bytes, fmt: str, size: int = 7):
+    return [record async for record in iter_records(chunked(data, size), fmt)]
+
+
+@pytest.mark.asyncio
+async def test_csv_records_across_chunk_boundaries():
+    data = (
+        "﻿first_name,last_name,additional_info\r\n"
+        'Тарас,Шевченко,"multi\nline"\r\n'
+        "Леся,Українка,\r\n"
+        "broken,row\n"
+    ).encode()
+
+    records = await collect(data, "csv")
+
+    assert records[0] == (
+        1,
+        {"first_name": "Тарас", "last_name": "Шевченко", "additional_info": "multi\nline"},
+    )
+    assert records[1] == (
+        2,
+        {"first_name": "Леся", "last_name": "Українка", "additional_info": None},
+    )
+    assert records[2][0] == 3
+    assert isinstance(records[2][1], ValueError)
+
+
+@pytest.mark.asyncio
+async def test_ndjson_records_report_bad_lines():
+    data = b'{"first_name": "A"}\n\nnot json\n[1, 2]\n{"first_name": "B"}'
+
+    records = await collect(data, "ndjson", size=5)
+
+    assert records[0] == (1, {"first_name": "A"})
+    assert isinstance(records[1][1], ValueError)
+    assert isinstance(records[2][1], ValueError)
+    assert records[3] == (4, {"first_name": "B"})
+
+
+def test_detect_format():
+    assert detect_format("csv", "application/json") == "csv"
+    assert detect_format(None, "text/csv; charset=utf-8") == "csv"
+    assert detect_format(None, "application/x-ndjson") == "ndjson"
+    with pytest.raises(ImportFormatError):
+        detect_format(None, "application/json")
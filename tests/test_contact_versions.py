@@ -0,0 +1,73 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.services.contact_versions import (
+    ContactVersions,
+    etag_matches,
+    make_etag,
+)
+
+
+@pytest.mark.asyncio
+async def test_version_is_stable_until_bump():
+    versions = ContactVersions()
+    initial = await versions.get(7)
+    assert initial is not None
+    assert await versions.get(7) == initial
+    await versions.bump(7)
+    bumped = await versions.get(7)
+    assert bumped not in (None, initial)
+    assert await versions.get(8) not in (None, initial, bumped)
+
+
+@pytest.mark.asyncio
+async def test_version_does_not_repeat_after_redis_reset():
+    versions = ContactVersions()
+    before = await versions.get(7)
+    await versions.r.flushall()
+    assert await versions.get(7) != before
+
+
+@pytest.mark.asyncio
+async def test_version_unavailable_when_redis_fails():
+    versions = ContactVersions()
+    broken = AsyncMock()
+    broken.get.side_effect = RedisConnectionError("down")
+    broken.set.side_effect = RedisConnectionError("down")
+    with patch("src.services.contact_versions.get_redis", return_value=broken):
+        assert await versions.get(7) is None
+        await versions.bump(7)
+
+
+@pytest.mark.asyncio
+async def test_failed_bump_disables_version_until_replaced():
+    versions = ContactVersions()
+    before = await versions.get(7)
+    broken = AsyncMock()
+    broken.set.side_effect = RedisConnectionError("down")
+    with patch("src.services.contact_versions.get_redis", return_value=broken):
+        await versions.bump(7)
+        assert await versions.get(7) is None
+    after = await versions.get(7)
+    assert after not in (None, before)
+    assert await versions.get(7) == after
+
+
+def test_etag_depends_on_user_version_and_resource():
+    etag = make_etag(1, "a1", "/contacts/?limit=10")
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag(1, "a1", "/contacts/?limit=10")
+    assert etag != make_etag(2, "a1", "/contacts/?limit=10")
+    assert etag != make_etag(1, "a2", "/contacts/?limit=10")
+    assert etag != make_etag(1, "a1", "/contacts/?limit=20")
+
+
+def test_etag_matches_if_none_match_forms():
+    etag = '"abc"'
+    assert etag_matches('"abc"', etag)
+    assert etag_matches('"x", W/"abc"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"abd"', etag)
+    assert not etag_matches(None, etag)
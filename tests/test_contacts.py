@@ -2,7 +2,12 @@
 import pytest
 from unittest.mock import MagicMock, AsyncMock
 
-from src.repository import contacts
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import DataError
+
+from src.repository import contacts, search
+from src.repository.pagination import decode_cursor, encode_cursor
 from src.db.models import Contact, User
 from datetime import date, timedelta
 
@@ -14,7 +19,18 @@ def mock_user():
 
 @pytest.fixture
 def mock_db():
-    return MagicMock()
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=MagicMock())
+    db.commit = AsyncMock()
+    db.refresh = AsyncMock()
+    db.delete = AsyncMock()
+    return db
+
+
+def set_scalars(mock_db, rows):
+    scalars = mock_db.execute.return_value.scalars.return_value
+    scalars.all.return_value = rows
+    scalars.first.return_value = rows[0] if rows else None
 
 
 @pytest.mark.asyncio
@@ -26,31 +42,48 @@ async def test_create_contact(mock_db, mock_user):
         "email": "john@example.com",
     }
 
-    mock_db.add = MagicMock()
-    mock_db.commit = MagicMock()
-    mock_db.refresh = MagicMock()
-
     result = await contacts.create_contact(body, mock_db, mock_user)
 
     assert result.user_id == mock_user.id
     mock_db.add.assert_called()
-    mock_db.commit.assert_called()
+    mock_db.commit.assert_awaited()
+    mock_db.refresh.assert_not_awaited()
 
 
 @pytest.mark.asyncio
 async def test_get_contacts(mock_db, mock_user):
     expected_contacts = [Contact(id=1), Contact(id=2)]
-    mock_db.query().filter().all.return_value = expected_contacts
+    set_scalars(mock_db, expected_contacts)
 
     result = await contacts.get_contacts(mock_db, mock_user)
 
-    assert result == expected_contacts
+    assert result["items"] == expected_contacts
+    assert result["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_get_contacts_returns_next_cursor(mock_db, mock_user):
+    rows = [Contact(id=1), Contact(id=2), Contact(id=3)]
+    set_scalars(mock_db, rows)
+
+    result = await contacts.get_contacts(mock_db, mock_user, limit=2)
+
+    assert result["items"] == rows[:2]
+    assert decode_cursor(result["next_cursor"]) == 2
+
+
+def test_decode_cursor_roundtrip_and_invalid():
+    assert decode_cursor(encode_cursor(42)) == 42
+
+    with pytest.raises(Exception) as exc:
+        decode_cursor("not-a-cursor")
+    assert exc.value.status_code == 400
 
 
 @pytest.mark.asyncio
 async def test_get_contact_by_id_found(mock_db, mock_user):
     contact = Contact(id=1, user_id=mock_user.id)
-    mock_db.query().filter().first.return_value = contact
+    set_scalars(mock_db, [contact])
 
     result = await contacts.get_contact_by_id(1, mock_db, mock_user)
     assert result == contact
@@ -58,7 +91,7 @@ async def test_get_contact_by_id_found(mock_db, mock_user):
 
 @pytest.mark.asyncio
 async def test_get_contact_by_id_not_found(mock_db, mock_user):
-    mock_db.query().filter().first.return_value = None
+    set_scalars(mock_db, [])
 
     with pytest.raises(Exception) as exc:
         await contacts.get_contact_by_id(99, mock_db, mock_user)
@@ -68,35 +101,63 @@ async def test_get_contact_by_id_not_found(mock_db, mock_user):
 @pytest.mark.asyncio
 async def test_delete_contact(mock_db, mock_user):
     contact = Contact(id=1, user_id=mock_user.id)
-    mock_db.query().filter().first.return_value = contact
+    set_scalars(mock_db, [contact])
 
     result = await contacts.delete_contact(1, mock_db, mock_user)
-    mock_db.delete.assert_called_with(contact)
     assert result == contact
+    mock_db.execute.assert_awaited_once()
+    assert mock_db.execute.await_args.args[0].is_delete
+    mock_db.commit.assert_awaited()
+
+
+@pytest.mark.asyncio
+async def test_delete_contact_not_found(mock_db, mock_user):
+    set_scalars(mock_db, [])
+
+    with pytest.raises(HTTPException) as exc:
+        await contacts.delete_contact(1, mock_db, mock_user)
+    assert exc.value.status_code == 404
+    mock_db.commit.assert_not_awaited()
 
 
 @pytest.mark.asyncio
 async def test_update_contact(mock_db, mock_user):
     contact = Contact(id=1, user_id=mock_user.id, first_name="Old")
-    mock_db.query().filter().first.return_value = contact
+    set_scalars(mock_db, [contact])
 
     body = MagicMock()
     body.model_dump.return_value = {"first_name": "New"}
 
     result = await contacts.update_contact(1, body, mock_db, mock_user)
-    assert contact.first_name == "New"
     assert result == contact
+    mock_db.execute.assert_awaited_once()
+    stmt = mock_db.execute.await_args.args[0]
+    assert stmt.is_update
+    assert "first_name" in stmt.compile().params
+    mock_db.refresh.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_update_contact_birthday_sets_key(mock_db, mock_user):
+    set_scalars(mock_db, [Contact(id=1, user_id=mock_user.id)])
+
+    body = MagicMock()
+    body.model_dump.return_value = {"birthday": date(1990, 5, 17)}
+
+    await contacts.update_contact(1, body, mock_db, mock_user)
+    params = mock_db.execute.await_args.args[0].compile().params
+    assert params["birthday_md"] == 517
 
 
 @pytest.mark.asyncio
 async def test_search_contacts_by_email(mock_db, mock_user):
     expected = [Contact(id=1, email="a@example.com")]
-    mock_db.query().filter().filter().all.return_value = expected
+    set_scalars(mock_db, expected)
 
     result = await contacts.search_contacts(
         None, None, "a@example.com", mock_db, mock_user
     )
-    assert result == expected
+    assert result["items"] == expected
 
 
 @pytest.mark.asyncio
@@ -105,7 +166,74 @@ async def test_upcoming_birthdays(mock_db, mock_user):
     next_week = today + timedelta(days=5)
     contact = Contact(id=1, user_id=mock_user.id, birthday=next_week)
 
-    mock_db.query().filter().all.return_value = [contact]
+    set_scalars(mock_db, [contact])
     result = await contacts.upcoming_birthdays(mock_db, mock_user)
 
-    assert contact in result
\ No newline at end of file
+    assert contact in result
+
+
+def test_contact_keeps_birthday_md_in_sync():
+    contact = Contact(birthday=date(1990, 5, 17))
+    assert contact.birthday_md == 517
+
+    contact.birthday = date(1988, 2, 29)
+    assert contact.birthday_md == 229
+
+
+def test_birthday_window_wraps_year_end():
+    assert contacts.birthday_window(date(2025, 12, 28), 7) == (1228, 104, True)
+    assert contacts.birthday_window(date(2025, 5, 1), 7) == (501, 508, False)
+
+
+def test_birthday_window_includes_feb_29_in_non_leap_year():
+    assert contacts.birthday_window(date(2025, 2, 21), 7) == (221, 229, False)
+    assert contacts.birthday_window(date(2024, 2, 21), 7) == (221, 228, False)
+
+
+@pytest.mark.asyncio
+async def test_search_contacts_free_text(mock_db, mock_user):
+    expected = [Contact(id=3, first_name="Wanda")]
+    set_scalars(mock_db, expected)
+
+    result = await contacts.search_contacts(
+        None, None, None, mock_db, mock_user, q="wand"
+    )
+    assert result == {"items": expected, "next_cursor": None}
+
+
+def test_postgresql_search_uses_trigram_similarity():
+    query = search._postgresql_query(1, "wand")
+    sql = str(query.compile(dialect=postgresql.dialect()))
+
+    assert "similarity(contacts.first_name" in sql
+    assert "contacts.email %" in sql
+    assert "ORDER BY greatest(" in sql
+
+
+@pytest.mark.asyncio
+async def test_import_reports_chunk_rejected_by_database(mock_db, mock_user):
+    async def records():
+        for index in range(3):
+            yield index + 1, {
+                "first_name": f"Row{index}",
+                "last_name": "Import",
+                "email": f"row{index}@example.com",
+                "phone_number": f"+38050000010{index}",
+                "birthday": "1990-01-01",
+            }
+
+    first, last = MagicMock(), MagicMock()
+    first.scalars.return_value.all.return_value = ["row0@example.com"]
+    last.scalars.return_value.all.return_value = ["row2@example.com"]
+    mock_db.execute.side_effect = [
+        first,
+        DataError("INSERT", {}, Exception("value too long")),
+        last,
+    ]
+    mock_db.rollback = AsyncMock()
+
+    report = await contacts.import_contacts(records(), mock_db, mock_user, chunk_size=1)
+
+    assert report["inserted"] == 2
+    assert [error["row"] for error in report["errors"]] == [2]
+    mock_db.rollback.assert_awaited_once()
@@ -0,0 +1,57 @@
+from email import message_from_bytes
+from email.policy import default
+
+import pytest
+
+from src.services.email import (
+    CompiledEmail,
+    TEMPLATES,
+    build_message,
+    compile_templates,
+    get_environment,
+)
+from src.settings.config import settings
+
+CONTEXT = {"host": "http://test/", "username": "<Bob & Co>", "token": "abc.def"}
+
+
+@pytest.mark.parametrize("kind", TEMPLATES)
+def test_prebuilt_body_matches_jinja_render(kind):
+    compiled = compile_templates()[kind]
+    assert compiled.segments is not None
+    assert compiled.render(CONTEXT) == compiled.template.render(CONTEXT)
+
+
+def test_templates_are_compiled_once():
+    assert compile_templates() is compile_templates()
+
+
+def test_non_linear_template_falls_back_to_jinja():
+    template = get_environment().from_string("{% if username %}Hi {{ username }}{% endif %}!")
+    compiled = CompiledEmail("Subject", template)
+    assert compiled.segments is None
+    assert compiled.render({"username": "Bob"}) == "Hi Bob!"
+    assert compiled.render({}) == "!"
+
+
+def test_build_message_produces_valid_mime():
+    email = build_message("verify", "bob@example.com", {"host": "http://test/", "username": "Bob"})
+    assert email.recipient == "bob@example.com"
+    assert email.sender == settings.MAIL_FROM
+
+    message = message_from_bytes(email.content, policy=default)
+    assert message["To"] == "bob@example.com"
+    assert message["Subject"] == "Confirm your email"
+    assert message["Date"]
+    assert message["Message-ID"].endswith(f"@{settings.MAIL_FROM.rpartition('@')[2]}>")
+    other = build_message("verify", "bob@example.com", {"host": "http://test/", "username": "Bob"})
+    assert message_from_bytes(other.content)["Message-ID"] != message["Message-ID"]
+    assert message.get_content_type() == "text/html"
+    body = message.get_content()
+    assert "Hi Bob," in body
+    assert "http://test/auth/confirmed_email/" in body
+
+
+def test_build_message_rejects_unknown_kind():
+    with pytest.raises(KeyError):
+        build_message("newsletter", "bob@example.com", {})
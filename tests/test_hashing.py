@@ -0,0 +1,47 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from src.repository.auth import Hash
+from src.services.hashing import HashWorkerPool
+
+
+@pytest.mark.asyncio
+async def test_hash_pool_hashes_off_the_event_loop():
+    pool = HashWorkerPool(Hash(), max_workers=2, max_pending=4)
+    try:
+        hashed = await pool.get_password_hash("secret")
+
+        assert await pool.verify_password("secret", hashed)
+        assert not await pool.verify_password("wrong", hashed)
+        assert pool.pending == 0
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hash_pool_rejects_when_saturated():
+    release = threading.Event()
+
+    class SlowHash:
+        def get_password_hash(self, password):
+            release.wait(timeout=5)
+            return f"hashed-{password}"
+
+    pool = HashWorkerPool(SlowHash(), max_workers=1, max_pending=1)
+    try:
+        in_flight = asyncio.create_task(pool.get_password_hash("first"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await pool.get_password_hash("second")
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.headers["Retry-After"] == "1"
+
+        release.set()
+        assert await in_flight == "hashed-first"
+        assert pool.pending == 0
+    finally:
+        pool.shutdown()
@@ -1,6 +1,17 @@
 import pytest
 from fastapi import status
+from sqlalchemy import select
+
+from src.db.models import EmailOutbox
 from src.repository.auth import Hash
+from tests.conftest import TestingSessionLocal
+
+
+async def outbox_for(email):
+    async with TestingSessionLocal() as db:
+        result = await db.execute(select(EmailOutbox).where(EmailOutbox.recipient == email))
+        return result.scalars().all()
+
 
 @pytest.mark.asyncio
 async def test_signup_success(client):
@@ -15,6 +26,11 @@ async def test_signup_success(client):
     data = response.json()
     assert data["email"] == user_data["email"]
 
+    [entry] = await outbox_for(user_data["email"])
+    assert entry.kind == "verify"
+    assert entry.status == "pending"
+    assert entry.context == {"username": "New", "host": "http://testserver/"}
+
 @pytest.mark.asyncio
 async def test_signup_existing_email(client):
 
@@ -69,15 +85,21 @@ async def test_login_unconfirmed_email(client):
 
 
 @pytest.mark.asyncio
-async def test_request_reset_password_nonexistent_email(client, monkeypatch):
-    async def fake_send_reset_password_email(email, reset_link):
-        pytest.fail("Email should not be sent for nonexistent user")
-
-    monkeypatch.setattr("src.services.email.send_reset_password_email", fake_send_reset_password_email)
-
+async def test_request_reset_password_nonexistent_email(client):
     response = await client.post("/auth/request-reset-password", json={"email": "noone@example.com"})
     assert response.status_code == status.HTTP_200_OK
     assert "message" in response.json()
+    assert await outbox_for("noone@example.com") == []
+
+
+@pytest.mark.asyncio
+async def test_request_reset_password_enqueues_email(client):
+    response = await client.post("/auth/request-reset-password", json={"email": "ironman@example.com"})
+    assert response.status_code == status.HTTP_200_OK
+
+    [entry] = await outbox_for("ironman@example.com")
+    assert entry.kind == "reset"
+    assert entry.context == {"host": "http://testserver/"}
 
 
 @pytest.mark.asyncio
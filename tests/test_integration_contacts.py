@@ -0,0 +1,366 @@
+import json
+from datetime import date, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import status
+
+from src.services.redis_client import get_redis
+
+
+def birthday_in(days):
+    target = date.today() + timedelta(days=days)
+    if (target.month, target.day) == (2, 29):
+        target += timedelta(days=1)
+    return target.replace(year=1985).isoformat()
+
+
+def contact_payload(index):
+    return {
+        "first_name": f"Contact{index}",
+        "last_name": "Paged",
+        "email": f"paged{index}@example.com",
+        "phone_number": f"+38050000000{index}",
+        "birthday": birthday_in(180),
+    }
+
+
+@pytest.mark.asyncio
+async def test_list_contacts_keyset_pagination(client, auth_headers):
+    for index in range(3):
+        response = await client.post(
+            "/contacts/", json=contact_payload(index), headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+    first = await client.get("/contacts/", params={"limit": 2}, headers=auth_headers)
+    assert first.status_code == status.HTTP_200_OK
+    first_page = first.json()
+    assert len(first_page["items"]) == 2
+    assert first_page["next_cursor"]
+
+    second = await client.get(
+        "/contacts/",
+        params={"limit": 2, "cursor": first_page["next_cursor"]},
+        headers=auth_headers,
+    )
+    second_page = second.json()
+    assert len(second_page["items"]) == 1
+    assert second_page["next_cursor"] is None
+
+    ids = [c["id"] for c in first_page["items"] + second_page["items"]]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == 3
+
+
+@pytest.mark.asyncio
+async def test_list_contacts_serves_cached_json_with_etag(client, auth_headers):
+    first = await client.get("/contacts/", params={"limit": 2}, headers=auth_headers)
+    assert first.headers["content-type"] == "application/json"
+    etag = first.headers["etag"]
+
+    cached = await client.get("/contacts/", params={"limit": 2}, headers=auth_headers)
+    assert cached.content == first.content
+    assert cached.headers["etag"] == etag
+
+    not_modified = await client.get(
+        "/contacts/",
+        params={"limit": 2},
+        headers={**auth_headers, "If-None-Match": etag},
+    )
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.asyncio
+async def test_old_etag_not_matched_after_redis_flush(client, auth_headers):
+    first = await client.get("/contacts/", params={"limit": 2}, headers=auth_headers)
+    etag = first.headers["etag"]
+
+    await get_redis().flushall()
+    response = await client.get(
+        "/contacts/",
+        params={"limit": 2},
+        headers={**auth_headers, "If-None-Match": etag},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_search_contacts_paginated(client, auth_headers):
+    response = await client.get(
+        "/contacts/search",
+        params={"last_name": "paged", "limit": 1},
+        headers=auth_headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    page = response.json()
+    assert len(page["items"]) == 1
+    assert page["next_cursor"]
+
+
+@pytest.mark.asyncio
+async def test_list_contacts_invalid_cursor(client, auth_headers):
+    response = await client.get(
+        "/contacts/", params={"cursor": "garbage"}, headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_upcoming_birthdays_window(client, auth_headers):
+    for index, offset in ((10, 3), (11, 20)):
+        payload = contact_payload(index) | {"birthday": birthday_in(offset)}
+        response = await client.post("/contacts/", json=payload, headers=auth_headers)
+        assert response.status_code == status.HTTP_201_CREATED
+
+    week = await client.get("/contacts/birthdays", headers=auth_headers)
+    assert week.status_code == status.HTTP_200_OK
+    assert [c["email"] for c in week.json()] == ["paged10@example.com"]
+
+    month = await client.get(
+        "/contacts/birthdays", params={"days": 30}, headers=auth_headers
+    )
+    emails = [c["email"] for c in month.json()]
+    assert emails.index("paged10@example.com") < emails.index("paged11@example.com")
+
+
+@pytest.mark.asyncio
+async def test_free_text_search_uses_fts(client, auth_headers):
+    payload = contact_payload(20) | {
+        "first_name": "Wanda",
+        "last_name": "Maximoff",
+        "email": "scarlet@example.com",
+    }
+    response = await client.post("/contacts/", json=payload, headers=auth_headers)
+    assert response.status_code == status.HTTP_201_CREATED
+
+    by_name = await client.get(
+        "/contacts/search", params={"q": "maxim"}, headers=auth_headers
+    )
+    assert by_name.status_code == status.HTTP_200_OK
+    assert [c["email"] for c in by_name.json()["items"]] == ["scarlet@example.com"]
+    assert by_name.json()["next_cursor"] is None
+
+    by_email = await client.get(
+        "/contacts/search", params={"q": "SCARLET"}, headers=auth_headers
+    )
+    assert [c["last_name"] for c in by_email.json()["items"]] == ["Maximoff"]
+
+    short = await client.get("/contacts/search", params={"q": "wa"}, headers=auth_headers)
+    assert "scarlet@example.com" in [c["email"] for c in short.json()["items"]]
+
+    missing = await client.get(
+        "/contacts/search", params={"q": "nobody-here"}, headers=auth_headers
+    )
+    assert missing.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_ndjson_and_csv(client, auth_headers):
+    rows = [contact_payload(index) for index in range(30, 33)]
+    rows.append(contact_payload(30) | {"phone_number": "+380990000001"})
+    rows.append({"first_name": "NoEmail"})
+    rows.append(contact_payload(33) | {"first_name": "x" * 51})
+    body = "\n".join(json.dumps(row) for row in rows)
+
+    response = await client.post(
+        "/contacts/import",
+        content=body,
+        headers=auth_headers | {"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    report = response.json()
+    assert report["inserted"] == 3
+    assert report["failed"] == 3
+    assert [error["row"] for error in report["errors"]] == [4, 5, 6]
+    assert report["errors"][2]["error"].startswith("first_name:")
+
+    csv_body = (
+        "first_name,last_name,email,phone_number,birthday,additional_info\n"
+        f"Csv,Row,csv40@example.com,+380990000040,{birthday_in(2)},\n"
+        f"Csv,Again,paged31@example.com,+380990000041,{birthday_in(2)},dup\n"
+    )
+    response = await client.post(
+        "/contacts/import",
+        params={"format": "csv"},
+        content=csv_body,
+        headers=auth_headers,
+    )
+    report = response.json()
+    assert report["inserted"] == 1
+    assert report["errors"][0]["row"] == 2
+
+    found = await client.get(
+        "/contacts/search", params={"email": "csv40"}, headers=auth_headers
+    )
+    assert found.json()["items"][0]["first_name"] == "Csv"
+
+    birthdays = await client.get("/contacts/birthdays", headers=auth_headers)
+    assert "csv40@example.com" in [c["email"] for c in birthdays.json()]
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_rejects_unknown_format(client, auth_headers):
+    response = await client.post(
+        "/contacts/import", content=b"{}", headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+
+
+@pytest.mark.asyncio
+async def test_export_streams_all_contacts(client, auth_headers):
+    listed = await client.get("/contacts/", params={"limit": 500}, headers=auth_headers)
+    expected = [c["email"] for c in listed.json()["items"]]
+
+    ndjson = await client.get("/contacts/export", headers=auth_headers)
+    assert ndjson.status_code == status.HTTP_200_OK
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert [row["email"] for row in rows] == expected
+    assert "user_id" not in rows[0]
+
+    csv_export = await client.get(
+        "/contacts/export", params={"format": "csv"}, headers=auth_headers
+    )
+    lines = csv_export.text.splitlines()
+    assert lines[0] == "id,first_name,last_name,email,phone_number,birthday,additional_info"
+    assert len(lines) == len(expected) + 1
+
+
+@pytest.mark.asyncio
+async def test_batch_update_and_delete(client, auth_headers):
+    ids = []
+    for index in range(3):
+        payload = dict(
+            contact_payload(index),
+            email=f"batch{index}@example.com",
+            phone_number=f"+38067000000{index}",
+        )
+        response = await client.post("/contacts/", json=payload, headers=auth_headers)
+        ids.append(response.json()["id"])
+
+    response = await client.patch(
+        "/contacts/batch",
+        json={
+            "items": [
+                {"id": ids[0], "last_name": "Batched"},
+                {"id": ids[1], "last_name": "Batched"},
+                {"id": ids[2], "birthday": birthday_in(1)},
+                {"id": 999999, "last_name": "Batched"},
+            ]
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    report = response.json()
+    assert report["succeeded"] == 3
+    assert report["results"][-1] == {"id": 999999, "status": "not_found"}
+    contact = await client.get(f"/contacts/{ids[1]}", headers=auth_headers)
+    assert contact.json()["last_name"] == "Batched"
+    birthdays = await client.get("/contacts/birthdays", headers=auth_headers)
+    assert ids[2] in [c["id"] for c in birthdays.json()]
+
+    conflict = await client.patch(
+        "/contacts/batch",
+        json={
+            "items": [
+                {"id": ids[0], "last_name": "Lost"},
+                {"id": ids[1], "email": "batch2@example.com"},
+            ]
+        },
+        headers=auth_headers,
+    )
+    assert conflict.status_code == status.HTTP_409_CONFLICT
+    contact = await client.get(f"/contacts/{ids[0]}", headers=auth_headers)
+    assert contact.json()["last_name"] == "Batched"
+
+    empty = await client.patch(
+        "/contacts/batch", json={"items": [{"id": ids[0]}]}, headers=auth_headers
+    )
+    assert empty.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    response = await client.request(
+        "DELETE",
+        "/contacts/batch",
+        json={"ids": [ids[0], ids[1], ids[0], 999999]},
+        headers=auth_headers,
+    )
+    assert response.json() == {
+        "succeeded": 2,
+        "failed": 1,
+        "results": [
+            {"id": ids[0], "status": "deleted"},
+            {"id": ids[1], "status": "deleted"},
+            {"id": 999999, "status": "not_found"},
+        ],
+    }
+    missing = await client.get(f"/contacts/{ids[0]}", headers=auth_headers)
+    assert missing.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_single_contact(client, auth_headers):
+    payload = dict(
+        contact_payload(0), email="single@example.com", phone_number="+380630000001"
+    )
+    created = (await client.post("/contacts/", json=payload, headers=auth_headers)).json()
+    assert created["email"] == "single@example.com"
+
+    response = await client.patch(
+        f"/contacts/{created['id']}",
+        json={"last_name": "Renamed", "birthday": birthday_in(2)},
+        headers=auth_headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["last_name"] == "Renamed"
+    assert response.json()["first_name"] == payload["first_name"]
+    assert "birthday_md" not in response.json()
+    birthdays = await client.get("/contacts/birthdays", headers=auth_headers)
+    assert created["id"] in [c["id"] for c in birthdays.json()]
+
+    response = await client.delete(f"/contacts/{created['id']}", headers=auth_headers)
+    assert response.json()["email"] == "single@example.com"
+    assert "birthday_md" not in response.json()
+    response = await client.delete(f"/contacts/{created['id']}", headers=auth_headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_skips_query(client, auth_headers, monkeypatch):
+    first = await client.get("/contacts/", headers=auth_headers)
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    get_contacts = AsyncMock()
+    with monkeypatch.context() as patched:
+        patched.setattr("src.repository.contacts.get_contacts", get_contacts)
+        cached = await client.get(
+            "/contacts/", headers={**auth_headers, "If-None-Match": etag}
+        )
+    assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+    assert cached.headers["etag"] == etag
+    assert cached.content == b""
+    get_contacts.assert_not_awaited()
+
+    other_page = await client.get(
+        "/contacts/", params={"limit": 1}, headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert other_page.status_code == status.HTTP_200_OK
+
+    payload = dict(
+        contact_payload(0), email="etag@example.com", phone_number="+380630000002"
+    )
+    created = await client.post("/contacts/", json=payload, headers=auth_headers)
+    changed = await client.get(
+        "/contacts/", headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert changed.status_code == status.HTTP_200_OK
+    assert changed.headers["etag"] != etag
+
+    one = await client.get(f"/contacts/{created.json()['id']}", headers=auth_headers)
+    again = await client.get(
+        f"/contacts/{created.json()['id']}",
+        headers={**auth_headers, "If-None-Match": one.headers["etag"]},
+    )
+    assert again.status_code == status.HTTP_304_NOT_MODIFIED
@@ -0,0 +1,82 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.repository.auth import create_access_token
+from src.services.limiter import RateLimit, client_identity, parse_quota
+
+pytest.importorskip("lupa")
+
+
+def make_request(headers=None, host="10.0.0.1"):
+    request = MagicMock()
+    request.headers = headers or {}
+    request.client.host = host
+    return request
+
+
+def test_parse_quota():
+    assert parse_quota("5/minute") == (5, 60_000)
+    assert parse_quota("100/hours") == (100, 3_600_000)
+    with pytest.raises(ValueError):
+        parse_quota("five/minute")
+    with pytest.raises(ValueError):
+        parse_quota("5/fortnight")
+
+
+def test_identity_prefers_token_subject():
+    token = asyncio.run(create_access_token(data={"sub": "limited@example.com"}))
+    authorized = make_request({"authorization": f"Bearer {token}"})
+    assert client_identity(authorized) == "user:limited@example.com"
+
+    assert client_identity(make_request()) == "ip:10.0.0.1"
+    assert client_identity(make_request({"authorization": "Bearer junk"})) == "ip:10.0.0.1"
+
+
+@pytest.mark.asyncio
+async def test_gcra_allows_burst_then_rejects():
+    limit = RateLimit("test", "3/minute")
+    request = make_request()
+
+    for _ in range(3):
+        await limit(request)
+    with pytest.raises(HTTPException) as exc:
+        await limit(request)
+    assert exc.value.status_code == 429
+    assert 1 <= int(exc.value.headers["Retry-After"]) <= 20
+
+    await limit(make_request(host="10.0.0.2"))
+
+
+@pytest.mark.asyncio
+async def test_gcra_refills_at_emission_interval():
+    limit = RateLimit("test", "2/second")
+    assert (await limit.hit("ip:a"))[0]
+    assert (await limit.hit("ip:a"))[0]
+    allowed, retry_after_ms = await limit.hit("ip:a")
+    assert not allowed and 0 < retry_after_ms <= 500
+
+    await asyncio.sleep(retry_after_ms / 1000 + 0.05)
+    assert (await limit.hit("ip:a"))[0]
+
+
+@pytest.mark.asyncio
+async def test_fails_open_when_redis_unavailable():
+    limit = RateLimit("test", "1/minute")
+    broken = AsyncMock(side_effect=RedisConnectionError("down"))
+    with patch.object(RateLimit, "script", broken):
+        await limit(make_request())
+        await limit(make_request())
+
+
+@pytest.mark.asyncio
+async def test_me_endpoint_is_limited_per_user(client, auth_headers):
+    statuses = [
+        (await client.get("/auth/me", headers=auth_headers)).status_code
+        for _ in range(6)
+    ]
+    assert statuses[:5] == [200] * 5
+    assert statuses[5] == 429
@@ -0,0 +1,147 @@
+import socket
+from datetime import UTC, datetime
+from email import message_from_bytes
+from email.policy import default
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.db.connect import Base
+from src.db.models import EmailOutbox
+from src.services.mail_outbox import (
+    FAILED,
+    PENDING,
+    SENT,
+    OutboxWorker,
+    SMTPPool,
+    enqueue_email,
+    retry_delay,
+)
+
+aiosmtplib = pytest.importorskip("aiosmtplib")
+controller_module = pytest.importorskip("aiosmtpd.controller")
+
+
+class CollectingHandler:
+    def __init__(self):
+        self.envelopes = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.envelopes.append(envelope)
+        return "250 OK"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def pool_for(port, size=2):
+    return SMTPPool(
+        size,
+        factory=lambda: aiosmtplib.SMTP(
+            hostname="127.0.0.1", port=port, use_tls=False, start_tls=False, timeout=5
+        ),
+    )
+
+
+def make_worker(session_factory, pool, **options):
+    config = dict(
+        batch_size=10, max_attempts=3, retry_base=30.0, retry_max=3600.0, lease=300.0
+    )
+    config.update(options)
+    return OutboxWorker(session_factory, pool, **config)
+
+
+@pytest.fixture
+def smtp_server():
+    handler = CollectingHandler()
+    controller = controller_module.Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'outbox.db'}", poolclass=NullPool
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(bind=engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def enqueue(session_factory, *recipients, kind="verify"):
+    async with session_factory() as db:
+        for recipient in recipients:
+            enqueue_email(db, kind, recipient, {"username": "Bob", "host": "http://test/"})
+        await db.commit()
+
+
+async def outbox(session_factory):
+    async with session_factory() as db:
+        result = await db.execute(select(EmailOutbox).order_by(EmailOutbox.id))
+        return result.scalars().all()
+
+
+def test_retry_delay_grows_exponentially_up_to_cap():
+    assert [retry_delay(n, 30, 200) for n in range(1, 6)] == [30, 60, 120, 200, 200]
+
+
+def test_enqueue_rejects_unknown_kind():
+    with pytest.raises(ValueError):
+        enqueue_email(None, "newsletter", "bob@example.com", {})
+
+
+@pytest.mark.asyncio
+async def test_worker_sends_batch_over_pooled_connections(smtp_server, session_factory):
+    controller, handler = smtp_server
+    await enqueue(session_factory, "a@example.com", "b@example.com", "c@example.com")
+    pool = pool_for(controller.port)
+    worker = make_worker(session_factory, pool)
+    try:
+        assert await worker.run_once() == 3
+        assert await worker.run_once() == 0
+    finally:
+        await pool.close()
+
+    assert sorted(env.rcpt_tos[0] for env in handler.envelopes) == [
+        "a@example.com", "b@example.com", "c@example.com",
+    ]
+    message = message_from_bytes(handler.envelopes[0].content, policy=default)
+    assert message["Subject"] == "Confirm your email"
+    assert "http://test/auth/confirmed_email/" in message.get_content()
+    assert all(entry.status == SENT and entry.sent_at for entry in await outbox(session_factory))
+
+
+@pytest.mark.asyncio
+async def test_failed_delivery_is_rescheduled(session_factory):
+    await enqueue(session_factory, "down@example.com")
+    worker = make_worker(session_factory, pool_for(free_port()))
+
+    assert await worker.run_once() == 1
+
+    [entry] = await outbox(session_factory)
+    assert entry.status == PENDING
+    assert entry.attempts == 1
+    assert entry.last_error
+    assert entry.next_attempt_at > datetime.now(UTC).replace(tzinfo=None)
+    assert await worker.run_once() == 0
+
+
+@pytest.mark.asyncio
+async def test_delivery_gives_up_after_max_attempts(session_factory):
+    await enqueue(session_factory, "down@example.com", kind="reset")
+    worker = make_worker(session_factory, pool_for(free_port()), max_attempts=1)
+
+    await worker.run_once()
+
+    [entry] = await outbox(session_factory)
+    assert entry.status == FAILED
+    assert entry.attempts == 1
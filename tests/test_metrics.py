@@ -0,0 +1,51 @@
+import pytest
+from prometheus_client import REGISTRY
+
+from src.repository.auth import Hash
+from src.services.hashing import HashWorkerPool
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_request_metrics_use_route_template(client, auth_headers):
+    labels = {"method": "GET", "route": "/contacts/{contact_id}", "status": "404"}
+    before = sample("http_request_duration_seconds_count", **labels)
+    queries_before = sample("db_queries_per_request_sum", route="/contacts/{contact_id}")
+
+    response = await client.get("/contacts/987654", headers=auth_headers)
+    assert response.status_code == 404
+
+    assert sample("http_request_duration_seconds_count", **labels) == before + 1
+    queries_after = sample("db_queries_per_request_sum", route="/contacts/{contact_id}")
+    assert queries_after > queries_before
+    assert sample("http_requests_in_progress", method="GET") == 0
+
+
+@pytest.mark.asyncio
+async def test_user_cache_hits_are_counted(client, auth_headers):
+    hits = sample("user_cache_requests_total", result="hit")
+    await client.get("/auth/me", headers=auth_headers)
+    await client.get("/auth/me", headers=auth_headers)
+    assert sample("user_cache_requests_total", result="hit") >= hits + 1
+
+
+@pytest.mark.asyncio
+async def test_bcrypt_time_is_observed():
+    pool = HashWorkerPool(Hash(), max_workers=1, max_pending=2)
+    before = sample("bcrypt_duration_seconds_count", operation="hash")
+    try:
+        await pool.get_password_hash("secret")
+    finally:
+        pool.shutdown()
+    assert sample("bcrypt_duration_seconds_count", operation="hash") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_exposes_prometheus_text(client):
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "http_request_duration_seconds_bucket" in response.text
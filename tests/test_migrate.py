@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+from alembic import command
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    Enum,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    UniqueConstraint,
+    create_engine,
+)
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.db.migrate import SchemaVersionError, alembic_config, main, verify_schema
+
+
+@pytest.fixture
+def database(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'schema.db'}"
+    return url, alembic_config(url)
+
+
+def check(url, config):
+    async def run():
+        engine = create_async_engine(url, poolclass=NullPool)
+        try:
+            await verify_schema(engine, config)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_verify_schema_rejects_unmigrated_database(database):
+    url, config = database
+    with pytest.raises(SchemaVersionError):
+        check(url, config)
+
+    command.upgrade(config, "0002")
+    with pytest.raises(SchemaVersionError, match="0002"):
+        check(url, config)
+
+
+def test_verify_schema_accepts_head(database):
+    url, config = database
+    command.upgrade(config, "head")
+    check(url, config)
+
+
+def create_legacy_schema(path):
+    """Схема, яку створював ``Base.metadata.create_all`` до міграцій."""
+    metadata = MetaData()
+    Table(
+        "users",
+        metadata,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("email", String(100), unique=True, index=True, nullable=False),
+        Column("password", String, nullable=False),
+        Column("roles", Enum("admin", "moderator", "user", name="role")),
+        Column("first_name", String(50)),
+        Column("last_name", String(50)),
+        Column("confirmed", Boolean),
+        Column("avatar", String(255)),
+    )
+    Table(
+        "contacts",
+        metadata,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("first_name", String(50), nullable=False),
+        Column("last_name", String(50), nullable=False),
+        Column("email", String(100), unique=True, nullable=False),
+        Column("phone_number", String(20), unique=True, nullable=False),
+        Column("birthday", Date, nullable=False),
+        Column("additional_info", String(255)),
+        Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+        UniqueConstraint("user_id", "email", name="unique_user_email"),
+        UniqueConstraint("user_id", "phone_number", name="unique_user_phone"),
+    )
+    engine = create_engine(f"sqlite:///{path}")
+    metadata.create_all(engine)
+    engine.dispose()
+
+
+def test_cli_upgrades_database_created_by_create_all(database, tmp_path, monkeypatch):
+    url, config = database
+    create_legacy_schema(tmp_path / "schema.db")
+    monkeypatch.setattr("src.db.migrate.alembic_config", lambda: config)
+
+    main([])
+    check(url, config)
+    main([])
+    check(url, config)
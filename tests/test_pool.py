@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.db.pool import InstrumentedQueuePool, PoolMetrics
+
+
+def test_pool_metrics_histogram_is_cumulative():
+    metrics = PoolMetrics(buckets_ms=(1, 10, 100))
+
+    for wait_ms in (0.5, 3, 7, 50, 2000):
+        metrics.observe_wait(wait_ms)
+    metrics.observe_timeout()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["checkouts"] == 5
+    assert snapshot["timeouts"] == 1
+    assert snapshot["wait_time_ms"]["max"] == 2000
+    assert snapshot["wait_time_ms"]["buckets"] == {
+        "le_1": 1,
+        "le_10": 3,
+        "le_100": 4,
+        "le_inf": 5,
+    }
+
+
+@pytest.mark.asyncio
+async def test_instrumented_pool_records_checkouts(monkeypatch):
+    metrics = PoolMetrics()
+    monkeypatch.setattr(InstrumentedQueuePool, "metrics", metrics)
+    engine = create_async_engine(
+        "sqlite+aiosqlite://", poolclass=InstrumentedQueuePool, pool_size=2
+    )
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            assert metrics.snapshot(engine.pool)["checked_out"] == 1
+    finally:
+        await engine.dispose()
+
+    assert metrics.checkouts == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_endpoint(client):
+    response = await client.get("/health/pool")
+    assert response.status_code == 200
+    data = response.json()
+    assert {"size", "checked_out", "overflow", "wait_time_ms"} <= data.keys()
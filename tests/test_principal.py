@@ -0,0 +1,80 @@
+import pickle
+
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+from redis.exceptions import ConnectionError as RedisConnectionError
+from unittest.mock import AsyncMock
+
+from src.db.models import Role, User
+from src.repository.auth import create_access_token
+from src.services import auth as auth_module
+from src.services.auth import auth_service
+from src.services.principal import Principal
+from src.services.user_cache import user_cache
+
+
+@pytest.fixture
+def db_user():
+    return User(
+        id=7,
+        email="cache@example.com",
+        roles=Role.moderator,
+        confirmed=True,
+        avatar="https://example.com/a.png",
+        first_name="Cached",
+    )
+
+
+def test_principal_roundtrip(db_user):
+    principal = Principal.from_user(db_user)
+    payload = principal.dumps()
+
+    assert payload[0] == 1
+    assert len(payload) < 100
+    assert Principal.loads(payload) == principal
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [None, b"", b"\x02[]", b"\x01not-json", pickle.dumps({"legacy": True})],
+)
+def test_principal_loads_rejects_unknown_payloads(payload):
+    assert Principal.loads(payload) is None
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_caches_principal(monkeypatch, db_user):
+    get_user = AsyncMock(return_value=db_user)
+    monkeypatch.setattr(auth_module, "get_user_by_email", get_user)
+    token = await create_access_token({"sub": db_user.email, "roles": "admin"})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    first = await auth_service.get_current_user(credentials, db=None)
+    second = await auth_service.get_current_user(credentials, db=None)
+
+    assert get_user.await_count == 1
+    assert first == second
+    assert isinstance(second, Principal)
+    assert second.roles is Role.admin
+    cached = await user_cache.r.get(f"user:{db_user.email}")
+    assert Principal.loads(cached).roles is Role.moderator
+    assert 0 < await user_cache.r.ttl(f"user:{db_user.email}") <= 900
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_survives_redis_outage(monkeypatch, db_user):
+    class BrokenRedis:
+        async def get(self, *args, **kwargs):
+            raise RedisConnectionError("redis is down")
+
+        async def set(self, *args, **kwargs):
+            raise RedisConnectionError("redis is down")
+
+    monkeypatch.setattr("src.services.redis_client._client", BrokenRedis())
+    monkeypatch.setattr(auth_module, "get_user_by_email", AsyncMock(return_value=db_user))
+    token = await create_access_token({"sub": db_user.email, "roles": "user"})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    user = await auth_service.get_current_user(credentials, db=None)
+
+    assert user.id == db_user.id
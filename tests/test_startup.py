@@ -0,0 +1,68 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.services.container import ServiceContainer, ServiceNotConfigured
+from src.settings.config import Settings
+
+ROOT = Path(__file__).resolve().parents[1]
+LAZY_MODULES = ("cloudinary", "passlib", "aiosmtplib", "jinja2", "PIL")
+# Залежності, без яких застосунок не імпортується; час їх імпорту — база,
+# відносно якої перевіряється холодний старт (не залежить від машини).
+FRAMEWORK_MODULES = (
+    "fastapi, fastapi.security, sqlalchemy.ext.asyncio, pydantic, email_validator, "
+    "orjson, redis.asyncio, slowapi"
+)
+IMPORT_BUDGET_RATIO = 1.8
+
+
+def import_time(statement: str) -> tuple[float, list[str]]:
+    """Найкращий із трьох часів імпорту в чистому інтерпретаторі та ліниві модулі."""
+    script = (
+        f"import json, sys, time; started = time.perf_counter(); {statement}; "
+        "print(json.dumps([time.perf_counter() - started, "
+        f"[m for m in {LAZY_MODULES!r} if m in sys.modules]]))"
+    )
+    runs = []
+    for _ in range(3):
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=ROOT,
+            env={**os.environ, "ENV_FILE": os.getenv("ENV_FILE", ".env.test")},
+            capture_output=True,
+            text=True,
+            timeout=60,
+            check=True,
+        )
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return min(elapsed for elapsed, _ in runs), runs[-1][1]
+
+
+def test_importing_app_skips_optional_clients():
+    elapsed, imported = import_time("import main")
+    assert imported == []
+
+    framework, _ = import_time(f"import {FRAMEWORK_MODULES}")
+    assert elapsed < framework * IMPORT_BUDGET_RATIO
+
+
+def test_container_creates_clients_on_first_use():
+    config = Settings(
+        CLOUDINARY_NAME="cloud", CLOUDINARY_API_KEY="key", CLOUDINARY_API_SECRET="secret"
+    )
+    container = ServiceContainer(config)
+    assert container._uploader is None
+
+    uploader = container.uploader
+    assert container.uploader is uploader
+    assert uploader.cloud_name == "cloud"
+
+
+def test_container_reports_missing_settings():
+    container = ServiceContainer(Settings(CLOUDINARY_NAME=None))
+    with pytest.raises(ServiceNotConfigured, match="CLOUDINARY_NAME"):
+        container.uploader
@@ -1,14 +1,24 @@
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 from src.repository import user as user_repo
 from src.db.models import User
+from src.services.principal import Principal
+from src.services.user_cache import user_cache
 from src.schemas.auth import UserModel
 
 
 @pytest.fixture
 def mock_db():
-    return MagicMock()
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=MagicMock())
+    db.commit = AsyncMock()
+    db.refresh = AsyncMock()
+    return db
+
+
+def set_user(mock_db, user):
+    mock_db.execute.return_value.scalars.return_value.first.return_value = user
 
 
 @pytest.fixture
@@ -20,7 +30,7 @@ def test_user():
 
 @pytest.mark.asyncio
 async def test_get_user_by_email(mock_db, test_user):
-    mock_db.query().filter_by().first.return_value = test_user
+    set_user(mock_db, test_user)
     result = await user_repo.get_user_by_email("test@example.com", mock_db)
     assert result.email == "test@example.com"
 
@@ -28,48 +38,55 @@ async def test_get_user_by_email(mock_db, test_user):
 @pytest.mark.asyncio
 async def test_create_user(mock_db):
     body = UserModel(username="john", email="john@example.com", password="secret")
-    mock_db.add = MagicMock()
-    mock_db.commit = MagicMock()
-    mock_db.refresh = MagicMock()
-
     result = await user_repo.create_user(body, mock_db)
     assert result.email == body.email
     mock_db.add.assert_called()
-    mock_db.commit.assert_called()
+    mock_db.commit.assert_awaited()
+    mock_db.refresh.assert_not_awaited()
 
 
 @pytest.mark.asyncio
 async def test_change_confirmed_email(mock_db, test_user):
-    mock_db.query().filter_by().first.return_value = test_user
+    set_user(mock_db, test_user)
     await user_repo.change_confirmed_email("test@example.com", mock_db)
-    assert test_user.confirmed is True
-    mock_db.commit.assert_called()
+    mock_db.execute.assert_awaited_once()
+    stmt = mock_db.execute.await_args.args[0]
+    assert stmt.is_update
+    assert stmt.compile().params["confirmed"] is True
+    mock_db.commit.assert_awaited()
 
 
 @pytest.mark.asyncio
 async def test_update_avatar_url(mock_db, test_user):
-    mock_db.query().filter_by().first.return_value = test_user
+    set_user(mock_db, test_user)
     url = "http://example.com/avatar.png"
+    user_cache.local.set(test_user.email, Principal.from_user(test_user))
 
     result = await user_repo.update_avatar_url("test@example.com", url, mock_db)
-    assert result.avatar == url
-    mock_db.commit.assert_called()
-    mock_db.refresh.assert_called()
+    assert result is test_user
+    assert mock_db.execute.await_args.args[0].compile().params["avatar"] == url
+    assert user_cache.local.get(test_user.email) is None
+    mock_db.execute.assert_awaited_once()
+    mock_db.commit.assert_awaited()
+    mock_db.refresh.assert_not_awaited()
 
 
 @pytest.mark.asyncio
 async def test_update_user_password(mock_db, test_user):
-    mock_db.query().filter_by().first.return_value = test_user
+    set_user(mock_db, test_user)
     result = await user_repo.update_user_password(
         "test@example.com", "hashed123", mock_db
     )
-    assert result.password == "hashed123"
-    mock_db.commit.assert_called()
+    assert result is test_user
+    params = mock_db.execute.await_args.args[0].compile().params
+    assert params["password"] == "hashed123"
+    mock_db.execute.assert_awaited_once()
+    mock_db.commit.assert_awaited()
 
 
 @pytest.mark.asyncio
 async def test_update_user_password_user_not_found(mock_db):
-    mock_db.query().filter_by().first.return_value = None
+    set_user(mock_db, None)
     result = await user_repo.update_user_password(
         "unknown@example.com", "hashed123", mock_db
     )
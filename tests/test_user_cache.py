@@ -0,0 +1,76 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from src.db.models import Role
+from src.services.cache import TTLCache
+from src.services.principal import Principal
+from src.services.user_cache import UserCache
+
+
+@pytest.fixture
+def principal():
+    return Principal(id=1, email="hot@example.com", roles=Role.user, confirmed=True)
+
+
+@pytest.fixture
+def cache():
+    return UserCache(local_size=10, local_ttl=30, redis_ttl=900)
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    lru = TTLCache(maxsize=2, ttl=60)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    assert lru.get("a") == 1
+    lru.set("c", 3)
+
+    assert lru.get("b") is None
+    assert lru.get("a") == 1
+    assert lru.get("c") == 3
+    assert (lru.hits, lru.misses) == (3, 1)
+
+
+def test_ttl_cache_expires_entries():
+    lru = TTLCache(maxsize=2, ttl=60)
+    with patch("src.services.cache.monotonic", return_value=100.0):
+        lru.set("a", 1, ttl=5)
+    with patch("src.services.cache.monotonic", return_value=106.0):
+        assert lru.get("a") is None
+    assert len(lru) == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_hit_populates_local_tier(cache, principal):
+    await cache.r.set(cache.key(principal.email), principal.dumps())
+
+    assert await cache.get(principal.email) == principal
+    assert cache.local.get(principal.email) == principal
+
+
+@pytest.mark.asyncio
+async def test_invalidate_clears_both_tiers(cache, principal):
+    await cache.set(principal)
+
+    await cache.invalidate(principal.email)
+
+    assert cache.local.get(principal.email) is None
+    assert await cache.r.get(cache.key(principal.email)) is None
+
+
+@pytest.mark.asyncio
+async def test_listener_evicts_entries_invalidated_elsewhere(cache, principal):
+    other_worker = UserCache(local_size=10, local_ttl=30, redis_ttl=900)
+    cache.local.set(principal.email, principal)
+    listener = asyncio.create_task(cache.listen(poll_timeout=0.01))
+    await asyncio.sleep(0.05)
+
+    await other_worker.invalidate(principal.email)
+    for _ in range(50):
+        if cache.local.get(principal.email) is None:
+            break
+        await asyncio.sleep(0.01)
+
+    listener.cancel()
+    assert cache.local.get(principal.email) is None